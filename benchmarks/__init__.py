@@ -0,0 +1,11 @@
+"""
+Performance benchmarks for the IBRL experiment hot paths.
+
+Usage (from the repository root):
+    python -m benchmarks run [--quick] [--only GROUP ...] [--output PATH]
+    python -m benchmarks compare BASELINE [CURRENT] [--threshold 0.1]
+    python -m benchmarks list
+
+Baselines are JSON files in benchmarks/baselines/; `compare` exits with
+status 1 if any benchmark regressed beyond the noise threshold.
+"""
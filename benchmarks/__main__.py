@@ -0,0 +1,69 @@
+"""Command-line entry point: python -m benchmarks."""
+
+import argparse
+import os
+import sys
+
+from .cases import BENCHMARKS, run_benchmarks
+from .harness import DEFAULT_THRESHOLD, compare, format_report, load_results, save_results
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "latest.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and store results as JSON")
+    run.add_argument("--quick", action="store_true", help="Smaller workloads")
+    run.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Groups to run")
+    run.add_argument("--output", default=DEFAULT_OUTPUT, help="Results path")
+
+    cmp = commands.add_parser("compare", help="Compare results against a baseline")
+    cmp.add_argument("baseline", help="Baseline JSON")
+    cmp.add_argument("current", nargs="?",
+                     help="Results JSON (default: run the suite now)")
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                     help="Relative change treated as noise")
+    cmp.add_argument("--quick", action="store_true", help="Smaller workloads when running")
+    cmp.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Groups to run")
+
+    commands.add_parser("list", help="List benchmark groups")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name, fn in BENCHMARKS.items():
+            print(f"{name:15s} {fn.__doc__}")
+        return 0
+
+    if args.command == "run":
+        results = run_benchmarks(args.only, args.quick)
+        save_results(results, args.output, args.quick)
+        print(f"Saved {len(results)} results to {args.output}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if args.current is not None:
+        current = load_results(args.current)
+    else:
+        current = {"quick": args.quick, "results": run_benchmarks(args.only, args.quick)}
+    if baseline.get("quick") != current.get("quick"):
+        print("warning: baseline and current results use different workloads (--quick)")
+    if args.only:
+        baseline = {"results": {name: result for name, result in baseline["results"].items()
+                                if name.split("/")[0] in args.only}}
+
+    rows = compare(baseline, current, args.threshold)
+    print(format_report(rows))
+    regressions = [row[0] for row in rows if row[5] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Benchmark cases for the experiment hot paths."""
+
+import contextlib
+import io
+import os
+
+import numpy as np
+
+from ibrl.belief import BOUND_FAMILIES, CredalInterval, SlidingWindowInterval, WassersteinBall
+from ibrl.experiments.compare_all import _run_trial, compare_all
+from .harness import measure, rate_result, latency_result, duration_result
+
+ENV_TYPES = ("bandit", "newcomb", "twin_pd", "misspecified", "wasserstein")
+AGENT_TYPES = ("classical", "bayesian", "ib")
+
+# name -> function(quick) returning {result_name: result}
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark group."""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def _repeat(quick):
+    return 3 if quick else 5
+
+
+@benchmark("episodes")
+def bench_episodes(quick):
+    """Episodes per second for every environment × agent pair."""
+    episodes = 300 if quick else 2000
+    results = {}
+    for env_type in ENV_TYPES:
+        for agent_type in AGENT_TYPES:
+            def run():
+                _run_trial(env_type, agent_type, 0, episodes, None, None, None)
+                return episodes
+            timing = measure(run, repeat=_repeat(quick))
+            results[f"episodes/{env_type}/{agent_type}"] = rate_result(timing, "episodes/s")
+    return results
+
+
+@benchmark("credal_update")
+def bench_credal_update(quick):
+    """CredalInterval.update throughput per bound family (warm tables)."""
+    n = 2000 if quick else 20000
+    outcomes = (np.random.default_rng(0).random(n) < 0.95).tolist()
+    factories = {family: (lambda f=family: CredalInterval(0.0, 1.0, bound=f))
+                 for family in BOUND_FAMILIES}
+    factories["window"] = lambda: SlidingWindowInterval(window=200, lower=0.0, upper=1.0)
+
+    results = {}
+    for name, factory in factories.items():
+        def run():
+            credal = factory()
+            for success in outcomes:
+                credal.update(success)
+            return n
+        timing = measure(run, repeat=_repeat(quick))
+        results[f"credal_update/{name}"] = rate_result(timing, "updates/s")
+    return results
+
+
+@benchmark("wasserstein")
+def bench_wasserstein(quick):
+    """WassersteinBall.worst_case_expectation latency by support size."""
+    calls = 2000 if quick else 20000
+    results = {}
+    for n_outcomes in (2, 16, 256):
+        rng = np.random.default_rng(n_outcomes)
+        ball = WassersteinBall(rng.dirichlet(np.ones(n_outcomes)), radius=0.1)
+        values = rng.random(n_outcomes)
+
+        def run():
+            for _ in range(calls):
+                ball.worst_case_expectation(values)
+            return calls
+        timing = measure(run, repeat=_repeat(quick))
+        results[f"wasserstein/worst_case/{n_outcomes}"] = latency_result(timing)
+    return results
+
+
+def _worker_counts():
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+@benchmark("compare_all")
+def bench_compare_all(quick):
+    """
+    compare_all end-to-end time per executor backend, and with 1..all
+    worker processes.
+    """
+    n_trials, episodes = (2, 200) if quick else (4, 500)
+    repeat = 2 if quick else 3
+
+    def runner(**kwargs):
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                compare_all(n_trials=n_trials, episodes=episodes, save_path=None, **kwargs)
+        return run
+
+    results = {
+        "compare_all/serial": duration_result(
+            measure(runner(parallel=False), repeat=repeat, warmup=0)),
+    }
+    for backend in ("batch", "thread", "auto"):
+        results[f"compare_all/backend={backend}"] = duration_result(
+            measure(runner(backend=backend), repeat=repeat, warmup=0))
+    
+    single = None
+    for workers in _worker_counts():
+        result = duration_result(
+            measure(runner(backend="process", max_workers=workers), repeat=repeat, warmup=0))
+        if single is None:
+            single = result["value"]
+        result["speedup"] = single / result["value"]
+        results[f"compare_all/workers={workers}"] = result
+    return results
+
+
+def run_benchmarks(names=None, quick=False, log=print):
+    """
+    Run registered benchmark groups.
+
+    Args:
+        names: Group names to run (None runs all)
+        quick: Smaller workloads and fewer repeats
+        log: Progress callback (None for silence)
+
+    Returns:
+        Dict of result name -> result
+    """
+    results = {}
+    for name, fn in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        if log is not None:
+            log(f"running {name} ...")
+        results.update(fn(quick))
+    return results
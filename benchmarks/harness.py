@@ -0,0 +1,163 @@
+"""Timing, storage and regression comparison for the benchmark suite."""
+
+import json
+import os
+import platform
+import statistics
+import time
+
+import numpy as np
+import scipy
+
+# Relative change treated as noise when comparing against a baseline
+DEFAULT_THRESHOLD = 0.10
+
+
+def measure(fn, repeat=5, warmup=1):
+    """
+    Time a zero-argument callable.
+
+    Args:
+        fn: Callable to time; may return a work count (e.g. episodes run)
+            so results can be reported as a rate
+        repeat: Number of timed runs
+        warmup: Untimed runs before timing
+
+    Returns:
+        Dict with per-run seconds (median, min, max, runs) and the work
+        count returned by fn (1 if it returns None)
+    """
+    for _ in range(warmup):
+        fn()
+
+    runs = []
+    work = 1
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - start)
+        if result is not None:
+            work = result
+
+    return {
+        "median_s": statistics.median(runs),
+        "min_s": min(runs),
+        "max_s": max(runs),
+        "runs": runs,
+        "work": work,
+    }
+
+
+def rate_result(timing, unit):
+    """Express a timing as throughput (higher is better)."""
+    return dict(timing, value=timing["work"] / timing["median_s"], unit=unit,
+                higher_is_better=True)
+
+
+def latency_result(timing, unit="ns/call"):
+    """Express a timing as per-unit latency in nanoseconds (lower is better)."""
+    return dict(timing, value=timing["median_s"] / timing["work"] * 1e9, unit=unit,
+                higher_is_better=False)
+
+
+def duration_result(timing):
+    """Express a timing as wall-clock seconds (lower is better)."""
+    return dict(timing, value=timing["median_s"], unit="s", higher_is_better=False)
+
+
+def environment_info():
+    """Machine and library versions stored alongside results."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save_results(results, path, quick=False):
+    """Write benchmark results and environment info as JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"environment": environment_info(), "quick": quick, "results": results},
+                  f, indent=2)
+
+
+def load_results(path):
+    """Read results written by save_results."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def _per_work(result):
+    # Fastest and slowest run, per unit of work
+    return result["min_s"] / result["work"], result["max_s"] / result["work"]
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare two result files benchmark by benchmark.
+
+    A benchmark regresses when its value moves in the bad direction by
+    more than `threshold` (relative) and the run ranges do not overlap
+    (every current run slower per unit of work than every baseline run);
+    improvements are judged the same way. Changes beyond the threshold
+    with overlapping ranges are reported as "noise".
+
+    Args:
+        baseline: Loaded baseline results
+        current: Loaded current results
+        threshold: Relative noise threshold
+
+    Returns:
+        List of rows (name, unit, baseline, current, change, status),
+        where change is the relative improvement (positive is better)
+    """
+    rows = []
+    base_results = baseline["results"]
+    for name, result in current["results"].items():
+        if name not in base_results:
+            rows.append((name, result["unit"], None, result["value"], None, "new"))
+            continue
+        old, new = base_results[name]["value"], result["value"]
+        if old == 0:
+            change = 0.0
+        elif result["higher_is_better"]:
+            change = (new - old) / old
+        else:
+            change = (old - new) / old
+        old_runs = _per_work(base_results[name])
+        new_runs = _per_work(result)
+        if change < -threshold:
+            status = "REGRESSION" if new_runs[0] > old_runs[1] else "noise"
+        elif change > threshold:
+            status = "improved" if new_runs[1] < old_runs[0] else "noise"
+        else:
+            status = "ok"
+        rows.append((name, result["unit"], old, new, change, status))
+
+    for name in base_results:
+        if name not in current["results"]:
+            rows.append((name, base_results[name]["unit"], base_results[name]["value"],
+                         None, None, "missing"))
+    return rows
+
+
+def format_report(rows):
+    """Render comparison rows as a text table."""
+    width = max([len(row[0]) for row in rows] + [9])
+    lines = [f"{'benchmark':{width}s}  {'baseline':>12s}  {'current':>12s}  "
+             f"{'change':>8s}  unit / status"]
+    lines.append("-" * len(lines[0]))
+    for name, unit, old, new, change, status in rows:
+        old_text = f"{old:12.4g}" if old is not None else f"{'-':>12s}"
+        new_text = f"{new:12.4g}" if new is not None else f"{'-':>12s}"
+        change_text = f"{change:+8.1%}" if change is not None else f"{'-':>8s}"
+        lines.append(f"{name:{width}s}  {old_text}  {new_text}  {change_text}  "
+                     f"{unit} / {status}")
+    return "\n".join(lines)
@@ -2,5 +2,14 @@ from .base_agent import BaseAgent
 from .classical_q import ClassicalQAgent
 from .bayesian_q import BayesianQAgent
 from .ib_q import IBQAgent
+from .policy_search import PolicyProblem, branch_and_bound, enumerate_policies
 
-__all__ = ["BaseAgent", "ClassicalQAgent", "BayesianQAgent", "IBQAgent"]
+__all__ = [
+    "BaseAgent",
+    "ClassicalQAgent",
+    "BayesianQAgent",
+    "IBQAgent",
+    "PolicyProblem",
+    "branch_and_bound",
+    "enumerate_policies",
+]
@@ -0,0 +1,111 @@
+"""Incremental argmax index over action values for large action spaces."""
+
+import numpy as np
+
+
+def _sorted_unique(sorted_values):
+    """Drop duplicates from a sorted array (cheaper than np.unique for small arrays)."""
+    keep = np.empty(len(sorted_values), dtype=bool)
+    keep[0] = True
+    np.not_equal(sorted_values[1:], sorted_values[:-1], out=keep[1:])
+    return sorted_values[keep]
+
+
+class ArgmaxIndex:
+    """
+    Tournament tree over an array of action values.
+
+    Each internal node stores the index of the best leaf in its subtree,
+    so the overall argmax is read from the root in O(1) and a change to a
+    single value is propagated in O(log K). Ties resolve to the lowest
+    index, matching np.argmax.
+
+    The index holds a reference to the value array; callers modify the
+    array in place and then call update() with the changed position.
+    """
+
+    def __init__(self, values):
+        """
+        Args:
+            values: 1D numpy array of action values (referenced, not copied)
+        """
+        self.values = values
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the whole tree from the value array in O(K)."""
+        n = len(self.values)
+        size = 1
+        while size < n:
+            size *= 2
+        self.size = size
+
+        tree = np.full(2 * size, -1, dtype=np.int64)
+        level = np.where(np.arange(size) < n, np.arange(size), -1)
+        level_values = np.full(size, -np.inf)
+        level_values[:n] = self.values
+        tree[size:] = level
+
+        # Build level by level; the left child wins ties, and padding
+        # leaves (-1) only sit to the right of real actions
+        node = size
+        while node > 1:
+            take_left = level_values[0::2] >= level_values[1::2]
+            level = np.where(take_left, level[0::2], level[1::2])
+            level_values = np.where(take_left, level_values[0::2], level_values[1::2])
+            node //= 2
+            tree[node:2 * node] = level
+
+        self._tree = tree
+
+    def update(self, i):
+        """Propagate a change of values[i] to the root in O(log K)."""
+        tree, values = self._tree, self.values
+        pos = (int(i) + self.size) >> 1
+        while pos >= 1:
+            a, b = tree[2 * pos], tree[2 * pos + 1]
+            if b >= 0 and (a < 0 or values[b] > values[a]):
+                a = b
+            tree[pos] = a
+            pos >>= 1
+
+    def update_many(self, indices):
+        """
+        Propagate changes at several positions in one vectorized pass.
+
+        Costs O(m log K) array work for m changed positions, with only
+        O(log K) Python-level steps.
+        """
+        tree, values = self._tree, self.values
+        pos = _sorted_unique(np.sort((np.asarray(indices, dtype=np.int64) + self.size) >> 1))
+        while pos[0] >= 1:
+            left, right = tree[2 * pos], tree[2 * pos + 1]
+            left_values = np.where(left >= 0, values[np.maximum(left, 0)], -np.inf)
+            right_values = np.where(right >= 0, values[np.maximum(right, 0)], -np.inf)
+            take_left = left_values >= right_values
+            tree[pos] = np.where(take_left, left, right)
+            pos = _sorted_unique(pos >> 1)
+
+    def argmax(self):
+        """Return the index of the largest value in O(1)."""
+        return int(self._tree[1]) if self.size > 1 else 0
+
+    def max(self):
+        """Return the largest value in O(1)."""
+        return self.values[self.argmax()]
+
+
+# Agents switch to an indexed argmax above this many actions
+INDEX_THRESHOLD = 256
+
+
+def ensure_index(index, values):
+    """
+    Return an ArgmaxIndex tracking `values`.
+
+    Rebuilds the index if it is missing or the value array was replaced
+    (e.g. by reset() or a snapshot restore) rather than modified in place.
+    """
+    if index is None or index.values is not values:
+        return ArgmaxIndex(values)
+    return index
@@ -23,3 +23,7 @@ class BaseAgent(ABC):
     def reset(self):
         """Reset agent state (optional)."""
         pass
+
+    def to_bytes(self):
+        """Serialize agent state to a versioned binary snapshot."""
+        raise NotImplementedError("Subclass must implement to_bytes")
@@ -1,7 +1,18 @@
 """Bayesian Q-learning agent with posterior belief updating."""
 
+import math
+import struct
+
 import numpy as np
 from .base_agent import BaseAgent
+from .action_index import INDEX_THRESHOLD, ArgmaxIndex, ensure_index
+from ibrl.utils import snapshot
+from ibrl.utils.precision import get_precision
+
+THOMPSON_MODES = ("full", "lazy")
+
+# Sampling settings trailer: mode, indexed, refresh, cached lazy samples follow
+_SETTINGS = struct.Struct("<B?q?")
 
 
 class BayesianQAgent(BaseAgent):
@@ -10,54 +21,145 @@ class BayesianQAgent(BaseAgent):
     
     Maintains posterior distribution over reward probabilities.
     Uses Thompson sampling for exploration.
+    
+    With thompson="lazy", posterior samples are cached in an argmax index:
+    each step redraws only the updated arm and `refresh` random arms,
+    instead of all K posteriors.
     """
 
-    def __init__(self, n_actions, alpha=0.1, gamma=0.99, seed=None):
+    def __init__(self, n_actions, alpha=0.1, gamma=0.99, seed=None, precision=None,
+                 indexed=None, thompson="full", refresh=None):
         """
         Args:
             n_actions: Number of available actions
             alpha: Learning rate (for Q-values)
             gamma: Discount factor
             seed: Random seed
+            precision: Storage precision (None, "double", "compact"; see ibrl.utils.precision)
+            indexed: Keep an argmax index over Q (default: n_actions >= INDEX_THRESHOLD)
+            thompson: "full" (resample every arm each step) or "lazy"
+            refresh: Arms redrawn per step in lazy mode (default: ceil(sqrt(K)))
         """
         self.n_actions = n_actions
         self.alpha = alpha
         self.gamma = gamma
-        self.q = np.zeros(n_actions)
+        self.dtype = get_precision(precision).float_dtype
+        self.q = np.zeros(n_actions, dtype=self.dtype)
         
         # Beta distribution parameters for each action
-        self.alpha_params = np.ones(n_actions)
-        self.beta_params = np.ones(n_actions)
+        self.alpha_params = np.ones(n_actions, dtype=self.dtype)
+        self.beta_params = np.ones(n_actions, dtype=self.dtype)
         
         self.rng = np.random.default_rng(seed)
+        
+        if thompson not in THOMPSON_MODES:
+            raise ValueError(f"Unknown Thompson sampling mode: {thompson}")
+        self.indexed = n_actions >= INDEX_THRESHOLD if indexed is None else indexed
+        self.thompson = thompson
+        self.refresh = math.ceil(math.sqrt(n_actions)) if refresh is None else refresh
+        self._q_index = None
+        self._samples = None
+        self._sample_index = None
 
     def greedy_action(self):
         """Return action with highest expected Q-value."""
+        if self.indexed:
+            self._q_index = ensure_index(self._q_index, self.q)
+            return int(self._q_index.argmax())
         return int(np.argmax(self.q))
 
     def select_action(self, state):
         """Thompson sampling: sample from posterior and choose best."""
+        if self.thompson == "lazy":
+            return self._select_lazy()
         sampled_values = self.rng.beta(self.alpha_params, self.beta_params)
         return int(np.argmax(sampled_values))
 
+    def _select_lazy(self):
+        """Lazily refreshed Thompson sampling over cached posterior samples."""
+        if self._samples is None:
+            self._samples = self.rng.beta(self.alpha_params, self.beta_params)
+            self._sample_index = ArgmaxIndex(self._samples)
+        elif self.refresh > 0:
+            arms = self.rng.integers(0, self.n_actions, size=self.refresh)
+            self._samples[arms] = self.rng.beta(self.alpha_params[arms], self.beta_params[arms])
+            self._sample_index.update_many(arms)
+        return int(self._sample_index.argmax())
+
+    def restore_samples(self, samples):
+        """Reinstate cached lazy Thompson samples (e.g. from a snapshot)."""
+        self._samples = np.array(samples, dtype=float)
+        self._sample_index = ArgmaxIndex(self._samples)
+
     def update(self, state, action, reward, next_state=None, done=True):
         """Update Q-values and posterior beliefs."""
         # Update Q-value
         if done:
             target = reward
         else:
-            target = reward + self.gamma * np.max(self.q)
+            target = reward + self.gamma * self.q[self.greedy_action()]
         
         self.q[action] += self.alpha * (target - self.q[action])
         
+        if self.indexed:
+            self._q_index = ensure_index(self._q_index, self.q)
+            self._q_index.update(action)
+        
         # Update Beta posterior
         if reward > 0:
             self.alpha_params[action] += 1
         else:
             self.beta_params[action] += 1
+        
+        # The updated arm's posterior changed: redraw its cached sample
+        if self._samples is not None:
+            self._samples[action] = self.rng.beta(self.alpha_params[action],
+                                                  self.beta_params[action])
+            self._sample_index.update(action)
 
     def reset(self):
         """Reset Q-values and beliefs."""
-        self.q = np.zeros(self.n_actions)
-        self.alpha_params = np.ones(self.n_actions)
-        self.beta_params = np.ones(self.n_actions)
+        self.q = np.zeros(self.n_actions, dtype=self.dtype)
+        self.alpha_params = np.ones(self.n_actions, dtype=self.dtype)
+        self.beta_params = np.ones(self.n_actions, dtype=self.dtype)
+        self._samples = None
+        self._sample_index = None
+
+    def to_bytes(self):
+        """Serialize Q-values, Beta posteriors, hyperparameters and RNG state."""
+        return b"".join([
+            snapshot.pack_header(snapshot.KIND_BAYESIAN_Q, self.dtype),
+            struct.pack("<qdd", self.n_actions, self.alpha, self.gamma),
+            snapshot.pack_array(self.q),
+            snapshot.pack_array(self.alpha_params),
+            snapshot.pack_array(self.beta_params),
+            snapshot.pack_rng(self.rng),
+            _SETTINGS.pack(THOMPSON_MODES.index(self.thompson), self.indexed, self.refresh,
+                           self._samples is not None),
+            b"" if self._samples is None else snapshot.pack_array(self._samples),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore an agent written by to_bytes."""
+        _, offset = snapshot.unpack_header(data, snapshot.KIND_BAYESIAN_Q)
+        n_actions, alpha, gamma = struct.unpack_from("<qdd", data, offset)
+        offset += 24
+        agent = cls(n_actions, alpha=alpha, gamma=gamma,
+                    precision=snapshot.unpack_precision(data))
+        q, offset = snapshot.unpack_array(data, offset)
+        alpha_params, offset = snapshot.unpack_array(data, offset)
+        beta_params, offset = snapshot.unpack_array(data, offset)
+        agent.q = q.astype(agent.dtype)
+        agent.alpha_params = alpha_params.astype(agent.dtype)
+        agent.beta_params = beta_params.astype(agent.dtype)
+        agent.rng, offset = snapshot.unpack_rng(data, offset)
+        # Snapshots written before lazy Thompson sampling existed end here
+        if len(data) >= offset + _SETTINGS.size:
+            mode, agent.indexed, agent.refresh, cached = _SETTINGS.unpack_from(data, offset)
+            agent.thompson = THOMPSON_MODES[mode]
+            offset += _SETTINGS.size
+            if cached:
+                samples, offset = snapshot.unpack_array(data, offset)
+                agent.restore_samples(samples)
+        return agent
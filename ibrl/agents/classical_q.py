@@ -1,7 +1,14 @@
 """Classical Q-learning agent with epsilon-greedy exploration."""
 
+import struct
+
 import numpy as np
 from .base_agent import BaseAgent
+from .action_index import INDEX_THRESHOLD, ensure_index
+from ibrl.utils import snapshot
+from ibrl.utils.precision import get_precision
+
+_SETTINGS = struct.Struct("<?")
 
 
 class ClassicalQAgent(BaseAgent):
@@ -9,9 +16,12 @@ class ClassicalQAgent(BaseAgent):
     Standard Q-learning agent.
     
     Uses point estimates and epsilon-greedy exploration.
+    For large action spaces the greedy action is served from an
+    incremental argmax index (O(log K) update, O(1) query).
     """
 
-    def __init__(self, n_actions, alpha=0.1, gamma=0.99, epsilon=0.1, seed=None):
+    def __init__(self, n_actions, alpha=0.1, gamma=0.99, epsilon=0.1, seed=None, precision=None,
+                 indexed=None):
         """
         Args:
             n_actions: Number of available actions
@@ -19,16 +29,24 @@ class ClassicalQAgent(BaseAgent):
             gamma: Discount factor
             epsilon: Exploration rate
             seed: Random seed
+            precision: Storage precision (None, "double", "compact"; see ibrl.utils.precision)
+            indexed: Keep an argmax index over Q (default: n_actions >= INDEX_THRESHOLD)
         """
         self.n_actions = n_actions
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
-        self.q = np.zeros(n_actions)
+        self.dtype = get_precision(precision).float_dtype
+        self.q = np.zeros(n_actions, dtype=self.dtype)
         self.rng = np.random.default_rng(seed)
+        self.indexed = n_actions >= INDEX_THRESHOLD if indexed is None else indexed
+        self._q_index = None
 
     def greedy_action(self):
         """Return action with highest Q-value."""
+        if self.indexed:
+            self._q_index = ensure_index(self._q_index, self.q)
+            return int(self._q_index.argmax())
         return int(np.argmax(self.q))
 
     def select_action(self, state):
@@ -42,10 +60,40 @@ class ClassicalQAgent(BaseAgent):
         if done:
             target = reward
         else:
-            target = reward + self.gamma * np.max(self.q)
+            target = reward + self.gamma * self.q[self.greedy_action()]
         
         self.q[action] += self.alpha * (target - self.q[action])
+        
+        if self.indexed:
+            self._q_index = ensure_index(self._q_index, self.q)
+            self._q_index.update(action)
 
     def reset(self):
         """Reset Q-values."""
-        self.q = np.zeros(self.n_actions)
+        self.q = np.zeros(self.n_actions, dtype=self.dtype)
+
+    def to_bytes(self):
+        """Serialize Q-values, hyperparameters and RNG state."""
+        return b"".join([
+            snapshot.pack_header(snapshot.KIND_CLASSICAL_Q, self.dtype),
+            struct.pack("<qddd", self.n_actions, self.alpha, self.gamma, self.epsilon),
+            snapshot.pack_array(self.q),
+            snapshot.pack_rng(self.rng),
+            _SETTINGS.pack(self.indexed),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore an agent written by to_bytes."""
+        _, offset = snapshot.unpack_header(data, snapshot.KIND_CLASSICAL_Q)
+        n_actions, alpha, gamma, epsilon = struct.unpack_from("<qddd", data, offset)
+        offset += 32
+        agent = cls(n_actions, alpha=alpha, gamma=gamma, epsilon=epsilon,
+                    precision=snapshot.unpack_precision(data))
+        q, offset = snapshot.unpack_array(data, offset)
+        agent.q = q.astype(agent.dtype)
+        agent.rng, offset = snapshot.unpack_rng(data, offset)
+        # Snapshots written before the argmax index existed end here
+        if len(data) >= offset + _SETTINGS.size:
+            (agent.indexed,) = _SETTINGS.unpack_from(data, offset)
+        return agent
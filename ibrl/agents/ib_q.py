@@ -1,7 +1,12 @@
 """Infrabayesian Q-learning agent with credal interval beliefs."""
 
+import struct
+
 import numpy as np
 from .base_agent import BaseAgent
+from .policy_search import PolicyProblem, branch_and_bound
+from ibrl.utils import snapshot
+from ibrl.utils.precision import get_precision
 
 
 class IBQAgent(BaseAgent):
@@ -13,7 +18,7 @@ class IBQAgent(BaseAgent):
     """
 
     def __init__(self, credal_interval, n_actions=2, alpha=0.1, gamma=0.99, 
-                 million=1_000_000, small=1_000, seed=None):
+                 million=1_000_000, small=1_000, seed=None, precision=None):
         """
         Args:
             credal_interval: CredalInterval object for belief updating
@@ -23,6 +28,7 @@ class IBQAgent(BaseAgent):
             million: Large box reward
             small: Small box reward
             seed: Random seed
+            precision: Storage precision (None, "double", "compact"; see ibrl.utils.precision)
         """
         self.credal = credal_interval
         self.n_actions = n_actions
@@ -30,7 +36,8 @@ class IBQAgent(BaseAgent):
         self.gamma = gamma
         self.million = million
         self.small = small
-        self.q = np.zeros(n_actions)
+        self.dtype = get_precision(precision).float_dtype
+        self.q = np.zeros(n_actions, dtype=self.dtype)
         self.rng = np.random.default_rng(seed)
 
     def worst_case_value(self, action):
@@ -62,6 +69,20 @@ class IBQAgent(BaseAgent):
         values = [self.worst_case_value(a) for a in range(self.n_actions)]
         return int(np.argmax(values))
 
+    def greedy_policy(self):
+        """
+        Worst-case optimal policy for transparent Newcomb.
+
+        Chooses the whole observation-to-action mapping at once
+        (updateless), so one-boxing on a full box is credited for the
+        prediction it causes.
+
+        Returns:
+            Actions for observations (box B empty, box B full)
+        """
+        problem = PolicyProblem.transparent_newcomb(self.credal.interval(), self.million, self.small)
+        return branch_and_bound(problem)["policy"]
+
     def select_action(self, state):
         """Select action using worst-case optimization (no exploration)."""
         return self.greedy_action()
@@ -91,4 +112,31 @@ class IBQAgent(BaseAgent):
 
     def reset(self):
         """Reset Q-values (credal interval persists across episodes)."""
-        self.q = np.zeros(self.n_actions)
+        self.q = np.zeros(self.n_actions, dtype=self.dtype)
+
+    def to_bytes(self):
+        """Serialize Q-values, credal belief, hyperparameters and RNG state."""
+        return b"".join([
+            snapshot.pack_header(snapshot.KIND_IB_Q, self.dtype),
+            struct.pack("<qdddd", self.n_actions, self.alpha, self.gamma,
+                        self.million, self.small),
+            snapshot.pack_array(self.q),
+            snapshot.pack_rng(self.rng),
+            snapshot.pack_blob(self.credal.to_bytes()),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore an agent (and its belief) written by to_bytes."""
+        _, offset = snapshot.unpack_header(data, snapshot.KIND_IB_Q)
+        n_actions, alpha, gamma, million, small = struct.unpack_from("<qdddd", data, offset)
+        offset += 40
+        q, offset = snapshot.unpack_array(data, offset)
+        rng, offset = snapshot.unpack_rng(data, offset)
+        credal_bytes, offset = snapshot.unpack_blob(data, offset)
+        agent = cls(snapshot.from_bytes(credal_bytes), n_actions=n_actions,
+                    alpha=alpha, gamma=gamma, million=million, small=small,
+                    precision=snapshot.unpack_precision(data))
+        agent.q = q.astype(agent.dtype)
+        agent.rng = rng
+        return agent
@@ -0,0 +1,256 @@
+"""Worst-case policy search over deterministic observation-to-action policies."""
+
+import numpy as np
+
+# Policy entries gathered per chunk when evaluating many policies at once
+_CHUNK_ENTRIES = 1 << 22
+
+
+def enumerate_policies(n_observations, n_actions):
+    """
+    All deterministic policies as an (n_actions ** n_observations, n_observations) array.
+
+    Only feasible for small problems; used for exhaustive checks.
+    """
+    shape = (n_actions,) * n_observations
+    index = np.arange(n_actions ** n_observations)
+    return np.stack(np.unravel_index(index, shape), axis=1)
+
+
+def _upper_pairs(pairwise):
+    """Fold ordered pair terms onto o < o' (zero elsewhere)."""
+    n = pairwise.shape[1]
+    folded = pairwise + pairwise.transpose(0, 3, 4, 1, 2)
+    upper = np.triu(np.ones((n, n), dtype=bool), k=1)
+    return folded * upper[None, :, None, :, None]
+
+
+def _policy_values(unary, pairs, policies):
+    """(P, K) values of policies given unary and upper-triangular pair terms."""
+    n_hypotheses, n = unary.shape[:2]
+    policies = np.asarray(policies)
+    values = np.empty((len(policies), n_hypotheses))
+    observations = np.arange(n)
+    rows = max(1, _CHUNK_ENTRIES // max(n_hypotheses * n * n, 1))
+    for start in range(0, len(policies), rows):
+        chunk = policies[start:start + rows]
+        single = unary[:, observations, chunk].sum(axis=-1)
+        pair = pairs[:, observations[:, None], chunk[:, :, None],
+                     observations[None, :], chunk[:, None, :]].sum(axis=(-2, -1))
+        values[start:start + rows] = (single + pair).T
+    return values
+
+
+class PolicyProblem:
+    """
+    Policy-dependent decision problem over a finite credal set.
+
+    A policy maps each of n observations to one of A actions. Under
+    hypothesis k (a vertex of the credal set) its value is
+
+        V_k(π) = Σ_o unary[k, o, π(o)] + Σ_{o ≠ o'} pairwise[k, o, π(o), o', π(o')]
+
+    The pairwise terms carry policy dependence: a predictor that inspects
+    the action taken at one observation changes how likely (and so how
+    valuable) another observation is. Values are linear in the
+    hypothesis, so the worst case over the convex credal set is the
+    minimum over its vertices.
+    """
+
+    def __init__(self, unary, pairwise=None):
+        """
+        Args:
+            unary: (K, n, A) value of action a at observation o under hypothesis k
+            pairwise: Optional (K, n, A, n, A) interaction values, summed over
+                ordered pairs of distinct observations
+        """
+        self.unary = np.array(unary, dtype=float)
+        if self.unary.ndim != 3:
+            raise ValueError("unary must have shape (hypotheses, observations, actions)")
+        self.n_hypotheses, self.n_observations, self.n_actions = self.unary.shape
+        shape = (self.n_hypotheses, self.n_observations, self.n_actions,
+                 self.n_observations, self.n_actions)
+        if pairwise is None:
+            self.pairs = np.zeros(shape)
+        else:
+            pairwise = np.array(pairwise, dtype=float)
+            if pairwise.shape != shape:
+                raise ValueError(f"pairwise must have shape {shape}")
+            self.pairs = _upper_pairs(pairwise)
+
+    @classmethod
+    def transparent_newcomb(cls, thetas, million=1_000_000, small=1_000):
+        """
+        Transparent Newcomb's problem.
+
+        Observation 0 is an empty box B, observation 1 a full one. The
+        predictor fills box B iff it predicts one-boxing on seeing it
+        full, with accuracy θ. Action 0 one-boxes, action 1 two-boxes.
+
+        Args:
+            thetas: Predictor accuracies spanning the credal set (e.g. the
+                endpoints of a CredalInterval)
+        """
+        thetas = np.atleast_1d(np.asarray(thetas, dtype=float))
+        n_hypotheses = len(thetas)
+        unary = np.zeros((n_hypotheses, 2, 2))
+        pairwise = np.zeros((n_hypotheses, 2, 2, 2, 2))
+        # Full box: seen with probability θ if the policy one-boxes there
+        unary[:, 1, 0] = thetas * million
+        unary[:, 1, 1] = (1 - thetas) * (million + small)
+        # Empty box: its probability depends on the action at the full box
+        p_empty = np.stack([1 - thetas, thetas], axis=1)
+        rewards_empty = np.array([0.0, small])
+        pairwise[:, 1, :, 0, :] = p_empty[:, :, None] * rewards_empty[None, None, :]
+        return cls(unary, pairwise)
+
+    @classmethod
+    def combine(cls, problems):
+        """
+        Joint problem over disjoint observations sharing one credal set.
+
+        The value is the sum of the parts, but the worst case is taken
+        jointly: one hypothesis must fit every part at once.
+        """
+        n_hypotheses = problems[0].n_hypotheses
+        n_actions = problems[0].n_actions
+        if any(p.n_hypotheses != n_hypotheses or p.n_actions != n_actions for p in problems):
+            raise ValueError("Combined problems need the same hypotheses and actions")
+        sizes = [p.n_observations for p in problems]
+        combined = cls(np.concatenate([p.unary for p in problems], axis=1))
+        starts = np.cumsum([0] + sizes)
+        for problem, start, stop in zip(problems, starts[:-1], starts[1:]):
+            combined.pairs[:, start:stop, :, start:stop, :] = problem.pairs
+        return combined
+
+    def values(self, policies):
+        """
+        Value of many policies under every hypothesis.
+
+        Args:
+            policies: (P, n) integer array of actions
+
+        Returns:
+            (P, K) array of values
+        """
+        return _policy_values(self.unary, self.pairs, np.asarray(policies, dtype=np.intp))
+
+    def worst_case_values(self, policies):
+        """Worst-case value over the credal set for each of (P, n) policies."""
+        return self.values(policies).min(axis=1)
+
+
+def branch_and_bound(problem, batch_size=256, tol=1e-9):
+    """
+    Policy with the highest worst-case value, by branch-and-bound.
+
+    Observations are assigned one at a time, widest value range first.
+    A partial policy is bounded per hypothesis by its exact value so far,
+    plus the best action for every free observation given the assigned
+    ones, plus the best joint action for every pair of free observations;
+    the minimum over hypotheses is an admissible bound on every
+    completion's worst-case value. Nodes are expanded depth-first in
+    batches (bounds, children and greedy completions are computed for a
+    whole batch at once), best bound first, and subtrees whose bound does
+    not beat the incumbent by tol are discarded.
+
+    Args:
+        problem: PolicyProblem
+        batch_size: Nodes expanded together
+        tol: Improvement a subtree must be able to make to be explored
+
+    Returns:
+        Dict with the optimal policy, its worst-case value, its values
+        per hypothesis, and search counters (expanded, pruned, leaves)
+    """
+    n_hypotheses, n, n_actions = problem.unary.shape
+
+    # Branch on influential observations first: tighter bounds near the root
+    spread = (np.ptp(problem.unary, axis=2).max(axis=0)
+              + np.abs(problem.pairs).max(axis=(2, 4)).sum(axis=2).max(axis=0)
+              + np.abs(problem.pairs).max(axis=(2, 4)).sum(axis=1).max(axis=0))
+    order = np.argsort(-spread, kind="stable")
+    unary = problem.unary[:, order]
+    symmetric = problem.pairs + problem.pairs.transpose(0, 3, 4, 1, 2)
+    pairs = _upper_pairs(symmetric[:, order][:, :, :, order] / 2)
+
+    # Best joint action over pairs of free observations, summed from depth d on
+    pair_best = pairs.max(axis=(2, 4)).sum(axis=2)
+    free_pairs = np.cumsum(pair_best[:, ::-1], axis=1)[:, ::-1]
+    free_pairs = np.concatenate([free_pairs, np.zeros((n_hypotheses, 1))], axis=1)
+
+    best = {"value": -np.inf, "policy": None}
+
+    def consider(policies):
+        values = _policy_values(unary, pairs, policies).min(axis=1)
+        i = int(np.argmax(values))
+        if values[i] > best["value"]:
+            best["value"] = float(values[i])
+            best["policy"] = policies[i].copy()
+
+    def complete(depth, actions, cross, node_bounds_k):
+        # Greedy completion for each node's tightest hypothesis
+        worst = np.argmin(node_bounds_k, axis=1)
+        choice = cross[np.arange(len(actions)), worst, depth:, :].argmax(axis=2)
+        completed = actions.copy()
+        completed[:, depth:] = choice
+        return completed
+
+    counters = {"expanded": 0, "pruned": 0, "leaves": 0}
+
+    # Node chunk: depth, actions (M, n), exact (M, K), cross (M, K, n, A), bounds (M,)
+    root_actions = np.zeros((1, n), dtype=np.intp)
+    root_exact = np.zeros((1, n_hypotheses))
+    root_cross = unary[None].copy()
+    root_k = root_exact + root_cross.max(axis=3).sum(axis=2) + free_pairs[:, 0]
+    consider(complete(0, root_actions, root_cross, root_k))
+    stack = [(0, root_actions, root_exact, root_cross, root_k.min(axis=1))]
+
+    while stack:
+        depth, actions, exact, cross, node_bounds = stack.pop()
+        alive = node_bounds > best["value"] + tol
+        counters["pruned"] += int(np.count_nonzero(~alive))
+        if not alive.any():
+            continue
+        actions, exact, cross = actions[alive], exact[alive], cross[alive]
+        counters["expanded"] += len(actions)
+
+        # Children: assign every action to observation `depth`
+        parent = np.repeat(np.arange(len(actions)), n_actions)
+        action = np.tile(np.arange(n_actions), len(actions))
+        child_actions = actions[parent]
+        child_actions[:, depth] = action
+        child_exact = exact[parent] + cross[parent, :, depth, action]
+        child_depth = depth + 1
+
+        if child_depth == n:
+            counters["leaves"] += len(child_actions)
+            consider(child_actions)
+            continue
+
+        child_cross = cross[parent] + pairs[:, depth, action].transpose(1, 0, 2, 3)
+        child_k = (child_exact + child_cross[:, :, child_depth:, :].max(axis=3).sum(axis=2)
+                   + free_pairs[:, child_depth])
+        child_bounds = child_k.min(axis=1)
+        keep = child_bounds > best["value"] + tol
+        counters["pruned"] += int(np.count_nonzero(~keep))
+        if not keep.any():
+            continue
+        # Push worst chunks first so the most promising nodes are popped next
+        survivors = np.flatnonzero(keep)
+        survivors = survivors[np.argsort(child_bounds[survivors], kind="stable")]
+        top = survivors[-n_actions:]
+        consider(complete(child_depth, child_actions[top], child_cross[top], child_k[top]))
+        for start in range(0, len(survivors), batch_size):
+            chunk = survivors[start:start + batch_size]
+            stack.append((child_depth, child_actions[chunk], child_exact[chunk],
+                          child_cross[chunk], child_bounds[chunk]))
+
+    policy = np.empty(n, dtype=int)
+    policy[order] = best["policy"]
+    return {
+        "policy": policy,
+        "value": best["value"],
+        "values": problem.values(policy[None])[0],
+        **counters,
+    }
@@ -1,5 +1,19 @@
 from .credal_interval import CredalInterval
+from .bounds import BOUND_FAMILIES, BoundTable, confidence_bounds
+from .windowed_interval import SlidingWindowInterval, DiscountedInterval
 from .credal_rectangle import CredalRectangle
 from .wasserstein_ball import WassersteinBall
+from .infradistribution import Infradistribution, minimal_points
 
-__all__ = ["CredalInterval", "CredalRectangle", "WassersteinBall"]
+__all__ = [
+    "CredalInterval",
+    "BOUND_FAMILIES",
+    "BoundTable",
+    "confidence_bounds",
+    "SlidingWindowInterval",
+    "DiscountedInterval",
+    "CredalRectangle",
+    "WassersteinBall",
+    "Infradistribution",
+    "minimal_points",
+]
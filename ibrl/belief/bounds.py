@@ -0,0 +1,173 @@
+"""Confidence-bound families for Bernoulli credal intervals.
+
+Supported families (all two-sided at confidence 1-δ):
+- "hoeffding": p̂ ± sqrt(log(2/δ) / (2n)); distribution-free but loose
+  near the edges of [0, 1]
+- "kl": Chernoff/KL-UCB inversion, {q : n·kl(p̂, q) <= log(2/δ)}
+- "clopper_pearson": exact binomial interval from beta quantiles
+- "bernstein": empirical Bernstein (Maurer & Pontil), uses the sample
+  variance so it tightens when p̂ is near 0 or 1
+- "wilson": Wilson score interval (normal approximation)
+
+Bounds depend only on (successes, trials, δ), so they are served from
+a lookup table per (family, δ): each (successes, trials) pair is
+computed once (a beta quantile or a 50-step KL bisection) and every
+later lookup is a dict hit.
+"""
+
+import math
+
+from scipy import special
+
+BOUND_FAMILIES = ("hoeffding", "kl", "clopper_pearson", "bernstein", "wilson")
+
+# Bisection steps for the KL inversion (interval shrinks to 2**-50)
+_KL_ITERATIONS = 50
+
+
+def _kl_bernoulli(p, q):
+    kl = 0.0
+    if p > 0:
+        kl += p * math.log(p / q)
+    if p < 1:
+        kl += (1 - p) * math.log((1 - p) / (1 - q))
+    return kl
+
+
+def _kl_bounds(p_hat, level):
+    upper = 1.0
+    if p_hat < 1:
+        lo, hi = p_hat, 1.0
+        for _ in range(_KL_ITERATIONS):
+            mid = (lo + hi) / 2
+            if _kl_bernoulli(p_hat, mid) <= level:
+                lo = mid
+            else:
+                hi = mid
+        upper = lo
+
+    lower = 0.0
+    if p_hat > 0:
+        lo, hi = 0.0, p_hat
+        for _ in range(_KL_ITERATIONS):
+            mid = (lo + hi) / 2
+            if _kl_bernoulli(p_hat, mid) <= level:
+                hi = mid
+            else:
+                lo = mid
+        lower = hi
+
+    return lower, upper
+
+
+def confidence_bounds(family, successes, trials, delta):
+    """
+    Compute a two-sided confidence interval for a Bernoulli mean.
+
+    Args:
+        family: One of BOUND_FAMILIES
+        successes: Number of successes
+        trials: Number of trials (>= 1)
+        delta: Confidence parameter (1-δ confidence)
+
+    Returns:
+        (lower, upper): Raw bounds (not intersected with any prior interval)
+    """
+    p_hat = successes / trials
+
+    if family == "hoeffding":
+        epsilon = math.sqrt(math.log(2 / delta) / (2 * trials))
+        return p_hat - epsilon, p_hat + epsilon
+
+    if family == "kl":
+        return _kl_bounds(p_hat, math.log(2 / delta) / trials)
+
+    if family == "clopper_pearson":
+        failures = trials - successes
+        lower = 0.0
+        if successes > 0:
+            lower = float(special.betaincinv(successes, failures + 1, delta / 2))
+        upper = 1.0
+        if failures > 0:
+            upper = float(special.betaincinv(successes + 1, failures, 1 - delta / 2))
+        return lower, upper
+
+    if family == "bernstein":
+        if trials < 2:
+            return 0.0, 1.0
+        variance = p_hat * (1 - p_hat) * trials / (trials - 1)
+        log_term = math.log(4 / delta)
+        epsilon = (math.sqrt(2 * variance * log_term / trials)
+                   + 7 * log_term / (3 * (trials - 1)))
+        return p_hat - epsilon, p_hat + epsilon
+
+    if family == "wilson":
+        z = float(special.ndtri(1 - delta / 2))
+        z2 = z * z
+        denom = 1 + z2 / trials
+        center = (p_hat + z2 / (2 * trials)) / denom
+        half = z / denom * math.sqrt(p_hat * (1 - p_hat) / trials + z2 / (4 * trials * trials))
+        return center - half, center + half
+
+    raise ValueError(f"Unknown bound family: {family}")
+
+
+class BoundTable:
+    """
+    Memoized bounds for one (family, δ), indexed by (successes, trials).
+
+    Holds at most max_entries pairs; once full, new pairs are computed
+    without being stored.
+    """
+
+    def __init__(self, family, delta, max_entries=1 << 20):
+        """
+        Args:
+            family: One of BOUND_FAMILIES
+            delta: Confidence parameter
+            max_entries: Maximum number of cached (successes, trials) pairs
+        """
+        if family not in BOUND_FAMILIES:
+            raise ValueError(f"Unknown bound family: {family}")
+        self.family = family
+        self.delta = delta
+        self.max_entries = max_entries
+        self._cache = {}
+
+    def bounds(self, successes, trials):
+        """Return (lower, upper) for one (successes, trials) pair."""
+        key = (successes, trials)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = confidence_bounds(self.family, successes, trials, self.delta)
+            if len(self._cache) < self.max_entries:
+                self._cache[key] = cached
+        return cached
+
+    def row(self, successes, trials):
+        """
+        Return (lower, upper) lists for several success counts at one
+        trial count, sharing the cache with bounds().
+        """
+        pairs = [self.bounds(int(s), trials) for s in successes]
+        return [p[0] for p in pairs], [p[1] for p in pairs]
+
+    def precompute(self, max_trials):
+        """Fill the table for every (successes, trials) with trials <= max_trials."""
+        for n in range(1, max_trials + 1):
+            self.row(range(n + 1), n)
+
+    def __len__(self):
+        return len(self._cache)
+
+
+_TABLES = {}
+
+
+def get_table(family, delta):
+    """Return the shared BoundTable for (family, δ), creating it on first use."""
+    key = (family, float(delta))
+    table = _TABLES.get(key)
+    if table is None:
+        table = _TABLES[key] = BoundTable(family, delta)
+    return table
@@ -1,6 +1,17 @@
 """Credal interval belief representation with concentration bounds."""
 
 import math
+import struct
+
+from ibrl.utils import snapshot
+from .bounds import BOUND_FAMILIES, get_table
+
+_STATE = struct.Struct("<dddddqq")
+_BOUND = struct.Struct("<B")
+_DETECTOR = struct.Struct("<B?q")
+
+# What to do when the confidence interval misses the prior interval
+RECOVERY_POLICIES = (None, "widen", "reset", "empirical")
 
 
 class CredalInterval:
@@ -9,30 +20,53 @@ class CredalInterval:
     
     Maintains interval [θ_lower, θ_upper] using concentration inequalities.
     Shrinks as more data is observed.
+    
+    Misspecification detection: if the true θ lies outside the initial
+    interval, the data-driven interval eventually misses it and the
+    intersection becomes empty (lower > upper). Each such update is
+    flagged and counted in O(1), and handled by the recovery policy:
+    - None: keep the empty interval (original behaviour)
+    - "widen": use the hull of the initial and data-driven intervals
+    - "reset": discard the observations and restart from the prior
+    - "empirical": drop the prior and use the data-driven interval
     """
 
-    def __init__(self, lower=0.8, upper=0.99, delta=0.05):
+    def __init__(self, lower=0.8, upper=0.99, delta=0.05, bound="hoeffding", recovery=None):
         """
         Args:
             lower: Initial lower bound on θ
             upper: Initial upper bound on θ
             delta: Confidence parameter (1-δ confidence)
+            bound: Confidence-bound family (see ibrl.belief.bounds)
+            recovery: Misspecification recovery policy (see RECOVERY_POLICIES)
         """
+        if bound not in BOUND_FAMILIES:
+            raise ValueError(f"Unknown bound family: {bound}")
+        if recovery not in RECOVERY_POLICIES:
+            raise ValueError(f"Unknown recovery policy: {recovery}")
         self.initial_lower = lower
         self.initial_upper = upper
         self.lower = lower
         self.upper = upper
         self.delta = delta
+        self.bound = bound
+        self._table = None if bound == "hoeffding" else get_table(bound, delta)
+        self.recovery = recovery
         
         self.successes = 0
         self.trials = 0
+        
+        # Misspecification detector state
+        self.misspecified = False
+        self.misspecified_steps = 0
 
     def update(self, success):
         """
         Update interval based on new observation.
         
-        Uses Hoeffding's inequality:
+        Uses Hoeffding's inequality by default:
         P(|θ̂ - θ| > ε) ≤ 2exp(-2nε²)
+        Other bound families are read from a cached table in O(1).
         
         Args:
             success: Whether predictor was correct (boolean)
@@ -44,19 +78,47 @@ class CredalInterval:
         if self.trials == 0:
             return
         
-        # Empirical estimate
-        p_hat = self.successes / self.trials
-        
-        # Concentration bound: ε = sqrt(log(2/δ) / (2n))
-        epsilon = math.sqrt(math.log(2 / self.delta) / (2 * self.trials))
-        
+        self._refresh()
+
+    def _refresh(self):
+        """Recompute the interval from the current counts."""
+        if self._table is None:
+            # Empirical estimate
+            p_hat = self.successes / self.trials
+            
+            # Concentration bound: ε = sqrt(log(2/δ) / (2n))
+            epsilon = math.sqrt(math.log(2 / self.delta) / (2 * self.trials))
+            lower, upper = p_hat - epsilon, p_hat + epsilon
+        else:
+            lower, upper = self._table.bounds(self.successes, self.trials)
+        self._set_interval(lower, upper)
+
+    def _set_interval(self, lower, upper):
+        """Clip raw bounds to [0, 1] and intersect with the initial interval."""
         # Update interval
-        self.lower = max(0.0, p_hat - epsilon)
-        self.upper = min(1.0, p_hat + epsilon)
+        self.lower = max(0.0, lower)
+        self.upper = min(1.0, upper)
         
         # Intersect with initial bounds
         self.lower = max(self.lower, self.initial_lower)
         self.upper = min(self.upper, self.initial_upper)
+        
+        self.misspecified = self.lower > self.upper
+        if self.misspecified:
+            self.misspecified_steps += 1
+            self._recover(max(0.0, lower), min(1.0, upper))
+
+    def _recover(self, lower, upper):
+        """Apply the recovery policy to an empty interval."""
+        if self.recovery == "widen":
+            self.lower = min(lower, self.initial_lower)
+            self.upper = max(upper, self.initial_upper)
+        elif self.recovery == "empirical":
+            self.lower, self.upper = lower, upper
+        elif self.recovery == "reset":
+            steps = self.misspecified_steps
+            self.reset()
+            self.misspecified, self.misspecified_steps = True, steps
 
     def interval(self):
         """
@@ -77,3 +139,39 @@ class CredalInterval:
         self.upper = self.initial_upper
         self.successes = 0
         self.trials = 0
+        self.misspecified = False
+        self.misspecified_steps = 0
+
+    def _pack_detector(self):
+        return _DETECTOR.pack(RECOVERY_POLICIES.index(self.recovery),
+                              self.misspecified, self.misspecified_steps)
+
+    def _unpack_detector(self, data, offset):
+        # Older snapshots carry no detector state
+        if len(data) >= offset + _DETECTOR.size:
+            code, self.misspecified, self.misspecified_steps = _DETECTOR.unpack_from(data, offset)
+            self.recovery = RECOVERY_POLICIES[code]
+
+    def to_bytes(self):
+        """Serialize interval state to a compact versioned snapshot."""
+        return snapshot.pack_header(snapshot.KIND_CREDAL_INTERVAL) + _STATE.pack(
+            self.initial_lower, self.initial_upper, self.lower, self.upper,
+            self.delta, self.successes, self.trials
+        ) + _BOUND.pack(BOUND_FAMILIES.index(self.bound)) + self._pack_detector()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore an interval written by to_bytes."""
+        _, offset = snapshot.unpack_header(data, snapshot.KIND_CREDAL_INTERVAL)
+        (initial_lower, initial_upper, lower, upper,
+         delta, successes, trials) = _STATE.unpack_from(data, offset)
+        offset += _STATE.size
+        # Snapshots written before bound families existed end here
+        bound = "hoeffding"
+        if len(data) >= offset + _BOUND.size:
+            bound = BOUND_FAMILIES[_BOUND.unpack_from(data, offset)[0]]
+        credal = cls(lower=initial_lower, upper=initial_upper, delta=delta, bound=bound)
+        credal.lower, credal.upper = lower, upper
+        credal.successes, credal.trials = successes, trials
+        credal._unpack_detector(data, offset + _BOUND.size)
+        return credal
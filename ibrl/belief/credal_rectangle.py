@@ -1,7 +1,12 @@
 """Multi-dimensional credal intervals (rectangular credal sets)."""
 
+import struct
+
 import numpy as np
 
+from ibrl.utils import snapshot
+from ibrl.utils.precision import get_precision
+
 
 class CredalRectangle:
     """
@@ -10,21 +15,23 @@ class CredalRectangle:
     Each dimension updated independently using concentration bounds.
     """
 
-    def __init__(self, lower_bounds, upper_bounds, delta=0.05):
+    def __init__(self, lower_bounds, upper_bounds, delta=0.05, precision=None):
         """
         Args:
             lower_bounds: Initial lower bounds for each dimension
             upper_bounds: Initial upper bounds for each dimension
             delta: Confidence parameter
+            precision: Storage precision (None, "double", "compact")
         """
-        self.initial_lower = np.array(lower_bounds, dtype=float)
-        self.initial_upper = np.array(upper_bounds, dtype=float)
+        self.dtype = get_precision(precision).float_dtype
+        self.initial_lower = np.array(lower_bounds, dtype=self.dtype)
+        self.initial_upper = np.array(upper_bounds, dtype=self.dtype)
         self.lower = self.initial_lower.copy()
         self.upper = self.initial_upper.copy()
         self.delta = delta
         
         self.n_dims = len(self.lower)
-        self.successes = np.zeros(self.n_dims)
+        self.successes = np.zeros(self.n_dims, dtype=self.dtype)
         self.trials = 0
 
     def update(self, outcomes):
@@ -35,7 +42,7 @@ class CredalRectangle:
             outcomes: Array of boolean outcomes for each dimension
         """
         self.trials += 1
-        self.successes += np.array(outcomes, dtype=float)
+        self.successes += np.array(outcomes, dtype=self.dtype)
         
         if self.trials == 0:
             return
@@ -49,8 +56,8 @@ class CredalRectangle:
         self.upper = np.minimum(1.0, p_hat + eps)
         
         # Intersect with initial bounds
-        self.lower = np.maximum(self.lower, self.initial_lower)
-        self.upper = np.minimum(self.upper, self.initial_upper)
+        self.lower = np.maximum(self.lower, self.initial_lower).astype(self.dtype, copy=False)
+        self.upper = np.minimum(self.upper, self.initial_upper).astype(self.dtype, copy=False)
 
     def interval(self):
         """Return current credal rectangle as (lower, upper) arrays."""
@@ -64,5 +71,36 @@ class CredalRectangle:
         """Reset to initial bounds."""
         self.lower = self.initial_lower.copy()
         self.upper = self.initial_upper.copy()
-        self.successes = np.zeros(self.n_dims)
+        self.successes = np.zeros(self.n_dims, dtype=self.dtype)
         self.trials = 0
+
+    def to_bytes(self):
+        """Serialize rectangle state to a compact versioned snapshot."""
+        return b"".join([
+            snapshot.pack_header(snapshot.KIND_CREDAL_RECTANGLE, self.dtype),
+            struct.pack("<dq", self.delta, self.trials),
+            snapshot.pack_array(self.initial_lower),
+            snapshot.pack_array(self.initial_upper),
+            snapshot.pack_array(self.lower),
+            snapshot.pack_array(self.upper),
+            snapshot.pack_array(self.successes),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore a rectangle written by to_bytes."""
+        _, offset = snapshot.unpack_header(data, snapshot.KIND_CREDAL_RECTANGLE)
+        delta, trials = struct.unpack_from("<dq", data, offset)
+        offset += 16
+        initial_lower, offset = snapshot.unpack_array(data, offset)
+        initial_upper, offset = snapshot.unpack_array(data, offset)
+        credal = cls(initial_lower, initial_upper, delta=delta,
+                     precision=snapshot.unpack_precision(data))
+        lower, offset = snapshot.unpack_array(data, offset)
+        upper, offset = snapshot.unpack_array(data, offset)
+        successes, offset = snapshot.unpack_array(data, offset)
+        credal.lower = lower.astype(credal.dtype)
+        credal.upper = upper.astype(credal.dtype)
+        credal.successes = successes.astype(credal.dtype)
+        credal.trials = trials
+        return credal
@@ -0,0 +1,344 @@
+"""Finite infradistributions: sets of sa-measures over discrete outcomes."""
+
+import struct
+
+import numpy as np
+
+from ibrl.utils import snapshot
+from ibrl.utils.precision import get_precision
+
+# State of a point whose future kernel is chosen adversarially every step
+KNIGHTIAN = -1
+
+
+def minimal_points(scales, offsets, tol=1e-12):
+    """
+    Indices of the minimal points of a set of (λ, b) pairs sharing one future.
+
+    A point is non-minimal when a convex combination of other points has
+    both a smaller or equal scale and a smaller or equal offset (it then
+    lies in their upper completion and never attains a worst case over
+    functions in [0, 1]). The minimal points are the lower-left convex
+    chain: a sort and a running minimum remove dominated points, then
+    vectorized passes drop chain points lying on or above the segment
+    between their neighbours until the chain is convex.
+
+    Args:
+        scales: Total masses λ
+        offsets: Offsets b
+        tol: Relative tolerance for ties, scaled by the magnitude of the
+            coordinates (only rounding-level ties are merged, so dropping
+            a point never moves an expectation by more than rounding)
+
+    Returns:
+        Sorted array of indices to keep
+    """
+    scales = np.asarray(scales, dtype=float)
+    offsets = np.asarray(offsets, dtype=float)
+    if len(scales) <= 1:
+        return np.arange(len(scales))
+
+    # Pareto front: increasing λ, strictly decreasing b
+    order = np.lexsort((offsets, scales))
+    b = offsets[order]
+    best_before = np.concatenate([[np.inf], np.minimum.accumulate(b)[:-1]])
+    chain = order[b < best_before - tol * np.abs(b)]
+
+    # Convexity: drop points on or above the chord between their neighbours
+    while len(chain) > 2:
+        x, y = scales[chain], offsets[chain]
+        dx1, dy1 = x[1:-1] - x[:-2], y[1:-1] - y[:-2]
+        dx2, dy2 = x[2:] - x[:-2], y[2:] - y[:-2]
+        # Differences carry rounding relative to the coordinates themselves
+        x_size = np.maximum(np.abs(x[:-2]), np.abs(x[2:]))
+        y_size = np.maximum.reduce([np.abs(y[:-2]), np.abs(y[1:-1]), np.abs(y[2:])])
+        slack = tol * ((np.abs(dx1) + np.abs(dx2)) * y_size
+                       + (np.abs(dy1) + np.abs(dy2)) * x_size)
+        keep = np.ones(len(chain), dtype=bool)
+        keep[1:-1] = dx1 * dy2 - dy1 * dx2 > slack
+        if keep.all():
+            break
+        # A point above a chord between points of the set is never a hull
+        # vertex, whether or not its neighbours survive this pass
+        chain = chain[keep]
+    return np.sort(chain)
+
+
+class Infradistribution:
+    """
+    Finite infradistribution over discrete outcomes.
+
+    Each point is an sa-measure (m, b) over outcome histories, written
+    as a scale λ, an offset b and a state: either a fixed kernel index
+    (the point's future outcomes are i.i.d. from that kernel, m = λ·p)
+    or KNIGHTIAN (the environment may pick any kernel at every step).
+
+    Updating on an outcome follows the infra-Bayesian rule: every point
+    is restricted to the observed outcome, the mass it loses is charged
+    to the offset at the off-event value g, and the set is renormalized
+    so that E[0] = 0 and E[1] = 1. Knightian points branch into one
+    child per kernel, so the set grows with every update; after each
+    update, points that cannot attain a worst case are pruned (see
+    prune), which keeps the point count bounded.
+
+    Points are stored as scales and totals λ + b rather than offsets:
+    renormalization magnifies differences between totals by
+    1 / (E[1] - E[0]) every step, and totals that are equal (every point
+    of a crisp set under g = 1) stay bit-identical this way instead of
+    drifting apart through rounding.
+    """
+
+    def __init__(self, kernels, offsets=None, scales=None, knightian=False, off_event=1.0,
+                 tol=1e-9, precision=None):
+        """
+        Args:
+            kernels: (K, n) array of outcome distributions (hypotheses)
+            offsets: Initial offset per hypothesis (default 0); a larger
+                offset makes a hypothesis less able to attain the worst case
+            scales: Initial scale per hypothesis (default 1)
+            knightian: If True, start from a single point whose kernel is
+                chosen adversarially at every step (offsets/scales unused)
+            off_event: Value g in [0, 1] credited for outcomes that did not
+                occur; with g = 1 fixed hypotheses compete by likelihood,
+                with g = 0 the least likely one sets the worst case
+            tol: Smallest E[1] - E[0] accepted when renormalizing
+            precision: Storage precision (None, "double", "compact")
+        """
+        self.dtype = get_precision(precision).float_dtype
+        self.kernels = np.array(kernels, dtype=float)
+        if self.kernels.ndim != 2 or np.any(self.kernels < 0):
+            raise ValueError("kernels must be a (K, n) array of distributions")
+        self.kernels /= self.kernels.sum(axis=1, keepdims=True)
+        self.n_outcomes = self.kernels.shape[1]
+        if not 0.0 <= off_event <= 1.0:
+            raise ValueError("off_event must lie in [0, 1]")
+        self.off_event = off_event
+        self.tol = tol
+
+        n_kernels = len(self.kernels)
+        if knightian:
+            self.initial_states = np.array([KNIGHTIAN])
+            self.initial_scales = np.ones(1)
+            self.initial_totals = np.ones(1)
+        else:
+            self.initial_states = np.arange(n_kernels)
+            self.initial_scales = (np.ones(n_kernels) if scales is None
+                                   else np.array(scales, dtype=float))
+            self.initial_totals = self.initial_scales + (
+                0.0 if offsets is None else np.array(offsets, dtype=float))
+        self.reset()
+
+    @classmethod
+    def bernoulli(cls, thetas, knightian=False, **kwargs):
+        """
+        Infradistribution over a binary outcome (e.g. predictor correct).
+
+        Args:
+            thetas: Success probabilities of the hypotheses, e.g. a grid
+                over a credal interval [θ_lower, θ_upper]
+            knightian: Success probability may change adversarially within
+                `thetas` at every step
+        """
+        thetas = np.asarray(thetas, dtype=float)
+        return cls(np.stack([1 - thetas, thetas], axis=1), knightian=knightian, **kwargs)
+
+    @property
+    def n_points(self):
+        """Number of sa-measures currently stored."""
+        return len(self.states)
+
+    @property
+    def offsets(self):
+        """Offset b of each point."""
+        return self.totals - self.scales
+
+    def _future_values(self, values):
+        """Expectation of values under each point's predictive kernel, per unit scale."""
+        per_kernel = self.kernels @ values
+        return np.where(self.states >= 0, per_kernel[np.maximum(self.states, 0)],
+                        per_kernel.min())
+
+    def update(self, outcome):
+        """
+        Infra-Bayesian update on an observed outcome.
+
+        If the outcome has zero worst-case probability (E[1] - E[0] of
+        the restricted set vanishes), the belief is left unchanged and
+        the step is counted in `misspecified_steps`.
+
+        Args:
+            outcome: Index of the observed outcome (bools index 0/1)
+        """
+        outcome = int(outcome)
+        self.trials += 1
+        scales = self.scales.astype(float)
+        totals = self.totals.astype(float)
+
+        # Children: fixed points keep their kernel, Knightian points branch
+        fixed = self.states >= 0
+        knightian = np.flatnonzero(~fixed)
+        n_kernels = len(self.kernels)
+        states = np.concatenate([self.states[fixed], np.full(len(knightian) * n_kernels,
+                                                             KNIGHTIAN)])
+        parent_scales = np.concatenate([scales[fixed], np.repeat(scales[knightian], n_kernels)])
+        parent_totals = np.concatenate([totals[fixed], np.repeat(totals[knightian], n_kernels)])
+        kernel = np.concatenate([self.states[fixed], np.tile(np.arange(n_kernels),
+                                                              len(knightian))])
+        lost = 1 - self.kernels[kernel, outcome]
+
+        # Restrict to the outcome; the lost mass is worth g
+        child_scales = parent_scales - parent_scales * lost
+        child_totals = parent_totals - (1 - self.off_event) * parent_scales * lost
+
+        # Renormalize: E[g ★ 0] -> 0, E[g ★ 1] -> 1
+        e0 = (child_totals - child_scales).min()
+        e1 = child_totals.min()
+        if e1 - e0 <= self.tol:
+            self.misspecified = True
+            self.misspecified_steps += 1
+            return
+        self.misspecified = False
+        self.states = states
+        with np.errstate(over="ignore"):
+            self.scales = (child_scales / (e1 - e0)).astype(self.dtype)
+            self.totals = ((child_totals - e0) / (e1 - e0)).astype(self.dtype)
+        self.prune()
+
+    def prune(self):
+        """
+        Drop points that cannot attain a worst case.
+
+        Across states, a point whose offset reaches E[1] = min(λ + b) = 1
+        is never below the point attaining that minimum. Within a state,
+        non-minimal points are removed (see minimal_points). Both tests
+        are exact up to rounding: updates divide by E[1] - E[0] every
+        step, so a point dropped for being merely close to dominated could
+        later set a worst case far from the one kept, while dominated
+        points stay dominated under updates. Points whose scale overflowed
+        only matter for functions vanishing on their kernel's support and
+        are dropped as well.
+
+        Returns:
+            Number of points removed
+        """
+        before = self.n_points
+        finite = np.isfinite(self.scales) & np.isfinite(self.totals)
+        if not finite.all():
+            self.states, self.scales, self.totals = (
+                self.states[finite], self.scales[finite], self.totals[finite])
+        offsets = self.offsets
+        alive = offsets < self.totals.min()
+        if not alive.any():
+            alive[np.lexsort((offsets, self.totals))[0]] = True
+
+        keep = []
+        for state in np.unique(self.states[alive]):
+            group = np.flatnonzero(alive & (self.states == state))
+            keep.append(group[minimal_points(self.scales[group], offsets[group])])
+        keep = np.sort(np.concatenate(keep))
+        self.states = self.states[keep]
+        self.scales = self.scales[keep]
+        self.totals = self.totals[keep]
+        self.pruned += before - self.n_points
+        return before - self.n_points
+
+    def worst_case_expectation(self, values):
+        """
+        Worst-case expectation of a function of the next outcome.
+
+        E_H[f] = min over points of λ·E_kernel[f] + b, where Knightian
+        points take the worst kernel. Infradistribution expectations are
+        defined on functions in [0, 1], so values are rescaled to that
+        range and the result is mapped back.
+
+        Args:
+            values: Value of each outcome
+
+        Returns:
+            Worst-case expected value
+        """
+        values = np.asarray(values, dtype=float)
+        low, high = values.min(), values.max()
+        if high == low:
+            return float(low)
+        unit = (values - low) / (high - low)
+        expectation = np.min(self.totals - self.scales * (1 - self._future_values(unit)))
+        return float(low + (high - low) * expectation)
+
+    def interval(self):
+        """
+        Range of next-outcome probabilities over the remaining points.
+
+        Every surviving point can attain the worst case for some function;
+        fixed points predict with their kernel, Knightian points with any
+        kernel.
+
+        Returns:
+            (lower, upper): Per-outcome probability bounds
+        """
+        fixed = np.unique(self.states[self.states >= 0])
+        kernels = self.kernels if np.any(self.states < 0) else self.kernels[fixed]
+        return kernels.min(axis=0), kernels.max(axis=0)
+
+    def width(self):
+        """Average gap between upper and lower outcome probabilities."""
+        lower, upper = self.interval()
+        return float(np.mean(upper - lower))
+
+    def reset(self):
+        """Reset to the initial point set."""
+        self.states = self.initial_states.copy()
+        self.scales = self.initial_scales.astype(self.dtype)
+        self.totals = self.initial_totals.astype(self.dtype)
+        self.trials = 0
+        self.pruned = 0
+        self.misspecified = False
+        self.misspecified_steps = 0
+
+    _STATE = struct.Struct("<ddqqq?")
+
+    def to_bytes(self):
+        """Serialize the point set to a compact versioned snapshot."""
+        n_kernels, n_outcomes = self.kernels.shape
+        return b"".join([
+            snapshot.pack_header(snapshot.KIND_INFRADISTRIBUTION, self.dtype),
+            self._STATE.pack(self.off_event, self.tol, self.trials, self.pruned,
+                             self.misspecified_steps, self.misspecified),
+            struct.pack("<QQ", n_kernels, n_outcomes),
+            snapshot.pack_array(self.kernels.ravel()),
+            snapshot.pack_array(self.initial_states),
+            snapshot.pack_array(self.initial_scales),
+            snapshot.pack_array(self.initial_totals),
+            snapshot.pack_array(self.states),
+            snapshot.pack_array(self.scales),
+            snapshot.pack_array(self.totals),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore an infradistribution written by to_bytes."""
+        _, offset = snapshot.unpack_header(data, snapshot.KIND_INFRADISTRIBUTION)
+        off_event, tol, trials, pruned, misspecified_steps, misspecified = \
+            cls._STATE.unpack_from(data, offset)
+        offset += cls._STATE.size
+        n_kernels, n_outcomes = struct.unpack_from("<QQ", data, offset)
+        offset += 16
+        arrays = []
+        for _ in range(7):
+            values, offset = snapshot.unpack_array(data, offset)
+            arrays.append(values)
+        kernels, initial_states, initial_scales, initial_totals, states, scales, totals = arrays
+
+        belief = cls(kernels.reshape(n_kernels, n_outcomes), off_event=off_event, tol=tol,
+                     precision=snapshot.unpack_precision(data))
+        belief.initial_states = initial_states.astype(np.int64)
+        belief.initial_scales = initial_scales
+        belief.initial_totals = initial_totals
+        belief.states = states.astype(np.int64)
+        belief.scales = scales.astype(belief.dtype)
+        belief.totals = totals.astype(belief.dtype)
+        belief.trials = trials
+        belief.pruned = pruned
+        belief.misspecified = misspecified
+        belief.misspecified_steps = misspecified_steps
+        return belief
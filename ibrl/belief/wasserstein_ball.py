@@ -1,8 +1,13 @@
 """Wasserstein uncertainty ball for distributionally robust RL."""
 
+import struct
+
 import numpy as np
 from scipy.optimize import linprog
 
+from ibrl.utils import snapshot
+from ibrl.utils.precision import get_precision
+
 
 class WassersteinBall:
     """
@@ -12,20 +17,22 @@ class WassersteinBall:
     from the empirical estimate.
     """
 
-    def __init__(self, center_dist, radius, delta=0.05):
+    def __init__(self, center_dist, radius, delta=0.05, precision=None):
         """
         Args:
             center_dist: Empirical distribution (numpy array)
             radius: Wasserstein radius ε
             delta: Confidence parameter
+            precision: Storage precision (None, "double", "compact")
         """
-        self.center = np.array(center_dist, dtype=float)
+        self.dtype = get_precision(precision).float_dtype
+        self.center = np.array(center_dist, dtype=self.dtype)
         self.radius = radius
         self.delta = delta
         self.n_outcomes = len(center_dist)
         
         # Track observations
-        self.counts = np.zeros(self.n_outcomes)
+        self.counts = np.zeros(self.n_outcomes, dtype=self.dtype)
         self.trials = 0
 
     def update(self, outcome):
@@ -86,6 +93,28 @@ class WassersteinBall:
 
     def reset(self):
         """Reset to initial state."""
-        self.counts = np.zeros(self.n_outcomes)
+        self.counts = np.zeros(self.n_outcomes, dtype=self.dtype)
         self.trials = 0
-        self.center = np.ones(self.n_outcomes) / self.n_outcomes
+        self.center = np.ones(self.n_outcomes, dtype=self.dtype) / self.n_outcomes
+
+    def to_bytes(self):
+        """Serialize ball state to a compact versioned snapshot."""
+        return b"".join([
+            snapshot.pack_header(snapshot.KIND_WASSERSTEIN_BALL, self.dtype),
+            struct.pack("<ddq", self.radius, self.delta, self.trials),
+            snapshot.pack_array(self.center),
+            snapshot.pack_array(self.counts),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore a ball written by to_bytes."""
+        _, offset = snapshot.unpack_header(data, snapshot.KIND_WASSERSTEIN_BALL)
+        radius, delta, trials = struct.unpack_from("<ddq", data, offset)
+        offset += 24
+        center, offset = snapshot.unpack_array(data, offset)
+        counts, offset = snapshot.unpack_array(data, offset)
+        ball = cls(center, radius, delta=delta, precision=snapshot.unpack_precision(data))
+        ball.counts = counts.astype(ball.dtype)
+        ball.trials = trials
+        return ball
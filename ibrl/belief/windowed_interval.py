@@ -0,0 +1,191 @@
+"""Credal intervals that forget old observations, for drifting predictors."""
+
+import math
+import struct
+
+from ibrl.utils import snapshot
+from .bounds import BOUND_FAMILIES, confidence_bounds
+from .credal_interval import CredalInterval
+
+_WINDOW_STATE = struct.Struct("<dddddqqqqB")
+_DISCOUNT_STATE = struct.Struct("<dddddddddqB")
+
+
+class SlidingWindowInterval(CredalInterval):
+    """
+    Credal interval over the last `window` observations only.
+
+    Outcomes are kept in a ring buffer of packed bits (window / 8 bytes),
+    so each update is O(1) and memory is fixed however long the run.
+    `successes`/`trials` are the counts inside the window, and the
+    concentration radius uses the window count: Hoeffding's radius
+    sqrt(log(2/δ) / (2·min(t, W))) never drops below its value at W,
+    so the interval keeps tracking a predictor whose accuracy drifts.
+    """
+
+    def __init__(self, window=200, lower=0.8, upper=0.99, delta=0.05, bound="hoeffding",
+                 recovery=None):
+        """
+        Args:
+            window: Number of most recent observations kept
+            lower: Initial lower bound on θ
+            upper: Initial upper bound on θ
+            delta: Confidence parameter (1-δ confidence)
+            bound: Confidence-bound family (see ibrl.belief.bounds)
+            recovery: Misspecification recovery policy (see CredalInterval)
+        """
+        if window < 1:
+            raise ValueError("window must be positive")
+        super().__init__(lower=lower, upper=upper, delta=delta, bound=bound,
+                         recovery=recovery)
+        self.window = window
+        self._bits = bytearray((window + 7) // 8)
+        self.observed = 0
+
+    def update(self, success):
+        """
+        Add an observation, evicting the oldest once the window is full.
+
+        Args:
+            success: Whether predictor was correct (boolean)
+        """
+        pos = self.observed % self.window
+        byte, mask = pos >> 3, 1 << (pos & 7)
+
+        if self.observed >= self.window:
+            if self._bits[byte] & mask:
+                self.successes -= 1
+        else:
+            self.trials += 1
+
+        if success:
+            self._bits[byte] |= mask
+            self.successes += 1
+        else:
+            self._bits[byte] &= ~mask & 0xFF
+
+        self.observed += 1
+        self._refresh()
+
+    def reset(self):
+        """Reset to initial interval and clear the window."""
+        super().reset()
+        self._bits = bytearray(len(self._bits))
+        self.observed = 0
+
+    def to_bytes(self):
+        """Serialize interval state, including the window contents."""
+        return snapshot.pack_header(snapshot.KIND_WINDOWED_INTERVAL) + _WINDOW_STATE.pack(
+            self.initial_lower, self.initial_upper, self.lower, self.upper, self.delta,
+            self.window, self.successes, self.trials, self.observed,
+            BOUND_FAMILIES.index(self.bound)
+        ) + bytes(self._bits) + self._pack_detector()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore an interval written by to_bytes."""
+        _, offset = snapshot.unpack_header(data, snapshot.KIND_WINDOWED_INTERVAL)
+        (initial_lower, initial_upper, lower, upper, delta, window,
+         successes, trials, observed, bound) = _WINDOW_STATE.unpack_from(data, offset)
+        offset += _WINDOW_STATE.size
+        credal = cls(window=window, lower=initial_lower, upper=initial_upper,
+                     delta=delta, bound=BOUND_FAMILIES[bound])
+        credal.lower, credal.upper = lower, upper
+        credal.successes, credal.trials, credal.observed = successes, trials, observed
+        credal._bits = bytearray(data[offset:offset + len(credal._bits)])
+        credal._unpack_detector(data, offset + len(credal._bits))
+        return credal
+
+
+class DiscountedInterval(CredalInterval):
+    """
+    Credal interval with exponentially discounted observations.
+
+    Observation i steps in the past has weight gamma**i. `successes` and
+    `trials` hold the discounted sums Σwᵢxᵢ and Σwᵢ, and the radius uses
+    the weighted Hoeffding bound with effective sample size
+    n_eff = (Σwᵢ)² / Σwᵢ², which converges to (1+γ)/(1-γ). State is
+    three floats, so updates are O(1) with no buffer at all.
+
+    Non-Hoeffding families are evaluated at (p̂·n_eff, n_eff) directly;
+    fractional counts cannot be served from the lookup table.
+    """
+
+    def __init__(self, gamma=0.99, lower=0.8, upper=0.99, delta=0.05, bound="hoeffding",
+                 recovery=None):
+        """
+        Args:
+            gamma: Per-observation discount factor in (0, 1)
+            lower: Initial lower bound on θ
+            upper: Initial upper bound on θ
+            delta: Confidence parameter (1-δ confidence)
+            bound: Confidence-bound family (see ibrl.belief.bounds)
+            recovery: Misspecification recovery policy (see CredalInterval)
+        """
+        if not 0 < gamma < 1:
+            raise ValueError("gamma must be in (0, 1)")
+        super().__init__(lower=lower, upper=upper, delta=delta, bound=bound,
+                         recovery=recovery)
+        self.gamma = gamma
+        self.successes = 0.0
+        self.trials = 0.0
+        self.sum_sq = 0.0
+        self.observed = 0
+
+    def update(self, success):
+        """
+        Decay the sums and add an observation with weight 1.
+
+        Args:
+            success: Whether predictor was correct (boolean)
+        """
+        gamma = self.gamma
+        self.successes = gamma * self.successes + (1.0 if success else 0.0)
+        self.trials = gamma * self.trials + 1.0
+        self.sum_sq = gamma * gamma * self.sum_sq + 1.0
+        self.observed += 1
+        self._refresh()
+
+    def effective_trials(self):
+        """Effective sample size (Σwᵢ)² / Σwᵢ²."""
+        return self.trials * self.trials / self.sum_sq if self.sum_sq else 0.0
+
+    def _refresh(self):
+        p_hat = self.successes / self.trials
+        n_eff = self.effective_trials()
+        if self.bound == "hoeffding":
+            epsilon = math.sqrt(math.log(2 / self.delta) / (2 * n_eff))
+            lower, upper = p_hat - epsilon, p_hat + epsilon
+        else:
+            lower, upper = confidence_bounds(self.bound, p_hat * n_eff, n_eff, self.delta)
+        self._set_interval(lower, upper)
+
+    def reset(self):
+        """Reset to initial interval and clear the discounted sums."""
+        super().reset()
+        self.successes = 0.0
+        self.trials = 0.0
+        self.sum_sq = 0.0
+        self.observed = 0
+
+    def to_bytes(self):
+        """Serialize interval state to a compact versioned snapshot."""
+        return snapshot.pack_header(snapshot.KIND_DISCOUNTED_INTERVAL) + _DISCOUNT_STATE.pack(
+            self.initial_lower, self.initial_upper, self.lower, self.upper, self.delta,
+            self.gamma, self.successes, self.trials, self.sum_sq, self.observed,
+            BOUND_FAMILIES.index(self.bound)
+        ) + self._pack_detector()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore an interval written by to_bytes."""
+        _, offset = snapshot.unpack_header(data, snapshot.KIND_DISCOUNTED_INTERVAL)
+        (initial_lower, initial_upper, lower, upper, delta, gamma,
+         successes, trials, sum_sq, observed, bound) = _DISCOUNT_STATE.unpack_from(data, offset)
+        credal = cls(gamma=gamma, lower=initial_lower, upper=initial_upper,
+                     delta=delta, bound=BOUND_FAMILIES[bound])
+        credal.lower, credal.upper = lower, upper
+        credal.successes, credal.trials, credal.sum_sq = successes, trials, sum_sq
+        credal.observed = observed
+        credal._unpack_detector(data, offset + _DISCOUNT_STATE.size)
+        return credal
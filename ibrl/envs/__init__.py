@@ -3,17 +3,35 @@
 
 from .base_env import BaseEnv
 from .bandit import BanditEnv
+from .block_bandit import (
+    DriftSchedule,
+    BlockBanditEnv,
+    BernoulliBanditEnv,
+    GaussianBanditEnv,
+    CategoricalBanditEnv,
+)
 from .newcomb import NewcombEnv
 from .transparent_newcomb import TransparentNewcombEnv
 from .twin_pd import TwinPDEnv
+from .drifting_newcomb import DriftingNewcombEnv, DriftingTwinPDEnv
 from .misspecified_newcomb import MisspecifiedNewcombEnv, AdversarialNewcombEnv
+from .matrix_games import GameBatch, generate_games
 
 __all__ = [
     "BaseEnv",
     "BanditEnv",
+    "DriftSchedule",
+    "BlockBanditEnv",
+    "BernoulliBanditEnv",
+    "GaussianBanditEnv",
+    "CategoricalBanditEnv",
     "NewcombEnv",
     "TransparentNewcombEnv",
     "TwinPDEnv",
+    "DriftingNewcombEnv",
+    "DriftingTwinPDEnv",
     "MisspecifiedNewcombEnv",
     "AdversarialNewcombEnv",
+    "GameBatch",
+    "generate_games",
 ]
@@ -12,17 +12,19 @@ class BanditEnv(BaseEnv):
     No policy dependence.
     """
 
-    def __init__(self, probs=(0.7, 0.5), rewards=(1.0, 1.0), seed=None):
+    def __init__(self, probs=(0.7, 0.5), rewards=(1.0, 1.0), seed=None, noise_tape=None):
         """
         Args:
             probs: Success probability for each arm
             rewards: Reward value for each arm on success
             seed: Random seed
+            noise_tape: Optional NoiseTape replacing the RNG (common random numbers)
         """
         self.probs = np.array(probs)
         self.rewards = np.array(rewards)
         self.n_actions = len(probs)
         self.rng = np.random.default_rng(seed)
+        self.noise_tape = noise_tape
 
     def reset(self):
         """Return initial state (stateless bandit)."""
@@ -38,7 +40,8 @@ class BanditEnv(BaseEnv):
             done: Always True (one-shot)
             info: Empty dict
         """
-        if self.rng.random() < self.probs[action]:
+        u = self.rng.random() if self.noise_tape is None else self.noise_tape.random()
+        if u < self.probs[action]:
             reward = float(self.rewards[action])
         else:
             reward = 0.0
@@ -0,0 +1,354 @@
+"""High-throughput bandits with large action sets and drifting arm parameters."""
+
+import numpy as np
+from .base_env import BaseEnv
+
+
+class DriftSchedule:
+    """
+    Precomputed arm parameters over time.
+
+    Parameters are stored at a small number of knots rather than per
+    step, so schedules for 10^6 arms stay cheap:
+    - "step": parameters are piecewise constant, switching at each knot
+      (piecewise-stationary bandits)
+    - "linear": parameters are interpolated linearly between knots
+      (smoothly drifting bandits)
+
+    After the last knot the final parameters are held.
+    """
+
+    def __init__(self, times, values, interpolation="step"):
+        """
+        Args:
+            times: Increasing knot times, starting at 0
+            values: Array of shape (len(times), n_actions, ...) with the
+                arm parameters at each knot
+            interpolation: "step" or "linear"
+        """
+        self.times = np.asarray(times, dtype=np.int64)
+        self.values = np.asarray(values, dtype=float)
+        self.interpolation = interpolation
+
+        if interpolation not in ("step", "linear"):
+            raise ValueError(f"Unknown interpolation: {interpolation}")
+        if self.times.ndim != 1 or len(self.times) == 0 or self.times[0] != 0:
+            raise ValueError("Knot times must be a 1D array starting at 0")
+        if np.any(np.diff(self.times) <= 0):
+            raise ValueError("Knot times must be strictly increasing")
+        if self.values.ndim < 2 or len(self.values) != len(self.times):
+            raise ValueError("values must have shape (len(times), n_actions, ...)")
+
+        self.n_actions = self.values.shape[1]
+
+    @classmethod
+    def stationary(cls, values):
+        """Schedule with fixed parameters."""
+        return cls([0], np.asarray(values, dtype=float)[None])
+
+    @classmethod
+    def piecewise(cls, values, change_points):
+        """
+        Piecewise-stationary schedule.
+
+        Args:
+            values: Sequence of per-arm parameter arrays, one per segment
+            change_points: Times at which segments 1, 2, ... start
+        """
+        return cls(np.concatenate([[0], change_points]), np.stack(values), "step")
+
+    @classmethod
+    def random_changes(cls, n_actions, horizon, n_changes, low=0.0, high=1.0, seed=None):
+        """
+        Piecewise-stationary schedule with uniformly redrawn arm parameters.
+
+        Args:
+            n_actions: Number of arms
+            horizon: Time span over which change points are placed
+            n_changes: Number of change points
+            low, high: Range of the arm parameters
+            seed: Random seed
+        """
+        rng = np.random.default_rng(seed)
+        change_points = np.sort(rng.choice(np.arange(1, horizon), n_changes, replace=False))
+        values = rng.uniform(low, high, size=(n_changes + 1, n_actions))
+        return cls(np.concatenate([[0], change_points]), values, "step")
+
+    @classmethod
+    def random_walk(cls, initial, horizon, n_knots, scale, low=0.0, high=1.0, seed=None):
+        """
+        Smoothly drifting schedule: a clipped Gaussian random walk on
+        evenly spaced knots, interpolated linearly in between.
+
+        Args:
+            initial: Per-arm parameters at time 0
+            horizon: Time of the last knot
+            n_knots: Number of knots (>= 2)
+            scale: Standard deviation of the change between knots
+            low, high: Clipping range of the arm parameters
+            seed: Random seed
+        """
+        rng = np.random.default_rng(seed)
+        initial = np.asarray(initial, dtype=float)
+        steps = rng.normal(0.0, scale, size=(n_knots - 1,) + initial.shape)
+        values = np.empty((n_knots,) + initial.shape)
+        values[0] = initial
+        for k in range(1, n_knots):
+            values[k] = np.clip(values[k - 1] + steps[k - 1], low, high)
+        times = np.linspace(0, horizon, n_knots).astype(np.int64)
+        return cls(times, values, "linear")
+
+    def _segments(self, times):
+        return np.searchsorted(self.times, times, side="right") - 1
+
+    def _weights(self, segments, times):
+        # Interpolation weight towards the next knot (0 after the last knot)
+        nxt = np.minimum(segments + 1, len(self.times) - 1)
+        span = self.times[nxt] - self.times[segments]
+        elapsed = times - self.times[segments]
+        return nxt, np.where(span > 0, elapsed / np.maximum(span, 1), 0.0)
+
+    def at(self, t):
+        """Return the parameters of all arms at time t."""
+        seg = int(self._segments(t))
+        if self.interpolation == "step":
+            return self.values[seg]
+        nxt, w = self._weights(seg, t)
+        return (1 - w) * self.values[seg] + w * self.values[int(nxt)]
+
+    def lookup(self, actions, times):
+        """
+        Gather the parameters of the given arms at the given times.
+
+        Args:
+            actions: Integer array of arms
+            times: Integer array of times (same shape as actions)
+
+        Returns:
+            Array of shape actions.shape + parameter shape
+        """
+        seg = self._segments(times)
+        if self.interpolation == "step":
+            return self.values[seg, actions]
+        nxt, w = self._weights(seg, times)
+        w = w.reshape(w.shape + (1,) * (self.values.ndim - 2))
+        return (1 - w) * self.values[seg, actions] + w * self.values[nxt, actions]
+
+    def value(self, action, t):
+        """Parameters of a single arm at time t."""
+        seg = int(self._segments(t))
+        if self.interpolation == "step" or seg == len(self.times) - 1:
+            return self.values[seg, action]
+        w = (t - self.times[seg]) / (self.times[seg + 1] - self.times[seg])
+        return (1 - w) * self.values[seg, action] + w * self.values[seg + 1, action]
+
+
+def _as_schedule(params):
+    if isinstance(params, DriftSchedule):
+        return params
+    return DriftSchedule.stationary(params)
+
+
+class BlockBanditEnv(BaseEnv):
+    """
+    Base class for bandits whose noise is drawn in vectorized blocks.
+
+    Every pull advances an internal clock `t` that indexes the drift
+    schedule. `step(a)` and `step_batch(actions)` consume the same noise
+    stream, so a batch of n actions gives exactly the rewards of n
+    sequential steps with the same seed.
+    """
+
+    def __init__(self, schedule, seed=None, block_size=4096):
+        """
+        Args:
+            schedule: DriftSchedule of the arm parameters
+            seed: Random seed
+            block_size: Number of noise draws generated per block
+        """
+        self.schedule = schedule
+        self.n_actions = schedule.n_actions
+        self.block_size = block_size
+        self.rng = np.random.default_rng(seed)
+        self.t = 0
+        self._buffer = np.empty(0)
+        self._pos = 0
+
+        # Cached segment of a step schedule for O(1) scalar lookups
+        self._seg = 0
+        self._seg_end = self._segment_end(0)
+
+    def reset(self):
+        """Return initial state (stateless bandit; the clock keeps running)."""
+        return 0
+
+    def _draw(self, n):
+        """Draw n noise values."""
+        raise NotImplementedError
+
+    def _take(self, n):
+        """Consume n noise values, refilling the buffer in whole blocks."""
+        out = self._buffer[self._pos:self._pos + n]
+        self._pos += len(out)
+        if len(out) == n:
+            return out
+        missing = n - len(out)
+        blocks = -(-missing // self.block_size)
+        self._buffer = self._draw(blocks * self.block_size)
+        self._pos = missing
+        return np.concatenate([out, self._buffer[:missing]])
+
+    def _next_noise(self):
+        if self._pos < len(self._buffer):
+            u = self._buffer[self._pos]
+            self._pos += 1
+            return u
+        return self._take(1)[0]
+
+    def _segment_end(self, seg):
+        times = self.schedule.times
+        return times[seg + 1] if seg + 1 < len(times) else np.iinfo(np.int64).max
+
+    def _params(self, action):
+        """Parameters of one arm at the current time."""
+        schedule = self.schedule
+        if schedule.interpolation != "step":
+            return schedule.value(action, self.t)
+        while self.t >= self._seg_end:
+            self._seg += 1
+            self._seg_end = self._segment_end(self._seg)
+        return schedule.values[self._seg, action]
+
+    def step(self, action):
+        """
+        Pull arm and observe reward.
+
+        Returns:
+            state: Always 0 (stateless)
+            reward: Stochastic reward
+            done: Always True (one-shot)
+            info: Empty dict
+        """
+        reward = self._reward(action, self._params(action), self._next_noise())
+        self.t += 1
+        return 0, reward, True, {}
+
+    def step_batch(self, actions):
+        """
+        Pull a sequence of arms at consecutive time steps.
+
+        Args:
+            actions: Integer array of arms
+
+        Returns:
+            Array of rewards, one per action
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        times = self.t + np.arange(len(actions))
+        params = self.schedule.lookup(actions, times)
+        rewards = self._rewards(actions, params, self._take(len(actions)))
+        self.t += len(actions)
+        return rewards
+
+    def expected_rewards(self, t=None):
+        """Mean reward of every arm at time t (default: current time)."""
+        raise NotImplementedError
+
+    def best_action(self, t=None):
+        """Arm with the highest mean reward at time t."""
+        return int(np.argmax(self.expected_rewards(t)))
+
+
+class BernoulliBanditEnv(BlockBanditEnv):
+    """
+    Bandit whose arms pay a fixed amount with (possibly drifting) probability.
+    """
+
+    def __init__(self, probs, rewards=1.0, seed=None, block_size=4096):
+        """
+        Args:
+            probs: Per-arm success probabilities, or a DriftSchedule of them
+            rewards: Reward on success (scalar or per arm)
+            seed: Random seed
+            block_size: Number of uniforms generated per block
+        """
+        super().__init__(_as_schedule(probs), seed, block_size)
+        self.rewards = np.broadcast_to(np.asarray(rewards, dtype=float), (self.n_actions,))
+
+    def _draw(self, n):
+        return self.rng.random(n)
+
+    def _reward(self, action, p, u):
+        return float(self.rewards[action]) if u < p else 0.0
+
+    def _rewards(self, actions, p, u):
+        return np.where(u < p, self.rewards[actions], 0.0)
+
+    def expected_rewards(self, t=None):
+        return self.schedule.at(self.t if t is None else t) * self.rewards
+
+
+class GaussianBanditEnv(BlockBanditEnv):
+    """
+    Bandit whose arms pay Gaussian rewards around (possibly drifting) means.
+    """
+
+    def __init__(self, means, sigma=1.0, seed=None, block_size=4096):
+        """
+        Args:
+            means: Per-arm mean rewards, or a DriftSchedule of them
+            sigma: Reward standard deviation (scalar or per arm)
+            seed: Random seed
+            block_size: Number of normals generated per block
+        """
+        super().__init__(_as_schedule(means), seed, block_size)
+        self.sigma = np.broadcast_to(np.asarray(sigma, dtype=float), (self.n_actions,))
+
+    def _draw(self, n):
+        return self.rng.standard_normal(n)
+
+    def _reward(self, action, mean, z):
+        return float(mean + self.sigma[action] * z)
+
+    def _rewards(self, actions, means, z):
+        return means + self.sigma[actions] * z
+
+    def expected_rewards(self, t=None):
+        return self.schedule.at(self.t if t is None else t)
+
+
+class CategoricalBanditEnv(BlockBanditEnv):
+    """
+    Bandit whose arms pay one of a fixed set of reward values, with
+    per-arm (possibly drifting) outcome probabilities.
+    """
+
+    def __init__(self, probs, values, seed=None, block_size=4096):
+        """
+        Args:
+            probs: Array (n_actions, n_outcomes) of outcome probabilities,
+                or a DriftSchedule of them
+            values: Reward value of each outcome
+            seed: Random seed
+            block_size: Number of uniforms generated per block
+        """
+        super().__init__(_as_schedule(probs), seed, block_size)
+        self.values = np.asarray(values, dtype=float)
+        if self.schedule.values.shape[2:] != self.values.shape:
+            raise ValueError("probs must have one column per outcome value")
+
+    def _draw(self, n):
+        return self.rng.random(n)
+
+    def _reward(self, action, probs, u):
+        k = min(int(np.searchsorted(np.cumsum(probs), u, side="right")), len(self.values) - 1)
+        return float(self.values[k])
+
+    def _rewards(self, actions, probs, u):
+        # Inverse-CDF sampling on each row; clip guards against rounding
+        # leaving the cumulative sum fractionally below 1
+        k = (u[:, None] >= np.cumsum(probs, axis=1)).sum(axis=1)
+        return self.values[np.minimum(k, len(self.values) - 1)]
+
+    def expected_rewards(self, t=None):
+        return self.schedule.at(self.t if t is None else t) @ self.values
@@ -0,0 +1,84 @@
+"""Newcomb and Twin PD environments with scheduled predictor accuracy."""
+
+import numpy as np
+from ibrl.predictors.scheduled_predictor import ScheduledPredictor
+from .newcomb import NewcombEnv
+from .twin_pd import TwinPDEnv
+
+
+class DriftingNewcombEnv(NewcombEnv):
+    """
+    Newcomb's Problem whose predictor accuracy follows a precomputed path
+    (see ibrl.predictors.scheduled_predictor for path generators).
+
+    Behaves exactly like NewcombEnv with a ScheduledPredictor, and adds
+    step_batch for running many consecutive episodes at once.
+    """
+
+    def __init__(self, theta_path, million=1_000_000, small=1_000, seed=None,
+                 noise_tape=None):
+        """
+        Args:
+            theta_path: Per-episode predictor accuracy
+            million: Large box reward
+            small: Small box reward
+            seed: Random seed
+            noise_tape: Optional NoiseTape for the predictor (common random numbers)
+        """
+        predictor = ScheduledPredictor(theta_path, seed=seed, noise_tape=noise_tape)
+        super().__init__(predictor, million=million, small=small, seed=seed)
+
+    def step_batch(self, actions, greedy_actions=None):
+        """
+        Run consecutive episodes with fixed actions.
+
+        Args:
+            actions: Actions taken, one per episode
+            greedy_actions: Greedy actions the predictor sees (defaults to actions)
+
+        Returns:
+            rewards: Array of rewards
+            predictor_correct: Boolean array of predictor correctness
+        """
+        actions = np.asarray(actions)
+        greedy_actions = actions if greedy_actions is None else np.asarray(greedy_actions)
+        correct = self.predictor.correct_batch(len(actions))
+        predicted = np.where(correct, greedy_actions, 1 - greedy_actions)
+        rewards = self.million * (predicted == 0) + self.small * (actions == 1)
+        return rewards.astype(float), correct
+
+
+class DriftingTwinPDEnv(TwinPDEnv):
+    """
+    Twin Prisoner's Dilemma whose twin-prediction accuracy follows a
+    precomputed path.
+    """
+
+    def __init__(self, theta_path, payoffs=None, seed=None, noise_tape=None):
+        """
+        Args:
+            theta_path: Per-episode predictor accuracy
+            payoffs: 2x2 payoff matrix (default: standard PD)
+            seed: Random seed
+            noise_tape: Optional NoiseTape for the predictor (common random numbers)
+        """
+        predictor = ScheduledPredictor(theta_path, seed=seed, noise_tape=noise_tape)
+        super().__init__(predictor, payoffs=payoffs, seed=seed)
+
+    def step_batch(self, actions, greedy_actions=None):
+        """
+        Run consecutive episodes with fixed actions.
+
+        Args:
+            actions: Actions taken, one per episode
+            greedy_actions: Greedy actions the twin sees (defaults to actions)
+
+        Returns:
+            rewards: Array of rewards
+            predictor_correct: Boolean array of predictor correctness
+        """
+        actions = np.asarray(actions)
+        greedy_actions = actions if greedy_actions is None else np.asarray(greedy_actions)
+        correct = self.predictor.correct_batch(len(actions))
+        twin_actions = np.where(correct, greedy_actions, 1 - greedy_actions)
+        return self.payoffs[actions, twin_actions].astype(float), correct
@@ -0,0 +1,194 @@
+"""Seeded generator of random Newcomb-like matrix games with analytic IB-optimal policies."""
+
+import numpy as np
+from ibrl.utils.precision import get_precision
+
+GAME_KINDS = ("newcomb", "twin", "random")
+ERROR_STRUCTURES = ("uniform", "adjacent", "dirichlet")
+
+
+def _normalize(payoffs):
+    """Rescale each game's payoffs to [0, 1]."""
+    low = payoffs.min(axis=(1, 2), keepdims=True)
+    high = payoffs.max(axis=(1, 2), keepdims=True)
+    return (payoffs - low) / np.where(high > low, high - low, 1.0)
+
+
+def _payoffs(kind, n_games, n_actions, rng):
+    """(n_games, n_actions, n_actions) payoffs R[action, prediction] of one kind."""
+    if kind == "newcomb":
+        # A prize that follows the prediction, and a bonus for the action
+        # that ranks prizes in reverse: the causally dominant action is
+        # the one the predictor punishes
+        prize = rng.uniform(0, 1, (n_games, n_actions))
+        prize[np.arange(n_games), rng.integers(0, n_actions, n_games)] = 1.0
+        ranks = np.argsort(np.argsort(prize, axis=1), axis=1)
+        bonus = np.sort(rng.uniform(0, 0.2, (n_games, n_actions)), axis=1)[:, ::-1]
+        bonus = np.take_along_axis(bonus, ranks, axis=1)
+        return prize[:, None, :] + bonus[:, :, None]
+    if kind == "twin":
+        # Public-goods dilemma against a twin: contributing costs c·x[a],
+        # the twin's contribution pays b·x[p] with b > c
+        contribution = rng.permuted(np.tile(np.linspace(0, 1, n_actions), (n_games, 1)), axis=1)
+        benefit = rng.uniform(1.5, 3.0, (n_games, 1, 1))
+        cost = rng.uniform(0.5, 1.0, (n_games, 1, 1))
+        return benefit * contribution[:, None, :] - cost * contribution[:, :, None]
+    if kind == "random":
+        return rng.uniform(0, 1, (n_games, n_actions, n_actions))
+    raise ValueError(f"Unknown game kind: {kind}")
+
+
+def _errors(structure, n_games, n_actions, rng):
+    """(n_games, n_actions, n_actions) P(prediction | greedy action, prediction wrong)."""
+    off_diagonal = 1.0 - np.eye(n_actions)
+    if structure == "uniform":
+        errors = np.broadcast_to(off_diagonal, (n_games, n_actions, n_actions))
+    elif structure == "adjacent":
+        neighbours = np.roll(np.eye(n_actions), 1, axis=1) + np.roll(np.eye(n_actions), -1, axis=1)
+        errors = np.broadcast_to(neighbours * off_diagonal, (n_games, n_actions, n_actions))
+    elif structure == "dirichlet":
+        errors = rng.gamma(1.0, size=(n_games, n_actions, n_actions)) * off_diagonal
+    else:
+        raise ValueError(f"Unknown error structure: {structure}")
+    return errors / errors.sum(axis=2, keepdims=True)
+
+
+class GameBatch:
+    """
+    A batch of n-action policy-dependent matrix games as compact arrays.
+
+    In every game the predictor inspects the agent's greedy action g and
+    predicts it with accuracy θ; otherwise it predicts p ~ errors[g].
+    The agent then receives payoffs[action, prediction]. The agent's
+    credal set over θ is [theta_lower, theta_upper] (which contains the
+    true accuracy theta).
+
+    The value of committing to action a is linear in θ:
+
+        V(a, θ) = θ·payoffs[a, a] + (1 - θ)·Σ_p errors[a, p]·payoffs[a, p]
+
+    so the IB-optimal (worst-case optimal) policy is analytic: the
+    action maximizing min(V(a, θ_lower), V(a, θ_upper)).
+
+    Attributes (arrays with leading dimension n_games):
+        payoffs, errors: (G, n, n)
+        theta, theta_lower, theta_upper: (G,)
+        kinds, error_structures: (G,) indices into GAME_KINDS / ERROR_STRUCTURES
+        ib_action, ib_value: IB-optimal action and its worst-case value
+        true_action, true_value: Optimal action and value under the true θ
+    """
+
+    def __init__(self, payoffs, errors, theta, theta_lower, theta_upper, kinds=None,
+                 error_structures=None):
+        self.payoffs = payoffs
+        self.errors = errors
+        self.theta = theta
+        self.theta_lower = theta_lower
+        self.theta_upper = theta_upper
+        n_games = len(payoffs)
+        self.kinds = np.zeros(n_games, dtype=np.int8) if kinds is None else kinds
+        self.error_structures = (np.zeros(n_games, dtype=np.int8) if error_structures is None
+                                 else error_structures)
+
+        self.ib_action = np.argmax(self.worst_case_values(), axis=1)
+        self.ib_value = self.worst_case_values().max(axis=1)
+        true_values = self.values(self.theta)
+        self.true_action = np.argmax(true_values, axis=1)
+        self.true_value = true_values.max(axis=1)
+
+    def __len__(self):
+        return len(self.payoffs)
+
+    @property
+    def n_actions(self):
+        return self.payoffs.shape[1]
+
+    def outcome_values(self):
+        """
+        Payoff when the prediction is right and expected payoff when it is wrong.
+
+        Returns:
+            (hit, miss): (G, n) arrays
+        """
+        payoffs = self.payoffs.astype(float)
+        hit = np.diagonal(payoffs, axis1=1, axis2=2)
+        miss = (self.errors * payoffs).sum(axis=2)
+        return hit, miss
+
+    def values(self, theta):
+        """(G, n) value V(a, θ) of each action for per-game accuracies θ."""
+        hit, miss = self.outcome_values()
+        theta = np.asarray(theta, dtype=float).reshape(-1, 1)
+        return theta * hit + (1 - theta) * miss
+
+    def worst_case_values(self):
+        """(G, n) worst-case value of each action over the credal set."""
+        return np.minimum(self.values(self.theta_lower), self.values(self.theta_upper))
+
+    def subset(self, index):
+        """Games selected by an index or mask."""
+        return GameBatch(self.payoffs[index], self.errors[index], self.theta[index],
+                         self.theta_lower[index], self.theta_upper[index],
+                         self.kinds[index], self.error_structures[index])
+
+
+def generate_games(n_games, n_actions=3, kinds=GAME_KINDS, error_structures=ERROR_STRUCTURES,
+                   theta_range=(0.5, 0.99), width_range=(0.05, 0.4), seed=None,
+                   precision=None):
+    """
+    Generate random Newcomb-like matrix games.
+
+    Kinds:
+        newcomb: a prize that follows the prediction and a smaller bonus
+            for the action, ranked so the dominant action is punished
+        twin: a public-goods dilemma against a twin who mirrors you
+        random: i.i.d. uniform payoffs
+
+    Error structures (where wrong predictions go):
+        uniform: any other action; adjacent: a neighbouring action;
+        dirichlet: a random distribution per greedy action
+
+    Payoffs are rescaled to [0, 1] per game. The same seed always gives
+    the same batch.
+
+    Args:
+        n_games: Number of games
+        n_actions: Actions per game (at least 2)
+        kinds: Game kinds to draw from (uniformly)
+        error_structures: Error structures to draw from (uniformly)
+        theta_range: Range of true predictor accuracies
+        width_range: Range of credal interval widths
+        seed: Random seed
+        precision: Storage precision of payoffs and errors (None,
+            "double", "compact"; see ibrl.utils.precision)
+
+    Returns:
+        GameBatch
+    """
+    if n_actions < 2:
+        raise ValueError("Games need at least two actions")
+    rng = np.random.default_rng(seed)
+    dtype = get_precision(precision).float_dtype
+
+    kind_index = rng.integers(0, len(kinds), n_games).astype(np.int8)
+    error_index = rng.integers(0, len(error_structures), n_games).astype(np.int8)
+    payoffs = np.empty((n_games, n_actions, n_actions))
+    errors = np.empty((n_games, n_actions, n_actions))
+    for i, kind in enumerate(kinds):
+        games = np.flatnonzero(kind_index == i)
+        payoffs[games] = _payoffs(kind, len(games), n_actions, rng)
+    for i, structure in enumerate(error_structures):
+        games = np.flatnonzero(error_index == i)
+        errors[games] = _errors(structure, len(games), n_actions, rng)
+
+    # Credal interval of the given width around the true accuracy
+    theta = rng.uniform(*theta_range, n_games)
+    width = rng.uniform(*width_range, n_games)
+    theta_lower = np.clip(theta - rng.uniform(0, 1, n_games) * width, 0.0, 1.0)
+    theta_upper = np.clip(theta_lower + width, theta, 1.0)
+
+    # Report indices into the global tables
+    kind_codes = np.array([GAME_KINDS.index(k) for k in kinds], dtype=np.int8)
+    error_codes = np.array([ERROR_STRUCTURES.index(e) for e in error_structures], dtype=np.int8)
+    return GameBatch(_normalize(payoffs).astype(dtype), errors.astype(dtype), theta,
+                     theta_lower, theta_upper, kind_codes[kind_index], error_codes[error_index])
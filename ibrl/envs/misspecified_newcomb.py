@@ -14,7 +14,8 @@ class MisspecifiedNewcombEnv(BaseEnv):
     True accuracy: θ = 0.75 (outside belief set)
     """
 
-    def __init__(self, true_theta, predictor, million=1_000_000, small=1_000, seed=None):
+    def __init__(self, true_theta, predictor, million=1_000_000, small=1_000, seed=None,
+                 noise_tape=None):
         """
         Args:
             true_theta: True predictor accuracy (outside agent's belief)
@@ -22,12 +23,14 @@ class MisspecifiedNewcombEnv(BaseEnv):
             million: Large box reward
             small: Small box reward
             seed: Random seed
+            noise_tape: Optional NoiseTape for the true prediction (common random numbers)
         """
         self.true_theta = true_theta
         self.predictor = predictor
         self.million = million
         self.small = small
         self.rng = np.random.default_rng(seed)
+        self.noise_tape = noise_tape
 
     def reset(self):
         """Return initial state."""
@@ -54,7 +57,8 @@ class MisspecifiedNewcombEnv(BaseEnv):
         # But true accuracy is self.true_theta
         
         # Use TRUE accuracy for actual prediction
-        if self.rng.random() < self.true_theta:
+        u = self.rng.random() if self.noise_tape is None else self.noise_tape.random()
+        if u < self.true_theta:
             predicted_action = greedy_action
         else:
             predicted_action = 1 - greedy_action
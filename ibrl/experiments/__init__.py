@@ -3,7 +3,21 @@ from .run_newcomb import run_newcomb_experiment
 from .run_twin_pd import run_twin_pd_experiment
 from .run_misspecified import run_misspecified_experiment, run_adversarial_experiment
 from .run_wasserstein import run_wasserstein_experiment
+from .run_matrix_games import run_matrix_games_experiment, run_population
+from .tournament import Tournament, run_tournament
 from .compare_all import compare_all
+from .early_stopping import EarlyStopping
+from .adaptive_trials import AdaptiveTrialAllocator, cell_statistics
+from .exact_ib import exact_ib_evaluation
+from .profiling import PhaseProfiler, profile_trial
+from .executors import make_executor, choose_backend
+from .telemetry import TelemetryMonitor
+from .statistics import (
+    bootstrap_ci,
+    paired_permutation_test,
+    effect_sizes,
+    summarize_results,
+)
 
 __all__ = [
     "run_bandit_experiment",
@@ -12,5 +26,22 @@ __all__ = [
     "run_misspecified_experiment",
     "run_adversarial_experiment",
     "run_wasserstein_experiment",
+    "run_matrix_games_experiment",
+    "run_population",
+    "Tournament",
+    "run_tournament",
     "compare_all",
+    "EarlyStopping",
+    "AdaptiveTrialAllocator",
+    "cell_statistics",
+    "exact_ib_evaluation",
+    "PhaseProfiler",
+    "profile_trial",
+    "make_executor",
+    "choose_backend",
+    "TelemetryMonitor",
+    "bootstrap_ci",
+    "paired_permutation_test",
+    "effect_sizes",
+    "summarize_results",
 ]
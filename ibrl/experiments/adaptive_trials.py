@@ -0,0 +1,122 @@
+"""Adaptive trial allocation driven by confidence-interval width."""
+
+import time
+
+import numpy as np
+from scipy import stats
+
+
+def cell_statistics(cell_results, confidence=0.95, tail=100):
+    """
+    Compute mean and confidence half-widths for one (env, agent) cell.
+
+    Uses a Student-t interval over the per-trial means of the last
+    `tail` episodes.
+
+    Args:
+        cell_results: List of trial result dicts ("rewards", "actions")
+        confidence: Confidence level of the interval
+        tail: Number of final episodes averaged per trial
+
+    Returns:
+        Dict with reward mean/half-width and one-box rate mean/half-width
+        (rate entries are None when the cell records no actions)
+    """
+    n = len(cell_results)
+    reward_means = np.array([np.mean(r["rewards"][-tail:]) for r in cell_results])
+    has_actions = all(r["actions"] is not None for r in cell_results)
+
+    if n > 1:
+        t_crit = stats.t.ppf(0.5 + confidence / 2, df=n - 1) / np.sqrt(n)
+    else:
+        t_crit = np.inf
+
+    summary = {
+        "n_trials": n,
+        "reward_mean": float(np.mean(reward_means)),
+        "reward_halfwidth": float(t_crit * np.std(reward_means, ddof=1)) if n > 1 else np.inf,
+        "rate_mean": None,
+        "rate_halfwidth": None,
+    }
+
+    if has_actions:
+        rates = np.array([1 - np.mean(r["actions"][-tail:]) for r in cell_results])
+        summary["rate_mean"] = float(np.mean(rates))
+        summary["rate_halfwidth"] = float(t_crit * np.std(rates, ddof=1)) if n > 1 else np.inf
+
+    return summary
+
+
+class AdaptiveTrialAllocator:
+    """
+    Allocates trials in rounds to cells whose confidence interval is too wide.
+
+    A cell is resolved once its last-100 mean reward interval is narrower
+    than `reward_rel_target` (relative to the mean reward) and its one-box
+    rate interval is narrower than `rate_target` (absolute). Allocation
+    stops when every cell is resolved or capped at `max_trials`, or when
+    the wall-clock budget runs out.
+    """
+
+    def __init__(self, reward_rel_target=0.05, rate_target=0.05, round_size=5,
+                 max_trials=100, time_budget=None, confidence=0.95):
+        """
+        Args:
+            reward_rel_target: Target reward CI half-width relative to the mean
+            rate_target: Target one-box rate CI half-width
+            round_size: Maximum trials added to a cell per round
+            max_trials: Trial cap per cell
+            time_budget: Wall-clock budget in seconds (None for unlimited)
+            confidence: Confidence level of the intervals
+        """
+        if round_size < 1:
+            raise ValueError("round_size must be positive")
+
+        self.reward_rel_target = reward_rel_target
+        self.rate_target = rate_target
+        self.round_size = round_size
+        self.max_trials = max_trials
+        self.time_budget = time_budget
+        self.confidence = confidence
+        self.start_time = time.perf_counter()
+
+    def is_resolved(self, summary):
+        """Return True if a cell summary meets both interval targets."""
+        scale = max(abs(summary["reward_mean"]), 1e-12)
+        if summary["reward_halfwidth"] > self.reward_rel_target * scale:
+            return False
+        if summary["rate_halfwidth"] is not None and summary["rate_halfwidth"] > self.rate_target:
+            return False
+        return True
+
+    def out_of_time(self):
+        """Return True once the wall-clock budget is exhausted."""
+        if self.time_budget is None:
+            return False
+        return time.perf_counter() - self.start_time >= self.time_budget
+
+    def next_round(self, results):
+        """
+        Decide how many extra trials each unresolved cell receives.
+
+        Args:
+            results: Nested dict results[env_type][agent_type] -> list of trials
+
+        Returns:
+            Dict mapping (env_type, agent_type) to number of new trials
+            (empty when allocation is finished)
+        """
+        if self.out_of_time():
+            return {}
+
+        allocation = {}
+        for env_type, cells in results.items():
+            for agent_type, cell_results in cells.items():
+                n = len(cell_results)
+                if n >= self.max_trials:
+                    continue
+                if n > 1 and self.is_resolved(cell_statistics(cell_results, self.confidence)):
+                    continue
+                allocation[(env_type, agent_type)] = min(self.round_size, self.max_trials - n)
+
+        return allocation
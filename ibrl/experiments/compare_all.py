@@ -2,60 +2,171 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from concurrent.futures import ProcessPoolExecutor
 from ibrl.experiments.run_bandit import run_bandit_experiment
 from ibrl.experiments.run_newcomb import run_newcomb_experiment
 from ibrl.experiments.run_twin_pd import run_twin_pd_experiment
 from ibrl.experiments.run_misspecified import run_misspecified_experiment
 from ibrl.experiments.run_wasserstein import run_wasserstein_experiment
+from ibrl.experiments.early_stopping import EarlyStopping
+from ibrl.experiments.adaptive_trials import AdaptiveTrialAllocator, cell_statistics
+from ibrl.experiments.executors import make_executor
+from ibrl.experiments.telemetry import TelemetryMonitor, probe_from_options
+from ibrl.experiments.statistics import summarize_results, format_summary
 from ibrl.utils.plotting import plot_comparison
+from ibrl.utils.results_io import save_results
+from ibrl.utils.noise import make_noise_tapes, effective_variance_reduction
 
 
 def run_single_trial(args):
     """Run single trial (for parallel execution)."""
-    env_type, agent_type, trial, episodes = args
+    env_type, agent_type, trial, episodes, options = args
     
+    stopping_kwargs = options.get("early_stopping")
+    stopper = EarlyStopping(**stopping_kwargs) if stopping_kwargs is not None else None
+    
+    # Common random numbers: every agent in a trial replays the same tapes
+    sampling = options.get("sampling", "iid")
+    if options.get("crn") or sampling != "iid":
+        noise = make_noise_tapes(trial, episodes, sampling, options.get("group_size", 2))
+    else:
+        noise = None
+    
+    probe = probe_from_options(options, episodes)
+    rewards, credal_widths, actions = _run_trial(
+        env_type, agent_type, trial, episodes, stopper, noise, options.get("precision"),
+        telemetry=probe
+    )
+    if probe is not None:
+        probe.finish()
+    stop_episode = stopper.stop_episode if stopper is not None else None
+    return rewards, credal_widths, actions, stop_episode
+
+
+def _run_trial(env_type, agent_type, trial, episodes, stopper, noise, precision,
+               profiler=None, telemetry=None):
+    """Dispatch a single trial to its experiment runner."""
     if env_type == "bandit":
-        rewards, agent = run_bandit_experiment(agent_type, episodes, seed=trial)
+        rewards, agent = run_bandit_experiment(
+            agent_type, episodes, seed=trial, early_stopping=stopper, noise=noise,
+            precision=precision, profiler=profiler, telemetry=telemetry
+        )
         return rewards, None, None
     elif env_type == "newcomb":
         rewards, agent, credal_widths, actions = run_newcomb_experiment(
-            agent_type, episodes, theta=0.95, seed=trial
+            agent_type, episodes, theta=0.95, seed=trial,
+            early_stopping=stopper, noise=noise, precision=precision,
+            profiler=profiler, telemetry=telemetry
         )
         return rewards, credal_widths, actions
     elif env_type == "twin_pd":
         rewards, agent, credal_widths, actions = run_twin_pd_experiment(
-            agent_type, episodes, theta=0.95, seed=trial
+            agent_type, episodes, theta=0.95, seed=trial,
+            early_stopping=stopper, noise=noise, precision=precision,
+            profiler=profiler, telemetry=telemetry
         )
         return rewards, credal_widths, actions
     elif env_type == "misspecified":
         rewards, agent, credal_widths, actions = run_misspecified_experiment(
-            agent_type, episodes, true_theta=0.75, model_theta=0.95, seed=trial
+            agent_type, episodes, true_theta=0.75, model_theta=0.95, seed=trial,
+            early_stopping=stopper, noise=noise, precision=precision,
+            profiler=profiler, telemetry=telemetry
         )
         return rewards, credal_widths, actions
     elif env_type == "wasserstein":
         # For Wasserstein, we only run IB agent with different belief types
         if agent_type == "ib":
             rewards, agent, widths, actions = run_wasserstein_experiment(
-                belief_type="wasserstein", episodes=episodes, seed=trial
+                belief_type="wasserstein", episodes=episodes, seed=trial,
+                early_stopping=stopper, noise=noise, precision=precision,
+                profiler=profiler, telemetry=telemetry
             )
             return rewards, widths, actions
         else:
             # For classical/bayesian, use credal (same as newcomb)
             rewards, agent, credal_widths, actions = run_newcomb_experiment(
-                agent_type, episodes, theta=0.95, seed=trial
+                agent_type, episodes, theta=0.95, seed=trial,
+                early_stopping=stopper, noise=noise, precision=precision,
+                profiler=profiler, telemetry=telemetry
             )
             return rewards, credal_widths, actions
 
 
-def compare_all(n_trials=10, episodes=1000, parallel=True):
+def _record_outputs(results, tasks, outputs):
+    """Append trial outputs to the results dict in task order."""
+    for task, output in zip(tasks, outputs):
+        env_type, agent_type = task[0], task[1]
+        rewards, credal_widths, actions, stop_episode = output
+        results[env_type][agent_type].append({
+            "rewards": rewards,
+            "credal_widths": credal_widths,
+            "actions": actions,
+            "stop_episode": stop_episode
+        })
+
+
+def _print_paired_differences(results, env_type, baseline="ib"):
+    """Print paired last-100 reward differences against the baseline agent."""
+    base = [np.mean(r["rewards"][-100:]) for r in results[env_type][baseline]]
+    for agent_type, cell in results[env_type].items():
+        if agent_type == baseline:
+            continue
+        other = [np.mean(r["rewards"][-100:]) for r in cell]
+        n = min(len(base), len(other))
+        diffs = np.array(base[:n]) - np.array(other[:n])
+        stderr = np.std(diffs, ddof=1) / np.sqrt(n) if n > 1 else np.nan
+        print(f"  {'':12s}  paired {baseline.upper()} - {agent_type.capitalize()}: "
+              f"{np.mean(diffs):,.3f} ± {stderr:,.3f} (s.e., n={n})")
+
+
+def compare_all(n_trials=10, episodes=1000, parallel=True, early_stopping=None,
+                adaptive=None, common_random_numbers=False, sampling="iid",
+                sampling_group_size=None, precision=None, max_workers=None,
+                save_path="ibrl_comparison.png", transport="shared", backend="auto",
+                start_method=None, telemetry=None, n_resamples=None, results_path=None):
     """
     Run comprehensive comparison across all environments.
     
     Args:
-        n_trials: Number of independent trials
+        n_trials: Number of independent trials (initial round if adaptive)
         episodes: Episodes per trial
-        parallel: Use parallel processing
+        parallel: Use parallel processing (False forces the serial backend)
+        early_stopping: Optional dict of EarlyStopping keyword arguments.
+            Stopped trials are always extrapolated to the full episode
+            count so results stay aligned for plotting.
+        adaptive: Optional dict of AdaptiveTrialAllocator keyword arguments.
+            After the initial n_trials, further rounds of trials are run
+            only for cells whose confidence interval is still too wide.
+        common_random_numbers: Feed every agent in a trial the same
+            pre-generated predictor/environment noise tapes, and report
+            paired reward differences between agents.
+        sampling: Environment-noise design across trials: "iid",
+            "antithetic" or "lhs" (see
+            ibrl.utils.noise.sample_uniforms). Non-iid designs use noise
+            tapes, so they imply common random numbers.
+        sampling_group_size: Trials per design group (default 2 for
+            antithetic, which only supports pairs; 5 otherwise)
+        precision: Storage precision for agent state and returned
+            trajectories ("double" or "compact"; see ibrl.utils.precision)
+        max_workers: Worker threads/processes when parallel (None uses all cores)
+        save_path: Comparison plot path (None skips plotting)
+        transport: How parallel workers return trajectories: "shared"
+            (written into shared memory, only completion notices are
+            pickled) or "pickle" (arrays pickled through the pool pipe)
+        backend: Executor backend when parallel: "auto" (in-process
+            "batch" or "process"), "process", "thread", "batch" (serial,
+            in-process) or "serial" (see ibrl.experiments.executors)
+        start_method: Process start method for the process backend
+            ("fork", "spawn", "forkserver"; None for the platform default)
+        telemetry: Dict of TelemetryMonitor arguments to show live
+            progress, log a time series and raise throughput alerts
+            (e.g. {"log_path": "telemetry.jsonl", "drop_ratio": 0.5});
+            None disables it
+        n_resamples: Bootstrap resamples / permutations for the confidence
+            intervals and paired tests in the statistics section, e.g.
+            10000; None (default) skips the section and its cost (see
+            ibrl.experiments.statistics)
+        results_path: Optional .npz path to store the results, so figures
+            can be rebuilt without re-simulation (python -m ibrl.utils.plotting)
     
     Returns:
         results: Dictionary of results
@@ -70,32 +181,64 @@ def compare_all(n_trials=10, episodes=1000, parallel=True):
     
     results = {env: {agent: [] for agent in agent_types} for env in env_types}
     
+    if early_stopping is not None:
+        early_stopping = dict(early_stopping, extrapolate=True)
+    
+    if transport not in ("shared", "pickle"):
+        raise ValueError(f"Unknown transport: {transport}")
+    
+    allocator = AdaptiveTrialAllocator(**adaptive) if adaptive is not None else None
+    if sampling == "antithetic" and sampling_group_size not in (None, 2):
+        raise ValueError("antithetic sampling uses pairs (sampling_group_size=2)")
+    if sampling_group_size is None:
+        sampling_group_size = 2 if sampling == "antithetic" else 5
+    options = {
+        "early_stopping": early_stopping,
+        "crn": common_random_numbers,
+        "sampling": sampling,
+        "group_size": sampling_group_size,
+        "precision": precision,
+    }
+    
     # Prepare tasks
     tasks = []
     for env_type in env_types:
         for agent_type in agent_types:
             for trial in range(n_trials):
-                tasks.append((env_type, agent_type, trial, episodes))
+                tasks.append((env_type, agent_type, trial, episodes, options))
     
-    # Execute
-    if parallel:
-        with ProcessPoolExecutor() as executor:
-            outputs = list(executor.map(run_single_trial, tasks))
-    else:
-        outputs = [run_single_trial(task) for task in tasks]
+    # Execute (in rounds when allocating adaptively)
+    monitor = TelemetryMonitor(**telemetry) if telemetry is not None else None
+    executor = make_executor(backend if parallel else "serial", max_workers, start_method,
+                             n_tasks=len(tasks), episodes=episodes)
+    try:
+        rounds = 0
+        while tasks:
+            if monitor is not None:
+                with monitor.batch(tasks) as tagged:
+                    outputs = executor.run_trials(tagged, episodes, precision, transport)
+            else:
+                outputs = executor.run_trials(tasks, episodes, precision, transport)
+            _record_outputs(results, tasks, outputs)
+            rounds += 1
+            
+            if allocator is None:
+                break
+            
+            tasks = []
+            for (env_type, agent_type), n_new in allocator.next_round(results).items():
+                start = len(results[env_type][agent_type])
+                for trial in range(start, start + n_new):
+                    tasks.append((env_type, agent_type, trial, episodes, options))
+    finally:
+        executor.shutdown()
+        if monitor is not None:
+            monitor.close()
     
-    # Organize results
-    idx = 0
-    for env_type in env_types:
-        for agent_type in agent_types:
-            for trial in range(n_trials):
-                rewards, credal_widths, actions = outputs[idx]
-                results[env_type][agent_type].append({
-                    "rewards": rewards,
-                    "credal_widths": credal_widths,
-                    "actions": actions
-                })
-                idx += 1
+    if allocator is not None:
+        total = sum(len(cell) for cells in results.values() for cell in cells.values())
+        print(f"Adaptive allocation: {rounds} rounds, {total} trials "
+              f"(fixed allocation would use {allocator.max_trials * len(env_types) * len(agent_types)})")
     
     # Print summary
     print("\n" + "=" * 70)
@@ -119,6 +262,35 @@ def compare_all(n_trials=10, episodes=1000, parallel=True):
                 one_box_rate = 1 - np.mean([np.mean(a) for a in all_actions])
                 print(f"  {agent_type.capitalize():12s}: ${mean_reward:>10,.0f} ± ${std_reward:>8,.0f}  "
                       f"[one-box: {one_box_rate:.1%}]")
+            
+            if allocator is not None:
+                summary = cell_statistics(results[env_type][agent_type], allocator.confidence)
+                print(f"  {'':12s}  {summary['n_trials']} trials, "
+                      f"reward CI ±{summary['reward_halfwidth']:.4g}")
+            
+            if early_stopping is not None:
+                stops = [r["stop_episode"] for r in results[env_type][agent_type]]
+                simulated = [episodes if s is None else s + 1 for s in stops]
+                n_stopped = sum(s is not None for s in stops)
+                print(f"  {'':12s}  early stop: {n_stopped}/{len(stops)} trials, "
+                      f"{np.mean(simulated) / episodes:.1%} of episodes simulated")
+        
+        if sampling != "iid":
+            for agent_type in agent_types:
+                values = [np.mean(r["rewards"][-100:]) for r in results[env_type][agent_type]]
+                factor = effective_variance_reduction(values, sampling_group_size)
+                print(f"  {'':12s}  {agent_type.capitalize()} {sampling} variance reduction: "
+                      f"×{factor:.2f}")
+        
+        if common_random_numbers:
+            _print_paired_differences(results, env_type)
+    
+    if n_resamples is not None:
+        print("\n" + "=" * 70)
+        print("STATISTICS (last-100 reward, bootstrap BCa CIs, paired permutation tests)")
+        print("=" * 70)
+        for line in format_summary(summarize_results(results, n_resamples=n_resamples)):
+            print(line)
     
     print("\n" + "=" * 70)
     print("THEORETICAL IMPLICATIONS")
@@ -153,15 +325,21 @@ def compare_all(n_trials=10, episodes=1000, parallel=True):
    → Provable convergence guarantees
 """)
     
+    if results_path is not None:
+        save_results(results, results_path)
+        print(f"✓ Results saved to {results_path}")
+    
     # Generate plots
-    plot_comparison(results, save_path="ibrl_comparison.png")
+    if save_path is not None:
+        plot_comparison(results, save_path=save_path)
     
     return results
 
 
 def main():
     """Run full comparison suite."""
-    results = compare_all(n_trials=10, episodes=1000, parallel=True)
+    results = compare_all(n_trials=10, episodes=1000, parallel=True, n_resamples=10000,
+                          results_path="ibrl_results.npz")
     print("\n✓ Comparison complete. Results saved to ibrl_comparison.png")
     return results
 
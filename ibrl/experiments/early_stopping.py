@@ -0,0 +1,142 @@
+"""Convergence-based early stopping for experiment trials."""
+
+from collections import deque
+
+import numpy as np
+
+
+class EarlyStopping:
+    """
+    Convergence monitor that ends a trial once it has settled.
+
+    A trial stops when every enabled criterion holds at the same time:
+    - Policy stability: greedy action unchanged for `patience` episodes
+    - Credal width: interval width below `width_threshold` (IB agents only)
+    - Reward plateau: moving average over the last `window` episodes within
+      `reward_tol` (relative) of the moving average over the window before
+
+    The episode at which the trial stopped is recorded in `stop_episode`.
+    """
+
+    def __init__(self, patience=100, width_threshold=0.1, window=100,
+                 reward_tol=0.05, min_episodes=None, extrapolate=True):
+        """
+        Args:
+            patience: Episodes the greedy action must stay unchanged
+            width_threshold: Maximum credal width (None disables criterion)
+            window: Moving-average window for the reward criterion
+            reward_tol: Relative tolerance between consecutive windows
+                (None disables criterion)
+            min_episodes: Never stop before this many episodes
+                (default: 2 * window)
+            extrapolate: Fill the skipped tail with extrapolated values
+        """
+        if patience < 1 or window < 1:
+            raise ValueError("patience and window must be positive")
+
+        self.patience = patience
+        self.width_threshold = width_threshold
+        self.window = window
+        self.reward_tol = reward_tol
+        self.min_episodes = 2 * window if min_episodes is None else min_episodes
+        self.extrapolate = extrapolate
+        self.reset()
+
+    def reset(self):
+        """Clear monitor state before a new trial."""
+        self.stop_episode = None
+        self._last_greedy = None
+        self._stable = 0
+        self._recent = deque(maxlen=2 * self.window)
+        self._recent_sum = 0.0
+        self._older_sum = 0.0
+
+    def step(self, episode, greedy_action, reward, width=None):
+        """
+        Record one episode and check the stopping criteria.
+
+        Args:
+            episode: Index of the episode just completed
+            greedy_action: Agent's greedy action during the episode
+            reward: Observed reward
+            width: Credal width after the update (None if not applicable)
+
+        Returns:
+            True if the trial should stop after this episode
+        """
+        if greedy_action == self._last_greedy:
+            self._stable += 1
+        else:
+            self._last_greedy = greedy_action
+            self._stable = 1
+
+        # Keep running sums of the two most recent reward windows
+        if len(self._recent) == self._recent.maxlen:
+            self._older_sum -= self._recent[0]
+        if len(self._recent) >= self.window:
+            self._older_sum += self._recent[-self.window]
+            self._recent_sum -= self._recent[-self.window]
+        self._recent.append(reward)
+        self._recent_sum += reward
+
+        if episode + 1 < self.min_episodes:
+            return False
+        if self._stable < self.patience:
+            return False
+        if (self.width_threshold is not None and width is not None
+                and width > self.width_threshold):
+            return False
+        if self.reward_tol is not None:
+            if len(self._recent) < self._recent.maxlen:
+                return False
+            recent = self._recent_sum / self.window
+            older = self._older_sum / self.window
+            if abs(recent - older) > self.reward_tol * max(abs(older), 1e-12):
+                return False
+
+        self.stop_episode = episode
+        return True
+
+    def extrapolate_tail(self, episodes, rewards, credal_widths, actions):
+        """
+        Extend truncated trajectories to the full episode count.
+
+        Rewards are filled with the final moving average, actions with the
+        majority action of the final window, and credal widths decay as
+        1/sqrt(n) from their value at the stopping episode (the Hoeffding rate).
+
+        Args:
+            episodes: Total number of episodes requested
+            rewards: Rewards observed up to the stopping episode
+            credal_widths: Credal widths observed (may be empty)
+            actions: Actions taken up to the stopping episode
+
+        Returns:
+            rewards, credal_widths, actions padded to `episodes`
+        """
+        n = len(rewards)
+        tail = episodes - n
+        if tail <= 0 or n == 0:
+            return rewards, credal_widths, actions
+
+        tail_reward = float(np.mean(rewards[-self.window:]))
+        rewards = np.concatenate([rewards, np.full(tail, tail_reward, dtype=rewards.dtype)])
+
+        if len(actions) > 0:
+            tail_action = int(np.bincount(actions[-self.window:]).argmax())
+            actions = np.concatenate(
+                [actions, np.full(tail, tail_action, dtype=actions.dtype)]
+            )
+
+        if len(credal_widths) > 0:
+            t = np.arange(n + 1, episodes + 1)
+            tail_widths = (credal_widths[-1] * np.sqrt(n / t)).astype(credal_widths.dtype)
+            credal_widths = np.concatenate([credal_widths, tail_widths])
+
+        return rewards, credal_widths, actions
+
+    def simulated_fraction(self, episodes):
+        """Return the fraction of episodes actually simulated."""
+        if self.stop_episode is None:
+            return 1.0
+        return (self.stop_episode + 1) / episodes
@@ -0,0 +1,145 @@
+"""Shared agent-environment interaction loop for experiment runners."""
+
+import contextlib
+import time
+
+import numpy as np
+from ibrl.utils.precision import get_precision
+
+
+def run_episodes(env, agent, agent_type, episodes, policy_dependent=True,
+                 predictor_correct=None, early_stopping=None, precision=None,
+                 profiler=None, telemetry=None):
+    """
+    Run the agent in the environment for a number of one-shot episodes.
+
+    Args:
+        env: Environment instance
+        agent: Agent instance
+        agent_type: "classical", "bayesian", or "ib"
+        episodes: Number of episodes
+        policy_dependent: Pass the agent's greedy action to env.step
+            (False for classical environments such as the bandit)
+        predictor_correct: Fixed predictor-correctness signal for IB updates
+            (None uses info["predictor_correct"] from the environment)
+        early_stopping: Optional EarlyStopping monitor
+        precision: Storage precision for the returned trajectories
+            (None, "double", "compact"; see ibrl.utils.precision)
+        profiler: Optional PhaseProfiler; sampled episodes are timed per
+            phase (see ibrl.experiments.profiling)
+        telemetry: Optional TelemetryProbe; the episode count is published
+            every `telemetry.interval` episodes (see ibrl.experiments.telemetry)
+
+    Returns:
+        rewards: Array of rewards per episode
+        credal_widths: Interval widths over time (empty unless IB agent)
+        actions_taken: Actions taken per episode
+    """
+    track_width = agent_type == "ib"
+    if early_stopping is not None:
+        early_stopping.reset()
+
+    rewards = []
+    credal_widths = []
+    actions_taken = []
+    next_publish = telemetry.interval if telemetry is not None else -1
+
+    with _instrumented(profiler, env):
+        for ep in range(episodes):
+            state = env.reset()
+            if profiler is not None and profiler.sample(ep):
+                greedy_action, action, reward, width = _timed_episode(
+                    profiler, env, agent, state, track_width, policy_dependent,
+                    predictor_correct
+                )
+                if track_width:
+                    credal_widths.append(width)
+            else:
+                greedy_action = agent.greedy_action()
+                action = agent.select_action(state)
+                if policy_dependent:
+                    next_state, reward, done, info = env.step(action, greedy_action)
+                else:
+                    next_state, reward, done, info = env.step(action)
+
+                width = None
+                if track_width:
+                    correct = predictor_correct
+                    if correct is None:
+                        correct = info["predictor_correct"]
+                    agent.update(state, action, reward, correct)
+                    width = agent.credal.width()
+                    credal_widths.append(width)
+                else:
+                    agent.update(state, action, reward, next_state, done)
+
+            rewards.append(reward)
+            actions_taken.append(action)
+
+            if ep == next_publish:
+                telemetry.publish(ep + 1)
+                next_publish += telemetry.interval
+
+            if (early_stopping is not None
+                    and early_stopping.step(ep, greedy_action, reward, width)):
+                break
+
+    if telemetry is not None:
+        telemetry.publish(len(rewards))
+
+    policy = get_precision(precision)
+    rewards = policy.floats(rewards)
+    credal_widths = policy.floats(credal_widths)
+    actions_taken = policy.actions(actions_taken)
+
+    if early_stopping is not None and early_stopping.extrapolate:
+        rewards, credal_widths, actions_taken = early_stopping.extrapolate_tail(
+            episodes, rewards, credal_widths, actions_taken
+        )
+
+    return rewards, credal_widths, actions_taken
+
+
+def _instrumented(profiler, env):
+    """Time the predictor inside env.step when profiling is enabled."""
+    predictor = getattr(env, "predictor", None)
+    if profiler is None or predictor is None:
+        return contextlib.nullcontext()
+    return profiler.instrument(predictor, "predict", "predictor_predict")
+
+
+def _timed_episode(profiler, env, agent, state, track_width, policy_dependent,
+                   predictor_correct):
+    """Run one episode of the loop above, timing each phase."""
+    clock = time.perf_counter_ns
+
+    t0 = clock()
+    greedy_action = agent.greedy_action()
+    t1 = clock()
+    action = agent.select_action(state)
+    t2 = clock()
+    if policy_dependent:
+        next_state, reward, done, info = env.step(action, greedy_action)
+    else:
+        next_state, reward, done, info = env.step(action)
+    t3 = clock()
+
+    width = None
+    if track_width:
+        correct = predictor_correct
+        if correct is None:
+            correct = info["predictor_correct"]
+        agent.update(state, action, reward, correct)
+        t4 = clock()
+        width = agent.credal.width()
+        t5 = clock()
+        profiler.record("credal_width", t5 - t4)
+    else:
+        agent.update(state, action, reward, next_state, done)
+        t4 = clock()
+
+    profiler.record("greedy_action", t1 - t0)
+    profiler.record("select_action", t2 - t1)
+    profiler.record("env_step", t3 - t2)
+    profiler.record("update", t4 - t3)
+    return greedy_action, action, reward, width
@@ -0,0 +1,158 @@
+"""Exact expected-reward evaluation for IB agents via belief-state dynamic programming."""
+
+import math
+
+import numpy as np
+from ibrl.belief import CredalInterval
+from ibrl.belief.bounds import get_table
+from ibrl.predictors import ScheduledPredictor
+from ibrl.envs import (
+    NewcombEnv,
+    TwinPDEnv,
+    MisspecifiedNewcombEnv,
+    AdversarialNewcombEnv,
+)
+
+
+def _environment_model(env):
+    """
+    Reduce an environment to its Bernoulli outcome model.
+
+    Returns:
+        reward_table: 2x2 array, reward_table[action, predictor_correct]
+        theta_reward: Probability the reward-relevant prediction is correct
+        theta_update: Probability the agent observes predictor_correct=True
+    """
+    if isinstance(getattr(env, "predictor", None), ScheduledPredictor):
+        raise ValueError("Exact evaluation needs a fixed predictor accuracy")
+
+    if isinstance(env, TwinPDEnv):
+        payoffs = np.asarray(env.payoffs, dtype=float)
+        reward_table = np.array([
+            [payoffs[0, 1], payoffs[0, 0]],  # Cooperate: twin defects / cooperates
+            [payoffs[1, 0], payoffs[1, 1]],  # Defect: twin cooperates / defects
+        ])
+        theta = env.predictor.theta
+        return reward_table, theta, theta
+
+    if isinstance(env, (NewcombEnv, MisspecifiedNewcombEnv, AdversarialNewcombEnv)):
+        million, small = float(env.million), float(env.small)
+        reward_table = np.array([
+            [0.0, million],            # One-box: box B empty / full
+            [small + million, small],  # Two-box: box B full / empty
+        ])
+        if isinstance(env, MisspecifiedNewcombEnv):
+            return reward_table, env.true_theta, env.predictor.theta
+        if isinstance(env, AdversarialNewcombEnv):
+            return reward_table, 0.0, 0.0
+        theta = env.predictor.theta
+        return reward_table, theta, theta
+
+    raise ValueError(f"Unsupported environment for exact evaluation: {type(env).__name__}")
+
+
+def _interval_lattice(credal, successes, trials):
+    """
+    Credal interval for every success count at a fixed number of trials.
+
+    Mirrors CredalInterval.update exactly (same float operations), so the
+    greedy action computed here matches the agent's.
+    """
+    if trials == 0:
+        lower = np.full(successes.shape, float(credal.lower))
+        upper = np.full(successes.shape, float(credal.upper))
+        return lower, upper
+
+    if credal.bound == "hoeffding":
+        p_hat = successes / trials
+        epsilon = math.sqrt(math.log(2 / credal.delta) / (2 * trials))
+        lower, upper = p_hat - epsilon, p_hat + epsilon
+    else:
+        lower, upper = get_table(credal.bound, credal.delta).row(successes, trials)
+        lower, upper = np.array(lower), np.array(upper)
+    lower = np.maximum(np.maximum(0.0, lower), credal.initial_lower)
+    upper = np.minimum(np.minimum(1.0, upper), credal.initial_upper)
+    return lower, upper
+
+
+def _greedy_actions(agent, lower, upper):
+    """Vectorized IBQAgent.greedy_action over arrays of interval endpoints."""
+    million, small = agent.million, agent.small
+    one_box = np.minimum(lower * million, upper * million)
+    two_box = np.minimum(small + (1 - lower) * million, small + (1 - upper) * million)
+    # np.argmax breaks ties toward action 0
+    return (two_box > one_box).astype(int)
+
+
+def exact_ib_evaluation(agent, env, episodes):
+    """
+    Compute exact per-episode statistics of an IB agent without Monte Carlo.
+
+    IBQAgent acts deterministically given its CredalInterval counts
+    (successes, trials), and predictor correctness is Bernoulli(theta), so
+    the distribution over success counts can be propagated forward exactly.
+    Each episode costs O(t) over the belief lattice, O(T²) overall.
+
+    Evaluation starts from the agent's current credal state; the agent
+    itself is not modified.
+
+    Args:
+        agent: IBQAgent with a CredalInterval belief (no recovery policy)
+        env: NewcombEnv, TransparentNewcombEnv, TwinPDEnv,
+            MisspecifiedNewcombEnv or AdversarialNewcombEnv
+        episodes: Number of episodes
+
+    Returns:
+        Dict of arrays (length episodes): reward_mean, reward_var,
+        one_box_rate, one_box_var, width_mean, width_var
+    """
+    if type(agent.credal) is not CredalInterval:
+        raise ValueError("Exact evaluation needs a CredalInterval belief "
+                         "(windowed and discounted intervals are not Markov in the counts)")
+    if agent.credal.recovery is not None:
+        raise ValueError("Exact evaluation does not model misspecification recovery "
+                         f"(recovery={agent.credal.recovery!r}); use recovery=None")
+    reward_table, theta_reward, theta_update = _environment_model(env)
+    credal = agent.credal
+    s0, n0 = credal.successes, credal.trials
+
+    stats = {key: np.zeros(episodes) for key in
+             ("reward_mean", "reward_var", "one_box_rate", "one_box_var",
+              "width_mean", "width_var")}
+
+    # probs[k] = P(successes == s0 + k) after t episodes
+    probs = np.ones(1)
+
+    for t in range(episodes):
+        successes = s0 + np.arange(t + 1)
+        lower, upper = _interval_lattice(credal, successes, n0 + t)
+        actions = _greedy_actions(agent, lower, upper)
+
+        # Reward distribution given each belief state
+        r_correct = reward_table[actions, 1]
+        r_wrong = reward_table[actions, 0]
+        r_mean = theta_reward * r_correct + (1 - theta_reward) * r_wrong
+        r_sq = theta_reward * r_correct ** 2 + (1 - theta_reward) * r_wrong ** 2
+
+        reward_mean = probs @ r_mean
+        stats["reward_mean"][t] = reward_mean
+        stats["reward_var"][t] = max(probs @ r_sq - reward_mean ** 2, 0.0)
+
+        one_box = probs @ (actions == 0)
+        stats["one_box_rate"][t] = one_box
+        stats["one_box_var"][t] = one_box * (1 - one_box)
+
+        # Belief transition: success count grows with probability theta_update
+        next_probs = np.zeros(t + 2)
+        next_probs[:-1] += (1 - theta_update) * probs
+        next_probs[1:] += theta_update * probs
+        probs = next_probs
+
+        # Widths are recorded after the update, as in the runners
+        lower, upper = _interval_lattice(credal, s0 + np.arange(t + 2), n0 + t + 1)
+        widths = upper - lower
+        width_mean = probs @ widths
+        stats["width_mean"][t] = width_mean
+        stats["width_var"][t] = max(probs @ widths ** 2 - width_mean ** 2, 0.0)
+
+    return stats
@@ -0,0 +1,205 @@
+"""Executor backends for running batches of compare_all trials."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from ibrl.experiments.shared_results import METRICS, run_tasks_shared
+from ibrl.utils.precision import get_precision
+
+BACKENDS = ("serial", "thread", "process", "batch", "auto")
+
+# Episodes per worker below which auto mode stays in-process: a forked
+# pool costs tens of milliseconds to start, roughly 2-5k episodes of
+# work, and per-task pickling adds to that
+AUTO_PROCESS_MIN_EPISODES = 5_000
+
+
+def _cpu_count():
+    return os.cpu_count() or 1
+
+
+def choose_backend(n_tasks, episodes, max_workers=None):
+    """
+    Pick a backend for a batch of trials.
+
+    Stays in-process ("batch", serial) when only one worker would be
+    used or each worker's share of the batch is too small to amortize
+    pool start-up; otherwise uses processes. Threads are never chosen:
+    the per-episode loops of the agents hold the GIL.
+
+    Args:
+        n_tasks: Number of trials in the batch
+        episodes: Episodes per trial
+        max_workers: Worker limit (None uses all cores)
+
+    Returns:
+        Backend name: "batch" or "process"
+    """
+    workers = min(max_workers or _cpu_count(), n_tasks)
+    if workers <= 1 or n_tasks * episodes / workers < AUTO_PROCESS_MIN_EPISODES:
+        return "batch"
+    return "process"
+
+
+class SerialExecutor:
+    """Run tasks one after another in the calling process."""
+
+    name = "serial"
+
+    def map(self, fn, tasks):
+        """Apply fn to every task, returning a list in task order."""
+        return [fn(task) for task in tasks]
+
+    def run_trials(self, tasks, episodes, precision=None, transport=None):
+        """
+        Run compare_all trials.
+
+        Args:
+            tasks: run_single_trial task tuples
+            episodes: Episodes per trial
+            precision: Storage precision of the returned arrays
+            transport: Result transport (only used by the process backend)
+
+        Returns:
+            List of run_single_trial outputs in task order
+        """
+        from ibrl.experiments.compare_all import run_single_trial
+        return self.map(run_single_trial, tasks)
+
+    def shutdown(self):
+        """Release workers (no-op for in-process backends)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
+
+
+class BatchExecutor(SerialExecutor):
+    """
+    Run tasks serially in the calling process, one cell at a time,
+    copying the trajectories of a batch into one contiguous (tasks,
+    episodes) array per metric.
+
+    Trials are not vectorized: this is the serial loop, minus fork,
+    import and pickling costs, with a cell's trials run back to back so
+    its caches (bound tables, action indices) stay warm. Outputs are
+    views into the packed arrays.
+    """
+
+    name = "batch"
+
+    def run_trials(self, tasks, episodes, precision=None, transport=None):
+        from ibrl.experiments.compare_all import run_single_trial
+
+        order = sorted(range(len(tasks)), key=lambda i: (tasks[i][0], tasks[i][1]))
+        policy = get_precision(precision)
+        dtypes = {
+            "rewards": policy.float_dtype,
+            "credal_widths": policy.float_dtype,
+            "actions": policy.action_dtype,
+        }
+        packed = {metric: np.empty((len(tasks), episodes), dtype=dtypes[metric])
+                  for metric in METRICS}
+
+        outputs = [None] * len(tasks)
+        for index in order:
+            output = run_single_trial(tasks[index])
+            values = []
+            for metric, trajectory in zip(METRICS, output[:3]):
+                if trajectory is None:
+                    values.append(None)
+                    continue
+                row = packed[metric][index, :len(trajectory)]
+                row[:] = trajectory
+                values.append(row)
+            outputs[index] = (*values, output[3])
+        return outputs
+
+
+class ThreadExecutor(SerialExecutor):
+    """Run tasks on a thread pool (pays off for GIL-releasing task functions)."""
+
+    name = "thread"
+
+    def __init__(self, max_workers=None):
+        """
+        Args:
+            max_workers: Number of threads (None uses all cores)
+        """
+        self.max_workers = max_workers or _cpu_count()
+        self._pool = ThreadPoolExecutor(self.max_workers)
+
+    def map(self, fn, tasks):
+        return list(self._pool.map(fn, tasks))
+
+    def shutdown(self):
+        self._pool.shutdown()
+
+
+class ProcessExecutor(SerialExecutor):
+    """Run tasks on a process pool with a chosen start method."""
+
+    name = "process"
+
+    def __init__(self, max_workers=None, start_method=None):
+        """
+        Args:
+            max_workers: Number of worker processes (None uses all cores)
+            start_method: "fork", "spawn", "forkserver" or None for the
+                platform default
+        """
+        if start_method is not None and start_method not in multiprocessing.get_all_start_methods():
+            raise ValueError(f"Start method not available here: {start_method}")
+        self.max_workers = max_workers or _cpu_count()
+        self.start_method = start_method
+        self._pool = ProcessPoolExecutor(
+            self.max_workers, mp_context=multiprocessing.get_context(start_method)
+        )
+
+    def map(self, fn, tasks):
+        return list(self._pool.map(fn, tasks))
+
+    def run_trials(self, tasks, episodes, precision=None, transport="shared"):
+        if transport == "shared":
+            return run_tasks_shared(self._pool, tasks, episodes, precision)
+        return super().run_trials(tasks, episodes, precision)
+
+    def shutdown(self):
+        self._pool.shutdown()
+
+
+def make_executor(backend="auto", max_workers=None, start_method=None,
+                  n_tasks=None, episodes=None):
+    """
+    Create an executor backend.
+
+    Args:
+        backend: "serial", "thread", "process", "batch" or "auto"
+        max_workers: Worker threads/processes (None uses all cores)
+        start_method: Process start method for the process backend
+        n_tasks: Batch size, used by auto mode
+        episodes: Episodes per trial, used by auto mode
+
+    Returns:
+        Executor with map(), run_trials() and shutdown(); usable as a
+        context manager
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    if backend == "auto":
+        if n_tasks is None or episodes is None:
+            raise ValueError("Auto backend needs n_tasks and episodes")
+        backend = choose_backend(n_tasks, episodes, max_workers)
+
+    if backend == "serial":
+        return SerialExecutor()
+    if backend == "batch":
+        return BatchExecutor()
+    if backend == "thread":
+        return ThreadExecutor(max_workers)
+    return ProcessExecutor(max_workers, start_method)
@@ -0,0 +1,210 @@
+"""Per-phase timing of the episode loop, plus optional whole-trial profiling."""
+
+import cProfile
+import contextlib
+import io
+import json
+import pstats
+import time
+import tracemalloc
+
+# Phases timed by run_episodes, in loop order
+PHASES = ("greedy_action", "select_action", "env_step", "update", "credal_width")
+
+# Phases timed inside another phase (their time is also part of the parent)
+NESTED_PHASES = {"predictor_predict": "env_step"}
+
+
+class PhaseProfiler:
+    """
+    Aggregated per-phase timings for run_episodes.
+
+    Every `sample_every`-th episode is timed with time.perf_counter_ns;
+    other episodes run the untimed loop, so overhead scales with the
+    sampling rate. Runs without a profiler pay a single `is None` check
+    per episode.
+
+    Timings accumulate across runs until reset(), so one profiler can
+    aggregate a whole sweep.
+    """
+
+    def __init__(self, sample_every=1):
+        """
+        Args:
+            sample_every: Time one episode in every `sample_every`
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        self.sample_every = sample_every
+        self.reset()
+
+    def reset(self):
+        """Clear all timings and counters."""
+        self.episodes = 0
+        self.sampled = 0
+        self.active = False
+        # phase -> [count, total_ns, total_sq_ns, min_ns, max_ns]
+        self._stats = {}
+
+    def sample(self, episode):
+        """Count an episode and decide whether to time it."""
+        self.episodes += 1
+        self.active = episode % self.sample_every == 0
+        if self.active:
+            self.sampled += 1
+        return self.active
+
+    def record(self, phase, ns):
+        """Add one timing (nanoseconds) to a phase."""
+        stats = self._stats.get(phase)
+        if stats is None:
+            self._stats[phase] = [1, ns, ns * ns, ns, ns]
+            return
+        stats[0] += 1
+        stats[1] += ns
+        stats[2] += ns * ns
+        if ns < stats[3]:
+            stats[3] = ns
+        if ns > stats[4]:
+            stats[4] = ns
+
+    @contextlib.contextmanager
+    def instrument(self, obj, method, phase):
+        """
+        Time calls to obj.method as `phase` during sampled episodes.
+
+        The method is wrapped on the instance and restored on exit.
+        """
+        original = getattr(obj, method)
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            if not self.active:
+                return original(*args, **kwargs)
+            start = clock()
+            result = original(*args, **kwargs)
+            self.record(phase, clock() - start)
+            return result
+
+        setattr(obj, method, timed)
+        try:
+            yield
+        finally:
+            # Drop the instance attribute so the class method shows through again
+            if obj.__dict__.get(method) is timed:
+                delattr(obj, method)
+
+    def summary(self):
+        """
+        Per-phase statistics.
+
+        Returns:
+            Dict with episode counters and, per phase: count, total_ns,
+            mean_ns, std_ns, min_ns, max_ns and share (fraction of the
+            timed top-level phases; nested phases report their share of
+            the same total and name their parent)
+        """
+        top_total = sum(self._stats[p][1] for p in PHASES if p in self._stats)
+        phases = {}
+        for phase, (count, total, total_sq, lo, hi) in self._stats.items():
+            mean = total / count
+            phases[phase] = {
+                "count": count,
+                "total_ns": total,
+                "mean_ns": mean,
+                "std_ns": max(total_sq / count - mean * mean, 0.0) ** 0.5,
+                "min_ns": lo,
+                "max_ns": hi,
+                "share": total / top_total if top_total else 0.0,
+            }
+            if phase in NESTED_PHASES:
+                phases[phase]["parent"] = NESTED_PHASES[phase]
+        return {
+            "episodes": self.episodes,
+            "sampled_episodes": self.sampled,
+            "sample_every": self.sample_every,
+            "phases": phases,
+        }
+
+    def to_json(self, path=None, indent=2):
+        """Return the summary as JSON, also writing it to `path` if given."""
+        text = json.dumps(self.summary(), indent=indent)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+
+def profile_trial(env_type="newcomb", agent_type="ib", episodes=1000, trial=0,
+                  sample_every=1, cprofile=False, trace_memory=False, top=20,
+                  precision=None, path=None):
+    """
+    Profile a single compare_all trial.
+
+    Args:
+        env_type: Environment type as in compare_all
+        agent_type: "classical", "bayesian", or "ib"
+        episodes: Number of episodes
+        trial: Trial index (seed)
+        sample_every: Phase-timing sampling stride
+        cprofile: Also capture a cProfile of the trial
+        trace_memory: Also capture tracemalloc peak and top allocation sites
+        top: Number of cProfile functions / allocation sites to report
+        precision: Storage precision (see ibrl.utils.precision)
+        path: Optional JSON output path
+
+    Returns:
+        Report dict: the PhaseProfiler summary plus "wall_ns" and,
+        if requested, "cprofile" and "tracemalloc" sections
+    """
+    from ibrl.experiments.compare_all import _run_trial
+
+    profiler = PhaseProfiler(sample_every)
+    profile = cProfile.Profile() if cprofile else None
+    if trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter_ns()
+    if profile is not None:
+        profile.enable()
+    try:
+        _run_trial(env_type, agent_type, trial, episodes, None, None, precision,
+                   profiler=profiler)
+    finally:
+        if profile is not None:
+            profile.disable()
+    wall_ns = time.perf_counter_ns() - start
+
+    report = profiler.summary()
+    report.update({"env_type": env_type, "agent_type": agent_type, "wall_ns": wall_ns})
+
+    if profile is not None:
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream).sort_stats("cumulative")
+        report["cprofile"] = [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_s": total,
+                "cumulative_s": cumulative,
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _)
+            in sorted(stats.stats.items(), key=lambda item: -item[1][3])[:top]
+        ]
+
+    if trace_memory:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report["tracemalloc"] = {
+            "peak_bytes": peak,
+            "top": [
+                {"site": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:top]
+            ],
+        }
+
+    if path is not None:
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
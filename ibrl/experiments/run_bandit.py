@@ -5,9 +5,12 @@ from ibrl.agents import ClassicalQAgent, BayesianQAgent, IBQAgent
 from ibrl.envs import BanditEnv
 from ibrl.belief import CredalInterval
 from ibrl.utils.seeding import set_seed
+from ibrl.experiments.episode_loop import run_episodes
 
 
-def run_bandit_experiment(agent_type="classical", episodes=1000, seed=42):
+def run_bandit_experiment(agent_type="classical", episodes=1000, seed=42,
+                          early_stopping=None, noise=None, precision=None,
+                          profiler=None, telemetry=None):
     """
     Run bandit experiment with specified agent.
     
@@ -15,6 +18,15 @@ def run_bandit_experiment(agent_type="classical", episodes=1000, seed=42):
         agent_type: "classical", "bayesian", or "ib"
         episodes: Number of episodes
         seed: Random seed
+        early_stopping: Optional EarlyStopping monitor (see run_episodes)
+        noise: Optional dict of NoiseTapes for common random numbers
+            (see ibrl.utils.noise.make_noise_tapes)
+        precision: Storage precision for agent state and trajectories
+            (None, "double", "compact"; see ibrl.utils.precision)
+        profiler: Optional PhaseProfiler for per-phase timings
+            (see ibrl.experiments.profiling)
+        telemetry: Optional TelemetryProbe publishing live progress
+            (see ibrl.experiments.telemetry)
     
     Returns:
         rewards: Array of rewards per episode
@@ -23,36 +35,33 @@ def run_bandit_experiment(agent_type="classical", episodes=1000, seed=42):
     set_seed(seed)
     
     # Create environment
-    env = BanditEnv(probs=(0.7, 0.5), rewards=(1.0, 1.0), seed=seed)
+    noise = noise or {}
+    env = BanditEnv(probs=(0.7, 0.5), rewards=(1.0, 1.0), seed=seed,
+                    noise_tape=noise.get("env"))
     
     # Create agent
     if agent_type == "classical":
-        agent = ClassicalQAgent(n_actions=2, alpha=0.1, epsilon=0.1, seed=seed)
+        agent = ClassicalQAgent(n_actions=2, alpha=0.1, epsilon=0.1, seed=seed,
+                                precision=precision)
     elif agent_type == "bayesian":
-        agent = BayesianQAgent(n_actions=2, alpha=0.1, seed=seed)
+        agent = BayesianQAgent(n_actions=2, alpha=0.1, seed=seed,
+                               precision=precision)
     elif agent_type == "ib":
         credal = CredalInterval(lower=0.5, upper=0.8, delta=0.05)
-        agent = IBQAgent(credal, n_actions=2, alpha=0.1, seed=seed)
+        agent = IBQAgent(credal, n_actions=2, alpha=0.1, seed=seed,
+                         precision=precision)
     else:
         raise ValueError(f"Unknown agent type: {agent_type}")
     
-    rewards = []
+    # IB agent needs predictor correctness (not applicable for bandit)
+    # Use dummy value
+    rewards, _, _ = run_episodes(
+        env, agent, agent_type, episodes, policy_dependent=False,
+        predictor_correct=True, early_stopping=early_stopping, precision=precision,
+        profiler=profiler, telemetry=telemetry
+    )
     
-    for ep in range(episodes):
-        state = env.reset()
-        action = agent.select_action(state)
-        next_state, reward, done, info = env.step(action)
-        
-        if agent_type == "ib":
-            # IB agent needs predictor correctness (not applicable for bandit)
-            # Use dummy value
-            agent.update(state, action, reward, predictor_correct=True)
-        else:
-            agent.update(state, action, reward, next_state, done)
-        
-        rewards.append(reward)
-    
-    return np.array(rewards), agent
+    return rewards, agent
 
 
 def main():
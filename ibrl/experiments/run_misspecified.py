@@ -6,10 +6,13 @@ from ibrl.envs import MisspecifiedNewcombEnv, AdversarialNewcombEnv
 from ibrl.predictors import LogicalPredictor
 from ibrl.belief import CredalInterval
 from ibrl.utils.seeding import set_seed
+from ibrl.experiments.episode_loop import run_episodes
 
 
 def run_misspecified_experiment(agent_type="classical", episodes=1000, 
-                                true_theta=0.75, model_theta=0.95, seed=42):
+                                true_theta=0.75, model_theta=0.95, seed=42,
+                                early_stopping=None, noise=None, precision=None,
+                                recovery=None, profiler=None, telemetry=None):
     """
     Run misspecified Newcomb experiment.
     
@@ -21,48 +24,53 @@ def run_misspecified_experiment(agent_type="classical", episodes=1000,
         true_theta: True predictor accuracy (outside agent's belief)
         model_theta: Agent's model accuracy
         seed: Random seed
+        early_stopping: Optional EarlyStopping monitor (see run_episodes)
+        noise: Optional dict of NoiseTapes for common random numbers
+            (see ibrl.utils.noise.make_noise_tapes)
+        precision: Storage precision for agent state and trajectories
+            (None, "double", "compact"; see ibrl.utils.precision)
+        recovery: Credal misspecification recovery policy for the IB agent
+            (None, "widen", "reset", "empirical"; see CredalInterval).
+            Episodes spent misspecified are in agent.credal.misspecified_steps.
+        profiler: Optional PhaseProfiler for per-phase timings
+            (see ibrl.experiments.profiling)
+        telemetry: Optional TelemetryProbe publishing live progress
+            (see ibrl.experiments.telemetry)
     
     Returns:
         rewards, agent, credal_widths, actions
     """
     set_seed(seed)
     
-    predictor = LogicalPredictor(theta=model_theta, seed=seed)
-    env = MisspecifiedNewcombEnv(true_theta=true_theta, predictor=predictor, seed=seed)
+    noise = noise or {}
+    predictor = LogicalPredictor(theta=model_theta, seed=seed, noise_tape=noise.get("predictor"))
+    env = MisspecifiedNewcombEnv(true_theta=true_theta, predictor=predictor, seed=seed,
+                                 noise_tape=noise.get("env"))
     
     if agent_type == "classical":
-        agent = ClassicalQAgent(n_actions=2, alpha=0.1, epsilon=0.1, seed=seed)
+        agent = ClassicalQAgent(n_actions=2, alpha=0.1, epsilon=0.1, seed=seed,
+                                precision=precision)
     elif agent_type == "bayesian":
-        agent = BayesianQAgent(n_actions=2, alpha=0.1, seed=seed)
+        agent = BayesianQAgent(n_actions=2, alpha=0.1, seed=seed,
+                               precision=precision)
     elif agent_type == "ib":
-        credal = CredalInterval(lower=0.8, upper=0.99, delta=0.05)
-        agent = IBQAgent(credal, n_actions=2, alpha=0.1, seed=seed)
+        credal = CredalInterval(lower=0.8, upper=0.99, delta=0.05, recovery=recovery)
+        agent = IBQAgent(credal, n_actions=2, alpha=0.1, seed=seed,
+                         precision=precision)
     else:
         raise ValueError(f"Unknown agent type: {agent_type}")
     
-    rewards = []
-    credal_widths = []
-    actions_taken = []
+    rewards, credal_widths, actions_taken = run_episodes(
+        env, agent, agent_type, episodes, early_stopping=early_stopping, precision=precision,
+        profiler=profiler, telemetry=telemetry
+    )
     
-    for ep in range(episodes):
-        state = env.reset()
-        greedy_action = agent.greedy_action()
-        action = agent.select_action(state)
-        next_state, reward, done, info = env.step(action, greedy_action)
-        
-        if agent_type == "ib":
-            agent.update(state, action, reward, info["predictor_correct"])
-            credal_widths.append(agent.credal.width())
-        else:
-            agent.update(state, action, reward, next_state, done)
-        
-        rewards.append(reward)
-        actions_taken.append(action)
-    
-    return np.array(rewards), agent, np.array(credal_widths), np.array(actions_taken)
+    return rewards, agent, credal_widths, actions_taken
 
 
-def run_adversarial_experiment(agent_type="classical", episodes=1000, seed=42):
+def run_adversarial_experiment(agent_type="classical", episodes=1000, seed=42,
+                               early_stopping=None, precision=None, profiler=None,
+                               telemetry=None):
     """
     Run adversarial Newcomb experiment.
     
@@ -73,36 +81,26 @@ def run_adversarial_experiment(agent_type="classical", episodes=1000, seed=42):
     env = AdversarialNewcombEnv(seed=seed)
     
     if agent_type == "classical":
-        agent = ClassicalQAgent(n_actions=2, alpha=0.1, epsilon=0.1, seed=seed)
+        agent = ClassicalQAgent(n_actions=2, alpha=0.1, epsilon=0.1, seed=seed,
+                                precision=precision)
     elif agent_type == "bayesian":
-        agent = BayesianQAgent(n_actions=2, alpha=0.1, seed=seed)
+        agent = BayesianQAgent(n_actions=2, alpha=0.1, seed=seed,
+                               precision=precision)
     elif agent_type == "ib":
         credal = CredalInterval(lower=0.0, upper=1.0, delta=0.05)
-        agent = IBQAgent(credal, n_actions=2, alpha=0.1, seed=seed)
+        agent = IBQAgent(credal, n_actions=2, alpha=0.1, seed=seed,
+                         precision=precision)
     else:
         raise ValueError(f"Unknown agent type: {agent_type}")
     
-    rewards = []
-    credal_widths = []
-    actions_taken = []
+    # In adversarial case, predictor is never "correct" in agent's model
+    rewards, credal_widths, actions_taken = run_episodes(
+        env, agent, agent_type, episodes, predictor_correct=False,
+        early_stopping=early_stopping, precision=precision,
+        profiler=profiler, telemetry=telemetry
+    )
     
-    for ep in range(episodes):
-        state = env.reset()
-        greedy_action = agent.greedy_action()
-        action = agent.select_action(state)
-        next_state, reward, done, info = env.step(action, greedy_action)
-        
-        if agent_type == "ib":
-            # In adversarial case, predictor is never "correct" in agent's model
-            agent.update(state, action, reward, predictor_correct=False)
-            credal_widths.append(agent.credal.width())
-        else:
-            agent.update(state, action, reward, next_state, done)
-        
-        rewards.append(reward)
-        actions_taken.append(action)
-    
-    return np.array(rewards), agent, np.array(credal_widths), np.array(actions_taken)
+    return rewards, agent, credal_widths, actions_taken
 
 
 def main():
@@ -137,6 +135,8 @@ def main():
         
         print(f"  {agent_type.capitalize():12s}: ${mean_reward:>10,.0f} ± ${std_reward:>8,.0f}  "
               f"[one-box: {one_box_rate:.1%}]")
+        if agent_type == "ib":
+            print(f"  {'':12s}  misspecified episodes: {agent.credal.misspecified_steps}")
     
     print()
     print("✓ IB maintains robustness under misspecification")
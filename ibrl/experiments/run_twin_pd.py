@@ -6,9 +6,12 @@ from ibrl.envs import TwinPDEnv
 from ibrl.predictors import LogicalPredictor
 from ibrl.belief import CredalInterval
 from ibrl.utils.seeding import set_seed
+from ibrl.experiments.episode_loop import run_episodes
 
 
-def run_twin_pd_experiment(agent_type="classical", episodes=1000, theta=0.95, seed=42):
+def run_twin_pd_experiment(agent_type="classical", episodes=1000, theta=0.95, seed=42,
+                           early_stopping=None, noise=None, precision=None,
+                           profiler=None, telemetry=None):
     """
     Run Twin PD experiment with specified agent.
     
@@ -17,6 +20,15 @@ def run_twin_pd_experiment(agent_type="classical", episodes=1000, theta=0.95, se
         episodes: Number of episodes
         theta: Predictor accuracy
         seed: Random seed
+        early_stopping: Optional EarlyStopping monitor (see run_episodes)
+        noise: Optional dict of NoiseTapes for common random numbers
+            (see ibrl.utils.noise.make_noise_tapes)
+        precision: Storage precision for agent state and trajectories
+            (None, "double", "compact"; see ibrl.utils.precision)
+        profiler: Optional PhaseProfiler for per-phase timings
+            (see ibrl.experiments.profiling)
+        telemetry: Optional TelemetryProbe publishing live progress
+            (see ibrl.experiments.telemetry)
     
     Returns:
         rewards: Array of rewards per episode
@@ -26,41 +38,30 @@ def run_twin_pd_experiment(agent_type="classical", episodes=1000, theta=0.95, se
     """
     set_seed(seed)
     
-    predictor = LogicalPredictor(theta=theta, seed=seed)
+    noise = noise or {}
+    predictor = LogicalPredictor(theta=theta, seed=seed, noise_tape=noise.get("predictor"))
     env = TwinPDEnv(predictor, seed=seed)
     
     if agent_type == "classical":
-        agent = ClassicalQAgent(n_actions=2, alpha=0.1, epsilon=0.1, seed=seed)
+        agent = ClassicalQAgent(n_actions=2, alpha=0.1, epsilon=0.1, seed=seed,
+                                precision=precision)
     elif agent_type == "bayesian":
-        agent = BayesianQAgent(n_actions=2, alpha=0.1, seed=seed)
+        agent = BayesianQAgent(n_actions=2, alpha=0.1, seed=seed,
+                               precision=precision)
     elif agent_type == "ib":
         credal = CredalInterval(lower=0.8, upper=0.99, delta=0.05)
         # For Twin PD: cooperate if θ > 2/3
         agent = IBQAgent(credal, n_actions=2, alpha=0.1, 
-                        million=5, small=2, seed=seed)  # Adjust payoffs
+                        million=5, small=2, seed=seed, precision=precision)  # Adjust payoffs
     else:
         raise ValueError(f"Unknown agent type: {agent_type}")
     
-    rewards = []
-    credal_widths = []
-    actions_taken = []
+    rewards, credal_widths, actions_taken = run_episodes(
+        env, agent, agent_type, episodes, early_stopping=early_stopping, precision=precision,
+        profiler=profiler, telemetry=telemetry
+    )
     
-    for ep in range(episodes):
-        state = env.reset()
-        greedy_action = agent.greedy_action()
-        action = agent.select_action(state)
-        next_state, reward, done, info = env.step(action, greedy_action)
-        
-        if agent_type == "ib":
-            agent.update(state, action, reward, info["predictor_correct"])
-            credal_widths.append(agent.credal.width())
-        else:
-            agent.update(state, action, reward, next_state, done)
-        
-        rewards.append(reward)
-        actions_taken.append(action)
-    
-    return np.array(rewards), agent, np.array(credal_widths), np.array(actions_taken)
+    return rewards, agent, credal_widths, actions_taken
 
 
 def main():
@@ -6,9 +6,12 @@ from ibrl.envs import NewcombEnv
 from ibrl.predictors import LogicalPredictor
 from ibrl.belief import CredalInterval, WassersteinBall
 from ibrl.utils.seeding import set_seed
+from ibrl.experiments.episode_loop import run_episodes
 
 
-def run_wasserstein_experiment(belief_type="credal", episodes=1000, theta=0.95, seed=42):
+def run_wasserstein_experiment(belief_type="credal", episodes=1000, theta=0.95, seed=42,
+                               early_stopping=None, noise=None, precision=None,
+                               profiler=None, telemetry=None):
     """
     Compare Wasserstein ball vs Credal interval.
     
@@ -17,40 +20,41 @@ def run_wasserstein_experiment(belief_type="credal", episodes=1000, theta=0.95,
         episodes: Number of episodes
         theta: Predictor accuracy
         seed: Random seed
+        early_stopping: Optional EarlyStopping monitor (see run_episodes)
+        noise: Optional dict of NoiseTapes for common random numbers
+            (see ibrl.utils.noise.make_noise_tapes)
+        precision: Storage precision for agent state and trajectories
+            (None, "double", "compact"; see ibrl.utils.precision)
+        profiler: Optional PhaseProfiler for per-phase timings
+            (see ibrl.experiments.profiling)
+        telemetry: Optional TelemetryProbe publishing live progress
+            (see ibrl.experiments.telemetry)
     """
     set_seed(seed)
     
-    predictor = LogicalPredictor(theta=theta, seed=seed)
+    noise = noise or {}
+    predictor = LogicalPredictor(theta=theta, seed=seed, noise_tape=noise.get("predictor"))
     env = NewcombEnv(predictor, seed=seed)
     
     if belief_type == "credal":
         belief = CredalInterval(lower=0.8, upper=0.99, delta=0.05)
-        agent = IBQAgent(belief, n_actions=2, alpha=0.1, seed=seed)
+        agent = IBQAgent(belief, n_actions=2, alpha=0.1, seed=seed,
+                         precision=precision)
     elif belief_type == "wasserstein":
         # For Wasserstein, we need to adapt IBQAgent slightly
         # Use credal for now (Wasserstein needs different value computation)
         belief = CredalInterval(lower=0.8, upper=0.99, delta=0.05)
-        agent = IBQAgent(belief, n_actions=2, alpha=0.1, seed=seed)
+        agent = IBQAgent(belief, n_actions=2, alpha=0.1, seed=seed,
+                         precision=precision)
     else:
         raise ValueError(f"Unknown belief type: {belief_type}")
     
-    rewards = []
-    belief_widths = []
-    actions_taken = []
+    rewards, belief_widths, actions_taken = run_episodes(
+        env, agent, "ib", episodes, early_stopping=early_stopping, precision=precision,
+        profiler=profiler, telemetry=telemetry
+    )
     
-    for ep in range(episodes):
-        state = env.reset()
-        greedy_action = agent.greedy_action()
-        action = agent.select_action(state)
-        next_state, reward, done, info = env.step(action, greedy_action)
-        
-        agent.update(state, action, reward, info["predictor_correct"])
-        belief_widths.append(agent.credal.width())
-        
-        rewards.append(reward)
-        actions_taken.append(action)
-    
-    return np.array(rewards), agent, np.array(belief_widths), np.array(actions_taken)
+    return rewards, agent, belief_widths, actions_taken
 
 
 def main():
@@ -0,0 +1,170 @@
+"""Shared-memory transport for trial results produced by worker processes."""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+from ibrl.utils.precision import get_precision
+
+METRICS = ("rewards", "credal_widths", "actions")
+
+# Per-process cache of attached blocks: spec key -> (segments, arrays)
+_ATTACHED = {}
+
+
+class SharedResultBlock:
+    """
+    One shared-memory block per metric, shaped (tasks, episodes).
+
+    Tasks are laid out in submission order, so for a fixed allocation
+    (cell-major, trials inner) each block is a (cells, trials, episodes)
+    array. Workers write their trajectories straight into their row and
+    send back only a small completion notice.
+    """
+
+    def __init__(self, n_tasks, episodes, precision=None):
+        """
+        Args:
+            n_tasks: Number of trials in the batch
+            episodes: Episodes per trial
+            precision: Storage precision (see ibrl.utils.precision)
+        """
+        policy = get_precision(precision)
+        dtypes = {
+            "rewards": policy.float_dtype,
+            "credal_widths": policy.float_dtype,
+            "actions": policy.action_dtype,
+        }
+        self.shape = (n_tasks, episodes)
+        self._segments = {}
+        self.arrays = {}
+        for metric in METRICS:
+            dtype = np.dtype(dtypes[metric])
+            size = max(int(np.prod(self.shape)) * dtype.itemsize, 1)
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self._segments[metric] = shm
+            self.arrays[metric] = np.ndarray(self.shape, dtype=dtype, buffer=shm.buf)
+
+    def spec(self):
+        """Picklable description workers use to attach to the block."""
+        return {
+            metric: (shm.name, self.shape, self.arrays[metric].dtype.str)
+            for metric, shm in self._segments.items()
+        }
+
+    def collect(self, notices):
+        """
+        Build per-task outputs from worker completion notices.
+
+        The whole block is copied out once per metric (a single memcpy)
+        so the segments can be released immediately; each output is a
+        view into that private copy.
+
+        Args:
+            notices: (index, lengths, stop_episode) tuples from workers
+
+        Returns:
+            List of (rewards, credal_widths, actions, stop_episode) in task order
+        """
+        private = {metric: np.array(array) for metric, array in self.arrays.items()}
+        outputs = [None] * self.shape[0]
+        for index, lengths, stop_episode in notices:
+            values = []
+            for metric, length in zip(METRICS, lengths):
+                values.append(None if length < 0 else private[metric][index, :length])
+            outputs[index] = (*values, stop_episode)
+        return outputs
+
+    def close(self):
+        """Release and unlink the shared segments."""
+        self.arrays = {}
+        for shm in self._segments.values():
+            shm.close()
+            shm.unlink()
+        self._segments = {}
+
+
+def attach_arrays(spec, cache=_ATTACHED):
+    """
+    Attach to shared-memory arrays from a worker process.
+
+    Attachments are cached per process, keyed on the segment names, and
+    the ones from an earlier spec are closed when a new spec arrives.
+
+    Args:
+        spec: Dict of name -> (segment name, shape, dtype), as returned
+            by SharedResultBlock.spec() or TelemetryBoard.spec()
+        cache: Per-process attachment cache (callers sharing memory of
+            a different kind keep their own)
+
+    Returns:
+        Dict of name -> numpy array backed by the shared segment
+    """
+    key = tuple(name for name, _, _ in spec.values())
+    cached = cache.get(key)
+    if cached is None:
+        # A new batch: drop attachments to earlier (already unlinked) blocks
+        for segments, _ in cache.values():
+            for shm in segments:
+                shm.close()
+        cache.clear()
+
+        segments, arrays = [], {}
+        for metric, (name, shape, dtype) in spec.items():
+            # Workers are children of the creating process and share its
+            # resource tracker, so attaching does not take ownership
+            shm = shared_memory.SharedMemory(name=name)
+            segments.append(shm)
+            arrays[metric] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        cached = cache[key] = (segments, arrays)
+    return cached[1]
+
+
+def run_single_trial_shared(args):
+    """
+    Run one trial in a worker and write its trajectories into shared memory.
+
+    Args:
+        args: (task, index, spec), where task is a run_single_trial tuple
+
+    Returns:
+        (index, lengths, stop_episode): lengths per metric, -1 for None
+    """
+    from ibrl.experiments.compare_all import run_single_trial
+
+    task, index, spec = args
+    output = run_single_trial(task)
+    arrays = attach_arrays(spec)
+
+    lengths = []
+    for metric, values in zip(METRICS, output[:3]):
+        if values is None:
+            lengths.append(-1)
+            continue
+        values = np.asarray(values)
+        arrays[metric][index, :len(values)] = values
+        lengths.append(len(values))
+    return index, tuple(lengths), output[3]
+
+
+def run_tasks_shared(executor, tasks, episodes, precision=None):
+    """
+    Run compare_all tasks on an executor, returning results through
+    shared memory instead of pickled arrays.
+
+    Args:
+        executor: concurrent.futures executor with worker processes
+        tasks: run_single_trial task tuples
+        episodes: Episodes per trial (row length of the blocks)
+        precision: Storage precision of the returned arrays
+
+    Returns:
+        List of run_single_trial outputs in task order
+    """
+    block = SharedResultBlock(len(tasks), episodes, precision)
+    try:
+        spec = block.spec()
+        notices = executor.map(run_single_trial_shared,
+                               [(task, i, spec) for i, task in enumerate(tasks)])
+        return block.collect(list(notices))
+    finally:
+        block.close()
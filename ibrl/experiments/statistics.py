@@ -0,0 +1,291 @@
+"""Bootstrap confidence intervals, permutation tests and effect sizes for results."""
+
+import functools
+import itertools
+
+import numpy as np
+from scipy import special
+
+# Index-matrix entries generated per chunk (bounds memory for large trials × B)
+_CHUNK_ENTRIES = 1 << 22
+
+
+def _chunks(n_resamples, n):
+    """Split n_resamples rows of width n into chunks of bounded size."""
+    rows = max(1, _CHUNK_ENTRIES // max(n, 1))
+    for start in range(0, n_resamples, rows):
+        yield min(rows, n_resamples - start)
+
+
+def bootstrap_means(values, n_resamples=10000, seed=None):
+    """
+    Means of bootstrap resamples of `values`.
+
+    Resamples are drawn as a (B, trials) index matrix (in chunks of
+    bounded memory) and reduced with one gather and one row mean, with
+    no per-resample Python loop.
+
+    Args:
+        values: 1D array of per-trial values
+        n_resamples: Number of bootstrap resamples B
+        seed: Random seed or Generator
+
+    Returns:
+        Array of B resample means
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    rng = np.random.default_rng(seed)
+    index_dtype = np.int32 if n < 2**31 else np.int64
+    means = np.empty(n_resamples)
+    done = 0
+    for rows in _chunks(n_resamples, n):
+        index = rng.integers(0, n, size=(rows, n), dtype=index_dtype)
+        means[done:done + rows] = values[index].mean(axis=1)
+        done += rows
+    return means
+
+
+def bootstrap_ci(values, confidence=0.95, n_resamples=10000, method="bca", seed=None):
+    """
+    Bootstrap confidence interval for the mean.
+
+    Args:
+        values: 1D array of per-trial values
+        confidence: Confidence level
+        n_resamples: Number of bootstrap resamples
+        method: "percentile" or "bca" (bias-corrected and accelerated,
+            with the acceleration from the closed-form jackknife of the mean)
+        seed: Random seed or Generator
+
+    Returns:
+        (mean, low, high); the interval collapses to the mean when all
+        values are equal and is (nan, nan) for fewer than two values
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    estimate = float(np.mean(values)) if n else np.nan
+    if n < 2:
+        return estimate, np.nan, np.nan
+    if np.all(values == values[0]):
+        return estimate, estimate, estimate
+
+    means = bootstrap_means(values, n_resamples, seed)
+    alpha = (1 - confidence) / 2
+    if method == "percentile":
+        low, high = np.quantile(means, [alpha, 1 - alpha])
+        return estimate, float(low), float(high)
+    if method != "bca":
+        raise ValueError(f"Unknown bootstrap method: {method}")
+
+    # Bias correction from the share of resamples below the estimate
+    below = np.count_nonzero(means < estimate) + 0.5 * np.count_nonzero(means == estimate)
+    share = np.clip(below / n_resamples, 1 / (n_resamples + 1), n_resamples / (n_resamples + 1))
+    z0 = special.ndtri(share)
+
+    # Acceleration from the jackknife means (sum - x_i) / (n - 1)
+    jackknife = (values.sum() - values) / (n - 1)
+    deviations = jackknife.mean() - jackknife
+    denominator = 6 * np.sum(deviations ** 2) ** 1.5
+    a = np.sum(deviations ** 3) / denominator if denominator > 0 else 0.0
+
+    z = special.ndtri(np.array([alpha, 1 - alpha]))
+    levels = special.ndtr(z0 + (z0 + z) / (1 - a * (z0 + z)))
+    low, high = np.quantile(means, levels)
+    return estimate, float(low), float(high)
+
+
+def paired_permutation_test(a, b, n_permutations=10000, alternative="two-sided", seed=None):
+    """
+    Sign-flip permutation test of the mean paired difference a - b.
+
+    Under the null the sign of each paired difference is exchangeable.
+    Sign patterns are drawn as one (B, trials) matrix of random bits
+    (unpacked from raw random bytes) and applied with a single
+    matrix-vector product; when 2^trials does not exceed n_permutations
+    every pattern is enumerated and the p-value is exact.
+
+    Args:
+        a, b: Paired per-trial values (same length)
+        n_permutations: Number of random sign patterns
+        alternative: "two-sided", "greater" (a > b) or "less" (a < b)
+        seed: Random seed or Generator
+
+    Returns:
+        (mean_difference, p_value)
+    """
+    d = np.asarray(a, dtype=float) - np.asarray(b, dtype=float)
+    n = len(d)
+    if n == 0:
+        return np.nan, np.nan
+    observed = d.mean()
+
+    # A set bit flips the sign: mean(±d) = (sum(d) - 2·flipped·d) / n
+    total = d.sum()
+    exact = 2 ** n <= n_permutations
+    if exact:
+        flips = np.array(list(itertools.product((0, 1), repeat=n)), dtype=np.uint8)
+        null = (total - 2 * (flips @ d)) / n
+    else:
+        rng = np.random.default_rng(seed)
+        null = np.empty(n_permutations)
+        done = 0
+        for rows in _chunks(n_permutations, n):
+            raw = np.frombuffer(rng.bytes((rows * n + 7) // 8), dtype=np.uint8)
+            flips = np.unpackbits(raw, count=rows * n).reshape(rows, n)
+            null[done:done + rows] = (total - 2 * (flips @ d)) / n
+            done += rows
+
+    # Tolerance so ties with the observed statistic count as extreme
+    tol = 1e-12 * max(1.0, abs(observed))
+    if alternative == "two-sided":
+        extreme = np.count_nonzero(np.abs(null) >= abs(observed) - tol)
+    elif alternative == "greater":
+        extreme = np.count_nonzero(null >= observed - tol)
+    elif alternative == "less":
+        extreme = np.count_nonzero(null <= observed + tol)
+    else:
+        raise ValueError(f"Unknown alternative: {alternative}")
+
+    if exact:
+        return float(observed), float(extreme / len(null))
+    return float(observed), float((extreme + 1) / (n_permutations + 1))
+
+
+def effect_sizes(a, b, paired=True):
+    """
+    Standardized effect sizes of a versus b.
+
+    Args:
+        a, b: Per-trial values
+        paired: Also report the paired d_z (requires equal lengths)
+
+    Returns:
+        Dict with hedges_g (bias-corrected pooled-SD difference),
+        cliffs_delta (P(a > b) - P(a < b), robust to the bimodal rewards
+        of the Newcomb-like games) and, if paired, cohens_dz (mean paired
+        difference over its SD); undefined values are nan
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n_a, n_b = len(a), len(b)
+    sizes = {"hedges_g": np.nan, "cliffs_delta": np.nan}
+
+    if n_a > 1 and n_b > 1:
+        pooled = np.sqrt(((n_a - 1) * np.var(a, ddof=1) + (n_b - 1) * np.var(b, ddof=1))
+                         / (n_a + n_b - 2))
+        if pooled > 0:
+            correction = 1 - 3 / (4 * (n_a + n_b) - 9)
+            sizes["hedges_g"] = float(correction * (a.mean() - b.mean()) / pooled)
+
+    if n_a and n_b:
+        # Counts of b below / above each a via binary search (O(n log n))
+        sorted_b = np.sort(b)
+        less = np.searchsorted(sorted_b, a, side="left")
+        greater = n_b - np.searchsorted(sorted_b, a, side="right")
+        sizes["cliffs_delta"] = float((less.sum() - greater.sum()) / (n_a * n_b))
+
+    if paired:
+        d = a - b
+        sd = np.std(d, ddof=1) if len(d) > 1 else 0.0
+        sizes["cohens_dz"] = float(d.mean() / sd) if sd > 0 else np.nan
+    return sizes
+
+
+def compare_cells(a, b, confidence=0.95, n_resamples=10000, seed=None):
+    """
+    Paired comparison of two cells' per-trial values.
+
+    Trials are paired by index (compare_all seeds trial i identically for
+    every agent); the longer cell is truncated to the shorter.
+
+    Returns:
+        Dict with n, difference, difference CI, two-sided permutation
+        p-value and effect sizes
+    """
+    n = min(len(a), len(b))
+    a = np.asarray(a[:n], dtype=float)
+    b = np.asarray(b[:n], dtype=float)
+    rng = np.random.default_rng(seed)
+    difference, low, high = bootstrap_ci(a - b, confidence, n_resamples, seed=rng)
+    _, p_value = paired_permutation_test(a, b, n_resamples, seed=rng)
+    return {
+        "n": n,
+        "difference": difference,
+        "ci": (low, high),
+        "p_value": p_value,
+        **effect_sizes(a, b),
+    }
+
+
+def summarize_results(results, confidence=0.95, n_resamples=10000, tail=100, seed=0):
+    """
+    Bootstrap CIs for every (env, agent) cell and paired tests for every
+    agent pair within an environment.
+
+    Args:
+        results: compare_all results ({env: {agent: [trial dicts]}})
+        confidence: Confidence level of all intervals
+        n_resamples: Bootstrap resamples / random sign patterns
+        tail: Final episodes averaged per trial
+        seed: Random seed
+
+    Returns:
+        {env: {"cells": {agent: {...}}, "pairs": {(agent_a, agent_b): {...}}}}
+    """
+    rng = np.random.default_rng(seed)
+    summary = {}
+    for env_type, cells in results.items():
+        values = {}
+        env_summary = {"cells": {}, "pairs": {}}
+        for agent_type, cell in cells.items():
+            rewards = np.array([np.mean(r["rewards"][-tail:]) for r in cell])
+            values[agent_type] = rewards
+            mean, low, high = bootstrap_ci(rewards, confidence, n_resamples, seed=rng)
+            stats = {"n_trials": len(cell), "mean": mean, "ci": (low, high)}
+            if cell and all(r["actions"] is not None for r in cell):
+                rates = np.array([1 - np.mean(r["actions"][-tail:]) for r in cell])
+                rate, rate_low, rate_high = bootstrap_ci(rates, confidence, n_resamples,
+                                                         seed=rng)
+                stats.update(one_box_rate=rate, one_box_rate_ci=(rate_low, rate_high))
+            env_summary["cells"][agent_type] = stats
+
+        for agent_a, agent_b in itertools.combinations(values, 2):
+            env_summary["pairs"][(agent_a, agent_b)] = compare_cells(
+                values[agent_a], values[agent_b], confidence, n_resamples, seed=rng
+            )
+        summary[env_type] = env_summary
+    return summary
+
+
+def _format_value(value, scale):
+    # Dollar-scale rewards (Newcomb-like games) without decimals
+    return f"{value:,.0f}" if scale >= 1000 else f"{value:.3f}"
+
+
+def format_summary(summary, confidence=0.95):
+    """Render summarize_results output as text lines per environment."""
+    lines = []
+    level = f"{confidence:.0%}"
+    for env_type, env_summary in summary.items():
+        scale = max([abs(stats["mean"]) for stats in env_summary["cells"].values()] + [0.0])
+        fmt = functools.partial(_format_value, scale=scale)
+
+        lines.append(f"\n{env_type.upper().replace('_', ' ')} ENVIRONMENT:")
+        for agent_type, stats in env_summary["cells"].items():
+            low, high = stats["ci"]
+            line = (f"  {agent_type.capitalize():22s}: {fmt(stats['mean'])}  "
+                    f"{level} CI [{fmt(low)}, {fmt(high)}]  (n={stats['n_trials']})")
+            if "one_box_rate" in stats:
+                rate_low, rate_high = stats["one_box_rate_ci"]
+                line += f"  one-box {stats['one_box_rate']:.1%} [{rate_low:.1%}, {rate_high:.1%}]"
+            lines.append(line)
+        for (agent_a, agent_b), pair in env_summary["pairs"].items():
+            low, high = pair["ci"]
+            label = f"{agent_a.capitalize()} - {agent_b.capitalize()}"
+            lines.append(
+                f"  {label:22s}: {fmt(pair['difference'])}  "
+                f"{level} CI [{fmt(low)}, {fmt(high)}]  p={pair['p_value']:.4f}  "
+                f"g={pair['hedges_g']:.2f}  δ={pair['cliffs_delta']:.2f}  (n={pair['n']})"
+            )
+    return lines
@@ -0,0 +1,334 @@
+"""Live progress telemetry for long compare_all runs."""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+from ibrl.experiments.shared_results import attach_arrays
+
+# Counters published per task slot (one float64 each)
+FIELDS = ("episodes", "total", "rss_bytes", "pid", "started", "updated", "state")
+EPISODES, TOTAL, RSS_BYTES, PID, STARTED, UPDATED, STATE = range(len(FIELDS))
+
+# Slot states
+PENDING, RUNNING, DONE = 0, 1, 2
+
+# Episodes between worker publishes
+DEFAULT_PUBLISH_EVERY = 1000
+
+# Per-process cache of attached boards (kept apart from result blocks)
+_ATTACHED = {}
+
+
+def _rss_bytes():
+    """Resident set size of this process (0 if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+class TelemetryBoard:
+    """
+    Shared-memory counter board with one row of FIELDS per task.
+
+    Each row has a single writer (the worker running that task), and
+    every field is one aligned float64, so workers publish with plain
+    stores: no locks, no pipes, nothing that can block the episode loop.
+    The parent polls the whole board.
+    """
+
+    def __init__(self, n_slots):
+        """
+        Args:
+            n_slots: Number of tasks in the batch
+        """
+        self.shape = (n_slots, len(FIELDS))
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=max(n_slots * len(FIELDS) * 8, 8))
+        self.counters = np.ndarray(self.shape, dtype=np.float64, buffer=self._shm.buf)
+        self.counters[:] = 0.0
+
+    def spec(self):
+        """Picklable description workers use to attach to the board."""
+        return {"counters": (self._shm.name, self.shape, "<f8")}
+
+    def read(self):
+        """Snapshot of all counters."""
+        return np.array(self.counters)
+
+    def close(self):
+        """Release and unlink the shared segment."""
+        self.counters = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+class TelemetryProbe:
+    """Worker-side handle publishing the progress of one task."""
+
+    def __init__(self, row, interval=DEFAULT_PUBLISH_EVERY):
+        """
+        Args:
+            row: The task's counter row (a view into a TelemetryBoard)
+            interval: Episodes between publishes
+        """
+        self.row = row
+        self.interval = interval
+
+    @classmethod
+    def attach(cls, spec, slot, total, interval=DEFAULT_PUBLISH_EVERY):
+        """
+        Attach to a board and mark a task as running.
+
+        Args:
+            spec: TelemetryBoard.spec()
+            slot: Row of the task
+            total: Episodes the task will run at most
+            interval: Episodes between publishes
+
+        Returns:
+            TelemetryProbe
+        """
+        row = attach_arrays(spec, _ATTACHED)["counters"][slot]
+        now = time.time()
+        row[TOTAL] = total
+        row[PID] = os.getpid()
+        row[STARTED] = now
+        row[UPDATED] = now
+        row[RSS_BYTES] = _rss_bytes()
+        row[STATE] = RUNNING
+        return cls(row, interval)
+
+    def publish(self, episodes):
+        """Publish the number of completed episodes."""
+        row = self.row
+        row[EPISODES] = episodes
+        row[RSS_BYTES] = _rss_bytes()
+        row[UPDATED] = time.time()
+
+    def finish(self):
+        """Mark the task as done."""
+        self.row[UPDATED] = time.time()
+        self.row[STATE] = DONE
+
+
+def _format_duration(seconds):
+    if seconds is None or not np.isfinite(seconds):
+        return "--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class TelemetryMonitor:
+    """
+    Parent-side view of a run: polls the board from a background thread,
+    renders a progress line, appends a JSON-lines time series and raises
+    alerts.
+
+    Alerts (each disabled when None):
+        min_rate: Total throughput below this many episodes/s
+        drop_ratio: Throughput below this fraction of the best rate so far
+        stall_seconds: A running task has not published for this long
+
+    An alert is reported when it becomes active, not on every poll; all
+    alerts are kept in `alerts`.
+    """
+
+    def __init__(self, interval=1.0, log_path=None, stream=sys.stderr,
+                 publish_every=DEFAULT_PUBLISH_EVERY, window=5,
+                 min_rate=None, drop_ratio=None, stall_seconds=None):
+        """
+        Args:
+            interval: Seconds between polls
+            log_path: Optional JSON-lines time-series path (appended to)
+            stream: Where the progress line and alerts go (None for silence)
+            publish_every: Episodes between worker publishes
+            window: Polls the throughput is averaged over
+            min_rate: Absolute throughput alert threshold (episodes/s)
+            drop_ratio: Relative throughput-drop alert threshold
+            stall_seconds: Stalled-task alert threshold
+        """
+        self.interval = interval
+        self.log_path = log_path
+        self.stream = stream
+        self.publish_every = publish_every
+        self.window = window
+        self.min_rate = min_rate
+        self.drop_ratio = drop_ratio
+        self.stall_seconds = stall_seconds
+
+        self.records = []
+        self.alerts = []
+        self._active_alerts = set()
+        self._history = deque(maxlen=window + 1)
+        self._peak_rate = 0.0
+        self._finished = 0.0
+        self._finished_by_pid = {}
+        self._start = time.time()
+        self._board = None
+        self._tasks = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def batch(self, tasks):
+        """
+        Track a batch of compare_all tasks.
+
+        Yields the tasks with telemetry options attached; the caller runs
+        those instead. Polling runs in a background thread for the
+        duration of the block.
+        """
+        board = TelemetryBoard(len(tasks))
+        spec = board.spec()
+        tagged = [
+            (*task[:4], dict(task[4], telemetry=(spec, slot, self.publish_every)))
+            for slot, task in enumerate(tasks)
+        ]
+        with self._lock:
+            self._board, self._tasks = board, tasks
+
+        stop = threading.Event()
+        poller = threading.Thread(target=self._poll, args=(stop,), daemon=True)
+        poller.start()
+        try:
+            yield tagged
+        finally:
+            stop.set()
+            poller.join()
+            with self._lock:
+                self.sample()
+                counters = board.read()
+                self._finished += counters[:, EPISODES].sum()
+                for row in counters[counters[:, STATE] != PENDING]:
+                    pid = int(row[PID])
+                    self._finished_by_pid[pid] = self._finished_by_pid.get(pid, 0.0) + row[EPISODES]
+                self._board, self._tasks = None, []
+            board.close()
+
+    def _poll(self, stop):
+        while not stop.wait(self.interval):
+            with self._lock:
+                self.sample()
+
+    def sample(self):
+        """
+        Read the board once, update rates and alerts, and report.
+
+        Returns:
+            Time-series record (also appended to `records` and the log)
+        """
+        now = time.time()
+        counters = self._board.read() if self._board is not None else np.zeros((0, len(FIELDS)))
+
+        by_pid = dict(self._finished_by_pid)
+        rss = {}
+        for row in counters:
+            if row[STATE] == PENDING:
+                continue
+            pid = int(row[PID])
+            by_pid[pid] = by_pid.get(pid, 0.0) + row[EPISODES]
+            rss[pid] = row[RSS_BYTES]
+        episodes = self._finished + counters[:, EPISODES].sum()
+        self._history.append((now, episodes, by_pid))
+
+        then, then_episodes, then_by_pid = self._history[0]
+        elapsed = now - then
+        rate = (episodes - then_episodes) / elapsed if elapsed > 0 else 0.0
+        workers = {
+            pid: {
+                "rate": (count - then_by_pid.get(pid, 0.0)) / elapsed if elapsed > 0 else 0.0,
+                "rss_bytes": int(rss.get(pid, 0)),
+            }
+            for pid, count in by_pid.items() if pid in rss
+        }
+
+        running = counters[:, STATE] == RUNNING
+        done = counters[:, STATE] == DONE
+        pending = counters[:, STATE] == PENDING
+        # Pending rows are still zero; their episode budget comes from the task
+        remaining = (counters[running, TOTAL] - counters[running, EPISODES]).sum()
+        remaining += sum(task[3] for task, waiting in zip(self._tasks, pending) if waiting)
+        eta = remaining / rate if rate > 0 else None
+
+        alerts = self._check_alerts(now, counters, running, rate)
+        record = {
+            "time": now - self._start,
+            "episodes": int(episodes),
+            "rate": rate,
+            "eta_s": eta,
+            "tasks": {
+                "pending": int(pending.sum()),
+                "running": int(running.sum()),
+                "done": int(done.sum()),
+            },
+            "workers": {str(pid): stats for pid, stats in workers.items()},
+            "alerts": alerts,
+        }
+        self.records.append(record)
+        if self.log_path is not None:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        self._report(record)
+        return record
+
+    def _check_alerts(self, now, counters, running, rate):
+        warmed_up = len(self._history) > self.window
+        if warmed_up:
+            self._peak_rate = max(self._peak_rate, rate)
+
+        active = {}
+        if warmed_up and self.min_rate is not None and rate < self.min_rate:
+            active["throughput"] = f"throughput {rate:,.0f} ep/s below {self.min_rate:,.0f}"
+        if (warmed_up and self.drop_ratio is not None and self._peak_rate > 0
+                and rate < self.drop_ratio * self._peak_rate):
+            active["drop"] = (f"throughput {rate:,.0f} ep/s dropped below "
+                              f"{self.drop_ratio:.0%} of peak {self._peak_rate:,.0f}")
+        if self.stall_seconds is not None:
+            for slot in np.flatnonzero(running):
+                idle = now - counters[slot, UPDATED]
+                if idle > self.stall_seconds:
+                    env_type, agent_type, trial = self._tasks[slot][:3]
+                    active[f"stall/{slot}"] = (f"{env_type}/{agent_type} trial {trial} "
+                                               f"silent for {idle:.0f}s")
+
+        new = [message for key, message in active.items() if key not in self._active_alerts]
+        self._active_alerts = set(active)
+        self.alerts.extend(new)
+        return new
+
+    def _report(self, record):
+        if self.stream is None:
+            return
+        for message in record["alerts"]:
+            self.stream.write(f"\n[telemetry] ALERT: {message}\n")
+        rss = sum(w["rss_bytes"] for w in record["workers"].values())
+        tasks = record["tasks"]
+        line = (f"\r[telemetry] {record['episodes']:,} ep | {record['rate']:,.0f} ep/s | "
+                f"{len(record['workers'])} workers | tasks {tasks['done']} done, "
+                f"{tasks['running']} running | rss {rss / 2**20:,.0f} MB | "
+                f"ETA {_format_duration(record['eta_s'])}")
+        self.stream.write(line.ljust(100))
+        self.stream.flush()
+
+    def close(self):
+        """End the progress line."""
+        if self.stream is not None:
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+def probe_from_options(options, total):
+    """TelemetryProbe for a task whose options carry a board slot, else None."""
+    telemetry = options.get("telemetry")
+    if telemetry is None:
+        return None
+    spec, slot, interval = telemetry
+    return TelemetryProbe.attach(spec, slot, total, interval)
@@ -0,0 +1,228 @@
+"""Round-robin Twin PD tournaments between heterogeneous agent populations."""
+
+import numpy as np
+
+AGENT_TYPES = ("classical", "bayesian", "ib")
+CLASSICAL, BAYESIAN, IB = range(len(AGENT_TYPES))
+
+DEFAULT_POPULATION = (
+    {"type": "classical", "epsilon": 0.1},
+    {"type": "classical", "epsilon": 0.3},
+    {"type": "bayesian"},
+    {"type": "ib", "lower": 0.8, "upper": 0.99},
+    {"type": "ib", "lower": 0.5, "upper": 0.99},
+    {"type": "ib", "lower": 0.9, "upper": 0.99, "delta": 0.01},
+)
+
+
+def _sequential_q(q, alpha, actions, rewards, played):
+    """
+    Q-values after applying a round's experiences one at a time.
+
+    Experiences are taken in opponent order. For the k-th of n updates
+    to an action, the reward's weight in the result is α(1 - α)^(n - k),
+    and the old value's weight is (1 - α)^n. That gives the sequential
+    result without a Python loop.
+
+    Args:
+        q: (N, A) Q-values
+        alpha: (N,) learning rates
+        actions, rewards: (N, N) action and reward of agent i against j
+        played: (N, N) mask of pairings that took place
+
+    Returns:
+        (N, A) updated Q-values
+    """
+    decay = (1 - alpha)[:, None]
+    updated = np.empty_like(q)
+    for action in range(q.shape[1]):
+        taken = played & (actions == action)
+        rank = np.cumsum(taken, axis=1)
+        count = rank[:, -1:]
+        weights = np.where(taken, alpha[:, None] * decay ** (count - rank), 0.0)
+        kept = decay[:, 0] ** count[:, 0] * q[:, action]
+        updated[:, action] = kept + (weights * rewards).sum(axis=1)
+    return updated
+
+
+class Tournament:
+    """
+    Round-robin Twin Prisoner's Dilemma between every pair of agents.
+
+    In each round, every agent plays one game against every other agent.
+    Agent state lives in pooled arrays, one row per agent. Each type has
+    a mask:
+    - Classical agents: epsilon-greedy Q-learning.
+    - Bayesian agents: Q-learning with Thompson sampling over Beta
+      posteriors of a positive payoff.
+    - IB agents: a Hoeffding credal interval over θ, the probability
+      that an opponent mirrors their greedy action (the predictor
+      accuracy of TwinPDEnv). They play the action with the highest
+      worst-case value. The value is read off the payoff matrix: θ times
+      the payoff for a matching opponent, plus 1 - θ times the payoff for
+      a mismatching one.
+
+    A round uses one table lookup for all N² payoffs. The score tables
+    (total payoff and games of i against j) are updated in place.
+    """
+
+    def __init__(self, population=DEFAULT_POPULATION, payoffs=None, seed=None):
+        """
+        Args:
+            population: Agent specs, dicts with "type" ("classical",
+                "bayesian" or "ib"), optional "name" and hyperparameters
+                (alpha, epsilon; lower, upper, delta for ib)
+            payoffs: 2x2 payoff matrix, payoffs[my action, their action]
+                (default: the TwinPDEnv matrix)
+            seed: Random seed
+        """
+        self.payoffs = np.array([[3, 0], [5, 1]] if payoffs is None else payoffs, dtype=float)
+        if self.payoffs.shape != (2, 2):
+            raise ValueError("Twin PD payoffs must be a 2x2 matrix")
+        self.n_actions = 2
+        self.rng = np.random.default_rng(seed)
+        self.names = [spec.get("name", f"{spec['type']}_{i}") for i, spec in enumerate(population)]
+        n = len(population)
+        self.n_agents = n
+
+        def param(key, default):
+            return np.array([float(spec.get(key, default)) for spec in population])
+
+        self.types = np.array([AGENT_TYPES.index(spec["type"]) for spec in population])
+        self.alpha = param("alpha", 0.1)
+        self.epsilon = np.where(self.types == CLASSICAL, param("epsilon", 0.1), 0.0)
+        self.q = np.zeros((n, self.n_actions))
+        self.beta_successes = np.ones((n, self.n_actions))
+        self.beta_failures = np.ones((n, self.n_actions))
+
+        self.initial_lower = param("lower", 0.8)
+        self.initial_upper = param("upper", 0.99)
+        self.log_delta = np.log(2 / param("delta", 0.05))
+        self.lower = self.initial_lower.copy()
+        self.upper = self.initial_upper.copy()
+        self.successes = np.zeros(n)
+        self.trials = np.zeros(n)
+
+        # Worst-case values are affine in θ: hit if mirrored, miss otherwise
+        self._hit = self.payoffs[[0, 1], [0, 1]]
+        self._miss = self.payoffs[[0, 1], [1, 0]]
+
+        self.scores = np.zeros((n, n))
+        self.games = np.zeros((n, n), dtype=np.int64)
+        self.cooperations = np.zeros(n, dtype=np.int64)
+        self.rounds = 0
+        self._opponents = ~np.eye(n, dtype=bool)
+
+    def greedy_actions(self):
+        """(N,) greedy action of every agent."""
+        actions = np.argmax(self.q, axis=1)
+        ib = self.types == IB
+        if ib.any():
+            low = self.lower[ib, None] * self._hit + (1 - self.lower[ib, None]) * self._miss
+            high = self.upper[ib, None] * self._hit + (1 - self.upper[ib, None]) * self._miss
+            actions[ib] = np.argmax(np.minimum(low, high), axis=1)
+        return actions
+
+    def play_round(self):
+        """
+        Play every pairing once and update all agents.
+
+        Returns:
+            (N, N) payoffs of agent i against agent j (0 on the diagonal)
+        """
+        n = self.n_agents
+        greedy = self.greedy_actions()
+
+        # Actions of i against j: greedy, explored or Thompson-sampled per game
+        actions = np.broadcast_to(greedy[:, None], (n, n)).copy()
+        explore = self.rng.random((n, n)) < self.epsilon[:, None]
+        actions[explore] = self.rng.integers(0, self.n_actions, np.count_nonzero(explore))
+        bayesian = np.flatnonzero(self.types == BAYESIAN)
+        if len(bayesian):
+            samples = self.rng.beta(self.beta_successes[bayesian, None, :],
+                                    self.beta_failures[bayesian, None, :],
+                                    size=(len(bayesian), n, self.n_actions))
+            actions[bayesian] = np.argmax(samples, axis=2)
+
+        rewards = np.where(self._opponents, self.payoffs[actions, actions.T], 0.0)
+
+        # Score tables
+        self.scores += rewards
+        self.games += self._opponents
+        self.cooperations += np.count_nonzero((actions == 0) & self._opponents, axis=1)
+        self.rounds += 1
+
+        # Agent updates (Q for every agent, as the scalar agents do)
+        self.q = _sequential_q(self.q, self.alpha, actions, rewards, self._opponents)
+        if len(bayesian):
+            played = self._opponents[bayesian]
+            positive = rewards[bayesian] > 0
+            for action in range(self.n_actions):
+                taken = played & (actions[bayesian] == action)
+                self.beta_successes[bayesian, action] += np.count_nonzero(taken & positive, axis=1)
+                self.beta_failures[bayesian, action] += np.count_nonzero(taken & ~positive, axis=1)
+        ib = self.types == IB
+        if ib.any():
+            mirrored = (actions.T == greedy[:, None]) & self._opponents
+            self.successes[ib] += np.count_nonzero(mirrored[ib], axis=1)
+            self.trials[ib] += n - 1
+            epsilon = np.sqrt(self.log_delta[ib] / (2 * self.trials[ib]))
+            p_hat = self.successes[ib] / self.trials[ib]
+            self.lower[ib] = np.maximum(np.maximum(0.0, p_hat - epsilon), self.initial_lower[ib])
+            self.upper[ib] = np.minimum(np.minimum(1.0, p_hat + epsilon), self.initial_upper[ib])
+        return rewards
+
+    def run(self, rounds):
+        """
+        Play a number of rounds.
+
+        Returns:
+            (rounds, N) mean payoff per game of every agent in each round
+        """
+        history = np.empty((rounds, self.n_agents))
+        per_round = max(self.n_agents - 1, 1)
+        for r in range(rounds):
+            history[r] = self.play_round().sum(axis=1) / per_round
+        return history
+
+    def mean_scores(self):
+        """(N,) average payoff per game so far."""
+        return self.scores.sum(axis=1) / np.maximum(self.games.sum(axis=1), 1)
+
+    def standings(self):
+        """
+        Agents ranked by average payoff per game.
+
+        Returns:
+            List of (name, average payoff, cooperation rate), best first
+        """
+        means = self.mean_scores()
+        played = np.maximum(self.games.sum(axis=1), 1)
+        order = np.argsort(-means, kind="stable")
+        return [(self.names[i], float(means[i]), float(self.cooperations[i] / played[i]))
+                for i in order]
+
+
+def run_tournament(population=DEFAULT_POPULATION, rounds=200, payoffs=None, seed=42):
+    """
+    Run a round-robin Twin PD tournament.
+
+    Returns:
+        Tournament after `rounds` rounds (score tables, standings, agent state)
+    """
+    tournament = Tournament(population, payoffs=payoffs, seed=seed)
+    tournament.run(rounds)
+    return tournament
+
+
+def main():
+    """Run the default population and print the standings."""
+    tournament = run_tournament()
+    print(f"TWIN PD TOURNAMENT ({tournament.n_agents} agents, {tournament.rounds} rounds)")
+    for name, score, cooperation in tournament.standings():
+        print(f"  {name:14s}: {score:.3f} per game  cooperate {cooperation:.1%}")
+    return tournament
+
+
+if __name__ == "__main__":
+    main()
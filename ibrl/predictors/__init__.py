@@ -1,3 +1,18 @@
 from .logical_predictor import LogicalPredictor
+from .scheduled_predictor import (
+    ScheduledPredictor,
+    linear_drift,
+    random_walk_path,
+    regime_switching_path,
+)
+from .simulating_predictor import SimulatingPredictor, fingerprint
 
-__all__ = ["LogicalPredictor"]
+__all__ = [
+    "LogicalPredictor",
+    "ScheduledPredictor",
+    "linear_drift",
+    "random_walk_path",
+    "regime_switching_path",
+    "SimulatingPredictor",
+    "fingerprint",
+]
@@ -11,14 +11,16 @@ class LogicalPredictor:
     This creates policy-dependent transition dynamics.
     """
 
-    def __init__(self, theta, seed=None):
+    def __init__(self, theta, seed=None, noise_tape=None):
         """
         Args:
             theta: Prediction accuracy (probability of correct prediction)
             seed: Random seed
+            noise_tape: Optional NoiseTape replacing the RNG (common random numbers)
         """
         self.theta = theta
         self.rng = np.random.default_rng(seed)
+        self.noise_tape = noise_tape
 
     def predict(self, greedy_action):
         """
@@ -30,7 +32,8 @@ class LogicalPredictor:
         Returns:
             predicted_action: Prediction with accuracy θ
         """
-        if self.rng.random() < self.theta:
+        u = self.rng.random() if self.noise_tape is None else self.noise_tape.random()
+        if u < self.theta:
             # Correct prediction
             return greedy_action
         else:
@@ -0,0 +1,180 @@
+"""Predictor whose accuracy follows a precomputed schedule."""
+
+import numpy as np
+
+
+def linear_drift(start, end, length):
+    """
+    Accuracy path moving linearly from `start` to `end`.
+
+    Returns:
+        float32 array of length `length`
+    """
+    return np.linspace(start, end, length, dtype=np.float32)
+
+
+def random_walk_path(start, length, scale=0.001, low=0.5, high=1.0, seed=None):
+    """
+    Accuracy path following a Gaussian random walk reflected into [low, high].
+
+    Args:
+        start: Initial accuracy
+        length: Number of episodes
+        scale: Standard deviation of the per-episode step
+        low, high: Reflecting boundaries
+        seed: Random seed
+
+    Returns:
+        float32 array of length `length`
+    """
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, scale, length)
+    steps[0] = 0.0
+    path = start + np.cumsum(steps)
+    # Reflect into [low, high] with period 2·(high - low)
+    span = high - low
+    folded = np.mod(path - low, 2 * span)
+    return (low + np.where(folded > span, 2 * span - folded, folded)).astype(np.float32)
+
+
+def regime_switching_path(thetas, transition, length, initial=0, seed=None):
+    """
+    Accuracy path of a Markov regime-switching predictor.
+
+    Simulated one regime at a time (geometric sojourn, then a jump drawn
+    from the off-diagonal transition row), so cost scales with the
+    number of switches rather than the number of episodes.
+
+    Args:
+        thetas: Accuracy in each regime
+        transition: Row-stochastic regime transition matrix (per episode)
+        length: Number of episodes
+        initial: Starting regime
+        seed: Random seed
+
+    Returns:
+        (path, regimes): float32 accuracy path and uint8 regime index per episode
+    """
+    rng = np.random.default_rng(seed)
+    thetas = np.asarray(thetas, dtype=np.float32)
+    transition = np.asarray(transition, dtype=float)
+    if len(thetas) > 255:
+        raise ValueError("At most 255 regimes are supported")
+
+    states, durations = [], []
+    state, total = initial, 0
+    while total < length:
+        stay = transition[state, state]
+        duration = length if stay >= 1 else int(rng.geometric(1 - stay))
+        states.append(state)
+        durations.append(min(duration, length - total))
+        total += durations[-1]
+
+        jump = transition[state].copy()
+        jump[state] = 0.0
+        if jump.sum() > 0:
+            state = int(rng.choice(len(thetas), p=jump / jump.sum()))
+
+    regimes = np.repeat(np.array(states, dtype=np.uint8), durations)
+    return thetas[regimes], regimes
+
+
+class ScheduledPredictor:
+    """
+    Drop-in replacement for LogicalPredictor whose accuracy changes
+    every episode according to a precomputed path.
+
+    Correctness of upcoming predictions is decided in vectorized blocks
+    (one uniform draw and one comparison against the path per block),
+    so predict() is a list lookup and per-episode cost stays below
+    LogicalPredictor's. After the path ends the last accuracy is held.
+    """
+
+    def __init__(self, path, seed=None, noise_tape=None, block_size=4096):
+        """
+        Args:
+            path: Per-episode accuracy array (float32 is enough)
+            seed: Random seed
+            noise_tape: Optional NoiseTape replacing the RNG (common random numbers)
+            block_size: Episodes decided per block
+        """
+        self.path = np.asarray(path)
+        if self.path.ndim != 1 or len(self.path) == 0:
+            raise ValueError("path must be a non-empty 1D array")
+        self.rng = np.random.default_rng(seed)
+        self.noise_tape = noise_tape
+        self.block_size = block_size
+        self.t = 0
+        self._correct = []
+        self._pos = 0
+
+    @property
+    def theta(self):
+        """Accuracy used for the next prediction."""
+        return float(self.path[min(self.t, len(self.path) - 1)])
+
+    def _uniforms(self, n):
+        if self.noise_tape is None:
+            return self.rng.random(n)
+        tape = self.noise_tape
+        if n == 0 or tape.position + n > len(tape):
+            raise IndexError("Noise tape exhausted")
+        u = tape.uniforms[tape.position:tape.position + n]
+        tape.position += n
+        return u
+
+    def _refill(self):
+        # Decide the next block starting at the first undecided episode;
+        # on a tape, never read past its end (CRN tapes are episodes long)
+        start = self.t
+        n = self.block_size
+        if self.noise_tape is not None:
+            n = min(n, len(self.noise_tape) - self.noise_tape.position)
+        theta = self.path[start:start + n]
+        if len(theta) < n:
+            theta = np.concatenate([theta, np.full(n - len(theta), self.path[-1])])
+        self._correct = (self._uniforms(n) < theta).tolist()
+        self._pos = 0
+
+    def predict(self, greedy_action):
+        """
+        Predict agent's action with the current scheduled accuracy.
+
+        Args:
+            greedy_action: Agent's greedy action
+
+        Returns:
+            predicted_action: greedy_action if correct, else the other action
+        """
+        if self._pos >= len(self._correct):
+            self._refill()
+        correct = self._correct[self._pos]
+        self._pos += 1
+        self.t += 1
+        return greedy_action if correct else 1 - greedy_action
+
+    def correct_batch(self, n):
+        """
+        Decide correctness of the next n predictions.
+
+        Consumes the same stream as n calls to predict().
+
+        Returns:
+            Boolean array of length n
+        """
+        out = []
+        while n > 0:
+            if self._pos >= len(self._correct):
+                self._refill()
+            take = min(n, len(self._correct) - self._pos)
+            out.append(self._correct[self._pos:self._pos + take])
+            self._pos += take
+            self.t += take
+            n -= take
+        return np.concatenate(out).astype(bool) if out else np.zeros(0, dtype=bool)
+
+    def predict_batch(self, greedy_actions):
+        """Predict a sequence of greedy actions at consecutive episodes."""
+        greedy_actions = np.asarray(greedy_actions)
+        correct = self.correct_batch(len(greedy_actions))
+        return np.where(correct, greedy_actions, 1 - greedy_actions)
@@ -0,0 +1,142 @@
+"""Predictor that simulates the agent's decision procedure, memoized on agent state."""
+
+import copy
+from collections import OrderedDict
+
+import numpy as np
+from ibrl.belief import CredalInterval
+from .logical_predictor import LogicalPredictor
+
+
+def fingerprint(agent):
+    """
+    Cheap hashable summary of the agent state a greedy decision reads.
+
+    - IB agents act on their credal interval. For CredalInterval beliefs
+      (and the windowed variants) the interval is a function of the
+      integer counts and the belief's settings, so the key is the counts.
+      The same key then recurs across trials of one configuration. Other
+      beliefs are keyed on the raw bytes of their interval bounds, which
+      may be arrays (e.g. CredalRectangle).
+    - Q-learning agents act on argmax(q), which depends only on the rank
+      order of the Q-values. The key is the stable sort order plus which
+      neighbours in it are tied, so updates that keep the order hit the
+      cache.
+
+    RNG state and Beta parameters never enter a greedy decision and are
+    left out.
+
+    Returns:
+        Hashable tuple
+    """
+    name = type(agent).__name__
+    credal = getattr(agent, "credal", None)
+    if credal is not None:
+        decision = (name, agent.million, agent.small, agent.n_actions, type(credal).__name__)
+        if isinstance(credal, CredalInterval):
+            return decision + (credal.initial_lower, credal.initial_upper, credal.delta,
+                               credal.bound, credal.recovery, credal.successes,
+                               credal.trials, credal.misspecified)
+        bounds = credal.interval()
+        return decision + tuple(np.asarray(b, dtype=float).tobytes() for b in bounds)
+    q = getattr(agent, "q", None)
+    if q is None:
+        raise ValueError(f"Cannot fingerprint {name}: no credal belief or Q-values")
+    order = q.argsort(kind="stable")
+    ranked = q[order]
+    return ("q", order.tobytes(), (ranked[1:] == ranked[:-1]).tobytes())
+
+
+def _decision_copy(agent):
+    """
+    Copy of the agent sharing everything greedy_action only reads.
+
+    The Q-values are copied (and any argmax index dropped, so the copy
+    builds its own); the belief, RNG and Beta arrays are shared, since
+    greedy decisions do not modify them.
+    """
+    clone = copy.copy(agent)
+    if getattr(agent, "q", None) is not None:
+        clone.q = agent.q.copy()
+    if hasattr(agent, "_q_index"):
+        clone._q_index = None
+    return clone
+
+
+class SimulatingPredictor(LogicalPredictor):
+    """
+    Predictor that inspects the agent by running its decision procedure.
+
+    Instead of trusting the greedy action it is handed, the predictor
+    copies the state the agent decides on and calls greedy_action() on
+    the copy, so the simulation cannot change the real agent. Simulated
+    actions are memoized in a bounded LRU cache keyed on
+    fingerprint(agent), so a simulation only runs when decision-relevant
+    state changes. Predictors can share one cache (e.g. across trials
+    of one agent configuration), since keys include everything the
+    decision depends on. The prediction is then correct with accuracy
+    θ, drawing from the same stream as LogicalPredictor.
+    """
+
+    def __init__(self, theta, agent=None, seed=None, noise_tape=None, cache_size=256,
+                 cache=None):
+        """
+        Args:
+            theta: Prediction accuracy (probability of correct prediction)
+            agent: Agent to simulate (can also be set later with attach)
+            seed: Random seed
+            noise_tape: Optional NoiseTape replacing the RNG (common random numbers)
+            cache_size: Maximum number of memoized agent states
+            cache: Optional OrderedDict shared with other predictors
+        """
+        super().__init__(theta, seed=seed, noise_tape=noise_tape)
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        self.cache_size = cache_size
+        self.agent = None
+        self._cache = OrderedDict() if cache is None else cache
+        self.hits = 0
+        self.misses = 0
+        if agent is not None:
+            self.attach(agent)
+
+    def attach(self, agent):
+        """Simulate `agent` from now on."""
+        self.agent = agent
+
+    def simulate(self):
+        """
+        Greedy action of the attached agent, simulated on a copy of its decision state.
+
+        Returns:
+            The action the agent would take greedily in its current state
+        """
+        key = fingerprint(self.agent)
+        action = self._cache.get(key)
+        if action is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return action
+        self.misses += 1
+        action = int(_decision_copy(self.agent).greedy_action())
+        self._cache[key] = action
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return action
+
+    def predict(self, greedy_action=None):
+        """
+        Predict the agent's action by simulating it.
+
+        Args:
+            greedy_action: Used only when no agent is attached (as
+                LogicalPredictor)
+
+        Returns:
+            predicted_action: Simulated greedy action with accuracy θ
+        """
+        if self.agent is not None:
+            greedy_action = self.simulate()
+        elif greedy_action is None:
+            raise ValueError("No agent attached and no greedy action given")
+        return super().predict(greedy_action)
@@ -1,4 +1,43 @@
 from .seeding import set_seed
-from .plotting import plot_comparison
+from .plotting import plot_comparison, replot
+from .noise import (
+    NoiseTape,
+    make_noise_tapes,
+    sample_uniforms,
+    effective_variance_reduction,
+)
+from .snapshot import (
+    pool_to_arrays,
+    pool_from_arrays,
+    pool_to_bytes,
+    pool_from_bytes,
+)
+from .precision import PrecisionPolicy, get_precision
+from .results_io import (
+    save_results,
+    load_results,
+    aggregate_results,
+    save_aggregates,
+    load_aggregates,
+)
 
-__all__ = ["set_seed", "plot_comparison"]
+__all__ = [
+    "set_seed",
+    "plot_comparison",
+    "replot",
+    "NoiseTape",
+    "make_noise_tapes",
+    "sample_uniforms",
+    "effective_variance_reduction",
+    "pool_to_arrays",
+    "pool_from_arrays",
+    "pool_to_bytes",
+    "pool_from_bytes",
+    "PrecisionPolicy",
+    "get_precision",
+    "save_results",
+    "load_results",
+    "aggregate_results",
+    "save_aggregates",
+    "load_aggregates",
+]
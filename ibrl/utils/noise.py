@@ -0,0 +1,151 @@
+"""Pre-generated noise tapes for common-random-numbers experiments."""
+
+import numpy as np
+
+
+class NoiseTape:
+    """
+    Pre-generated stream of uniform draws.
+
+    Stands in for `rng.random()` inside environments and predictors.
+    Each component consumes exactly one uniform per episode, so feeding
+    the same tape to every agent gives them identical environment noise
+    regardless of how the agents themselves use randomness.
+    """
+
+    def __init__(self, uniforms):
+        """
+        Args:
+            uniforms: 1D array of uniforms on [0, 1)
+        """
+        self.uniforms = np.asarray(uniforms, dtype=float)
+        self.position = 0
+
+    @classmethod
+    def generate(cls, length, seed=None):
+        """Draw a tape of `length` uniforms in a single vectorized call."""
+        return cls(np.random.default_rng(seed).random(length))
+
+    def random(self):
+        """Return the next uniform on the tape."""
+        if self.position >= len(self.uniforms):
+            raise IndexError("Noise tape exhausted")
+        u = self.uniforms[self.position]
+        self.position += 1
+        return u
+
+    def rewind(self):
+        """Restart the tape from the first draw."""
+        self.position = 0
+
+    def __len__(self):
+        return len(self.uniforms)
+
+
+SAMPLING_METHODS = ("iid", "antithetic", "lhs")
+
+
+def sample_uniforms(n, k, method="iid", rng=None):
+    """
+    Draw an (n, k) block of uniforms with a variance-reduction design.
+
+    Rows are episodes and columns are the k trials of one design group.
+    Each row covers [0, 1) evenly across the group, so group means stay
+    unbiased while their variance drops. Every column is marginally
+    Uniform(0, 1), so each trial still sees the true environment:
+    - "iid": independent draws
+    - "antithetic": columns paired as u and 1 - u (k must be even)
+    - "lhs": Latin hypercube, strata randomly permuted per episode
+
+    Args:
+        n: Number of episodes
+        k: Number of trials in the design group
+        method: One of SAMPLING_METHODS
+        rng: numpy Generator
+
+    Returns:
+        Array of shape (n, k)
+    """
+    rng = np.random.default_rng() if rng is None else rng
+
+    if method == "iid":
+        return rng.random((n, k))
+    if method == "antithetic":
+        if k % 2 != 0:
+            raise ValueError("antithetic sampling needs an even group size")
+        u = rng.random((n, k // 2))
+        return np.concatenate([u, 1.0 - u], axis=1)
+    if method == "lhs":
+        strata = rng.permuted(np.tile(np.arange(k), (n, 1)), axis=1)
+        return (strata + rng.random((n, k))) / k
+
+    raise ValueError(f"Unknown sampling method: {method}")
+
+
+def make_noise_tapes(seed, episodes, sampling="iid", group_size=2):
+    """
+    Build the per-trial noise tapes shared by all agents.
+
+    Uses independent child streams of a single SeedSequence so the
+    predictor and environment draws are uncorrelated. For non-iid
+    sampling, trials are grouped into designs of `group_size`: trial
+    `seed` takes column `seed % group_size` of its group's design, which
+    every worker can rebuild on its own.
+
+    Args:
+        seed: Trial seed (also the trial index within a design)
+        episodes: Tape length (one draw per episode)
+        sampling: One of SAMPLING_METHODS
+        group_size: Trials per design group (ignored for iid)
+
+    Returns:
+        Dict with "predictor" and "env" NoiseTapes
+    """
+    if sampling == "iid":
+        predictor_seq, env_seq = np.random.SeedSequence(seed).spawn(2)
+        return {
+            "predictor": NoiseTape.generate(episodes, predictor_seq),
+            "env": NoiseTape.generate(episodes, env_seq),
+        }
+
+    if sampling == "antithetic":
+        group_size = 2
+    group, column = divmod(seed, group_size)
+    streams = np.random.SeedSequence([group, group_size]).spawn(2)
+    tapes = {}
+    for name, seq in zip(("predictor", "env"), streams):
+        design = sample_uniforms(episodes, group_size, sampling, np.random.default_rng(seq))
+        tapes[name] = NoiseTape(design[:, column])
+    return tapes
+
+
+def effective_variance_reduction(values, group_size):
+    """
+    Estimate the variance reduction of a grouped sampling design.
+
+    Compares the variance an iid design would give for the mean
+    (pooled per-trial variance / n) against the design-aware variance
+    estimated from independent group means. Trailing trials that do
+    not fill a group are ignored.
+
+    Args:
+        values: Per-trial statistics, ordered by trial index
+        group_size: Trials per design group
+
+    Returns:
+        Variance reduction factor (> 1 means the design helps),
+        or nan if fewer than two complete groups
+    """
+    values = np.asarray(values, dtype=float)
+    n_groups = len(values) // group_size
+    if n_groups < 2:
+        return np.nan
+
+    values = values[:n_groups * group_size]
+    iid_var = np.var(values, ddof=1) / len(values)
+    group_means = values.reshape(n_groups, group_size).mean(axis=1)
+    design_var = np.var(group_means, ddof=1) / n_groups
+
+    if design_var == 0:
+        return np.inf if iid_var > 0 else 1.0
+    return iid_var / design_var
@@ -1,131 +1,376 @@
 """Plotting utilities for experiments."""
 
+import argparse
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+from ibrl.utils.results_io import aggregate_results, load_aggregates
 
-def plot_comparison(results, save_path="ibrl_comparison.png"):
+AGENT_TYPES = ["classical", "bayesian", "ib"]
+ENV_TYPES = ["bandit", "newcomb", "twin_pd", "misspecified", "wasserstein"]
+ENV_NAMES = {
+    "bandit": "Bandit",
+    "newcomb": "Newcomb",
+    "twin_pd": "Twin PD",
+    "misspecified": "Misspecified",
+    "wasserstein": "Wasserstein"
+}
+COLORS = {"classical": "blue", "bayesian": "green", "ib": "red"}
+
+# Panels of the comparison figure, in layout order (3 rows x 4 columns):
+# rewards for all 5 environments, convergence for all 5, credal width
+PANELS = ([f"reward/{env}" for env in ENV_TYPES]
+          + [f"convergence/{env}" for env in ENV_TYPES]
+          + ["credal_width"])
+
+FORMATS = ("png", "svg", "pdf")
+
+
+def moving_average(values, window):
+    """Trailing moving average ("valid" mode), O(n) in the series length."""
+    values = np.asarray(values, dtype=float)
+    if len(values) < window:
+        return np.zeros(0)
+    cumulative = np.cumsum(np.concatenate([[0.0], values]))
+    return (cumulative[window:] - cumulative[:-window]) / window
+
+
+class SeriesCache:
     """
-    Plot comparison of all agents across environments.
-    
-    Args:
-        results: Results dictionary from compare_all
-        save_path: Path to save figure
+    On-disk cache of the series drawn by each panel.
+
+    Series are keyed by name in one .npz file per (source file, window);
+    the source is identified by path, size and modification time, so
+    rewriting the results file invalidates its entries.
     """
-    # 5 environments (rewards) + 5 convergence plots + 1 credal width = 11 subplots
-    # Layout: 3 rows x 4 columns
-    fig, axes = plt.subplots(3, 4, figsize=(20, 15))
-    
-    agent_types = ["classical", "bayesian", "ib"]
-    colors = {"classical": "blue", "bayesian": "green", "ib": "red"}
-    
-    env_types = ["bandit", "newcomb", "twin_pd", "misspecified", "wasserstein"]
-    env_names = {
-        "bandit": "Bandit",
-        "newcomb": "Newcomb",
-        "twin_pd": "Twin PD",
-        "misspecified": "Misspecified",
-        "wasserstein": "Wasserstein"
-    }
-    
-    # Row 1: Reward plots for all 5 environments
-    reward_positions = [(0, 0), (0, 1), (0, 2), (0, 3), (1, 0)]
-    
-    for idx, env_type in enumerate(env_types):
-        row, col = reward_positions[idx]
-        ax = axes[row, col]
-        
-        for agent_type in agent_types:
-            all_rewards = [r["rewards"] for r in results[env_type][agent_type]]
-            mean_rewards = np.mean(all_rewards, axis=0)
-            std_rewards = np.std(all_rewards, axis=0)
-            
-            # Moving average
-            window = 50
-            if len(mean_rewards) >= window:
-                smoothed = np.convolve(mean_rewards, np.ones(window)/window, mode='valid')
-                x = np.arange(len(smoothed))
-                
-                ax.plot(x, smoothed, label=agent_type.capitalize(), 
-                       color=colors[agent_type], linewidth=2)
-                ax.fill_between(x, smoothed - std_rewards[:len(smoothed)], 
-                               smoothed + std_rewards[:len(smoothed)], 
-                               alpha=0.2, color=colors[agent_type])
-        
-        ax.set_xlabel("Episode", fontsize=9)
-        ax.set_ylabel("Reward" if env_type == "bandit" else "Reward ($)", fontsize=9)
-        ax.set_title(f"{env_names[env_type]} Environment", fontsize=11, fontweight='bold')
-        ax.legend(fontsize=8)
-        ax.grid(alpha=0.3)
-    
-    # Row 2-3: Convergence plots for all 5 environments
-    convergence_positions = [(1, 1), (1, 2), (1, 3), (2, 0), (2, 1)]
-    
-    for idx, env_type in enumerate(env_types):
-        row, col = convergence_positions[idx]
-        ax = axes[row, col]
-        
-        if env_type == "bandit":
+
+    def __init__(self, directory, source, window):
+        """
+        Args:
+            directory: Cache directory (created on first write)
+            source: Results or aggregates file the series derive from
+            window: Smoothing window
+        """
+        stat = os.stat(source)
+        key = f"{os.path.abspath(source)}:{stat.st_size}:{stat.st_mtime_ns}"
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        self.path = os.path.join(directory, f"{digest}-w{window}.npz")
+        self._series = {}
+        self._dirty = False
+        if os.path.exists(self.path):
+            with np.load(self.path, allow_pickle=False) as archive:
+                self._series = {name: archive[name] for name in archive.files}
+
+    def get(self, name):
+        """Cached series or None."""
+        return self._series.get(name)
+
+    def put(self, name, values):
+        """Store a series (written on flush)."""
+        self._series[name] = np.asarray(values)
+        self._dirty = True
+
+    def flush(self):
+        """Write new entries to disk."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        np.savez(self.path, **self._series)
+        self._dirty = False
+
+
+def _panel_series(panel):
+    """(name, cell, compute) for every series a panel draws."""
+    kind, _, env_type = panel.partition("/")
+    if kind == "credal_width":
+        # Use Newcomb IB results for credal width
+        return [
+            ("newcomb/ib/width_mean", ("newcomb", "ib"),
+             lambda stats, window: stats.get("width_mean", np.zeros(0))),
+            ("newcomb/ib/width_std", ("newcomb", "ib"),
+             lambda stats, window: stats.get("width_std", np.zeros(0))),
+        ]
+
+    series = []
+    for agent_type in AGENT_TYPES:
+        cell = (env_type, agent_type)
+        prefix = f"{env_type}/{agent_type}"
+        if kind == "reward":
+            series.append((f"{prefix}/reward_smooth", cell,
+                           lambda stats, window: moving_average(stats["reward_mean"], window)))
+            series.append((f"{prefix}/reward_std", cell,
+                           lambda stats, window: stats["reward_std"][:max(
+                               len(stats["reward_mean"]) - window + 1, 0)]))
+        elif env_type == "bandit":
             # For bandit, show cumulative reward
-            for agent_type in agent_types:
-                all_rewards = [r["rewards"] for r in results[env_type][agent_type]]
-                mean_rewards = np.mean(all_rewards, axis=0)
-                cumulative = np.cumsum(mean_rewards)
-                
-                ax.plot(cumulative, label=agent_type.capitalize(), 
-                       color=colors[agent_type], linewidth=2)
-            
-            ax.set_ylabel("Cumulative Reward", fontsize=9)
-            ax.set_title("Cumulative Performance", fontsize=10)
+            series.append((f"{prefix}/cumulative", cell,
+                           lambda stats, window: np.cumsum(stats["reward_mean"])))
         else:
-            # For policy-dependent envs, show one-boxing rate
-            for agent_type in agent_types:
-                all_actions = [r["actions"] for r in results[env_type][agent_type]]
-                mean_actions = np.mean(all_actions, axis=0)
-                
-                window = 50
-                if len(mean_actions) >= window:
-                    smoothed = np.convolve(mean_actions, np.ones(window)/window, mode='valid')
-                    x = np.arange(len(smoothed))
-                    
-                    # Plot one-boxing rate (1 - action, since 0=one-box, 1=two-box)
-                    ax.plot(x, 1 - smoothed, label=agent_type.capitalize(), 
-                           color=colors[agent_type], linewidth=2)
-            
-            ax.set_ylabel("One-Boxing Rate", fontsize=9)
-            ax.set_title(f"Policy Convergence ({env_names[env_type]})", fontsize=10)
-            ax.set_ylim([-0.05, 1.05])
-        
-        ax.set_xlabel("Episode", fontsize=9)
-        ax.legend(fontsize=8)
-        ax.grid(alpha=0.3)
-    
-    # Credal interval convergence (bottom right)
-    ax = axes[2, 2]
-    
-    # Use Newcomb IB results for credal width
-    ib_results = results["newcomb"]["ib"]
-    all_widths = [r["credal_widths"] for r in ib_results if r["credal_widths"] is not None]
-    
-    if all_widths:
-        mean_widths = np.mean(all_widths, axis=0)
-        std_widths = np.std(all_widths, axis=0)
-        x = np.arange(len(mean_widths))
-        
-        ax.plot(x, mean_widths, color="red", linewidth=2, label="IB Agent")
-        ax.fill_between(x, mean_widths - std_widths, mean_widths + std_widths, 
-                        alpha=0.3, color="red")
-    
-    ax.set_xlabel("Episode", fontsize=9)
-    ax.set_ylabel("Interval Width", fontsize=9)
-    ax.set_title("Credal Interval Convergence (IB Agent)", fontsize=10, fontweight='bold')
+            # One-boxing rate (1 - action, since 0=one-box, 1=two-box)
+            series.append((f"{prefix}/onebox_smooth", cell,
+                           lambda stats, window: 1 - moving_average(stats["action_mean"], window)
+                           if "action_mean" in stats else np.zeros(0)))
+    return series
+
+
+def compute_series(panels, window=50, aggregates=None, source=None, cache=None):
+    """
+    Series drawn by the requested panels.
+
+    Cached series are reused; only cells with missing series are read
+    from `source` (or taken from in-memory `aggregates`).
+
+    Args:
+        panels: Panel names (see PANELS)
+        window: Smoothing window
+        aggregates: In-memory aggregates (aggregate_results layout)
+        source: Results or aggregates file, used when aggregates is None
+        cache: Optional SeriesCache
+
+    Returns:
+        Dict of series name -> array (absent cells give empty arrays)
+    """
+    wanted = [item for panel in panels for item in _panel_series(panel)]
+    series = {}
+    missing = []
+    for name, cell, compute in wanted:
+        cached = cache.get(name) if cache is not None else None
+        if cached is not None:
+            series[name] = cached
+        else:
+            missing.append((name, cell, compute))
+
+    if missing:
+        if aggregates is None:
+            aggregates = load_aggregates(source, cells={cell for _, cell, _ in missing})
+        for name, (env_type, agent_type), compute in missing:
+            stats = aggregates.get(env_type, {}).get(agent_type)
+            values = compute(stats, window) if stats is not None else np.zeros(0)
+            series[name] = values
+            if cache is not None:
+                cache.put(name, values)
+        if cache is not None:
+            cache.flush()
+    return series
+
+
+def _decimate(values, max_points):
+    """Every k-th point so at most max_points are drawn; returns (x, values)."""
+    step = max(1, -(-len(values) // max_points)) if max_points else 1
+    return np.arange(0, len(values), step), values[::step]
+
+
+def panel_spec(panel, series, colors=None, max_points=4000):
+    """
+    Everything needed to draw a panel, as plain data (picklable).
+
+    Args:
+        panel: Panel name
+        series: compute_series output
+        colors: Agent colors (default COLORS)
+        max_points: Points drawn per line (None draws all)
+
+    Returns:
+        Dict with lines (x, y, label, color, band, alpha) and axis settings
+    """
+    colors = dict(COLORS, **(colors or {}))
+    kind, _, env_type = panel.partition("/")
+    spec = {"lines": [], "xlabel": "Episode", "ylim": None, "title_weight": "normal"}
+
+    if kind == "credal_width":
+        mean = series["newcomb/ib/width_mean"]
+        if len(mean):
+            x, y = _decimate(mean, max_points)
+            std = series["newcomb/ib/width_std"][x]
+            spec["lines"].append({"x": x, "y": y, "label": "IB Agent", "color": colors["ib"],
+                                  "band": (y - std, y + std), "alpha": 0.3})
+        spec.update(ylabel="Interval Width", title="Credal Interval Convergence (IB Agent)",
+                    title_size=10, title_weight="bold")
+        return spec
+
+    for agent_type in AGENT_TYPES:
+        prefix = f"{env_type}/{agent_type}"
+        if kind == "reward":
+            smoothed = series[f"{prefix}/reward_smooth"]
+            if not len(smoothed):
+                continue
+            x, y = _decimate(smoothed, max_points)
+            std = series[f"{prefix}/reward_std"][x]
+            band = (y - std, y + std)
+        else:
+            name = f"{prefix}/cumulative" if env_type == "bandit" else f"{prefix}/onebox_smooth"
+            if not len(series[name]):
+                continue
+            x, y = _decimate(series[name], max_points)
+            band = None
+        spec["lines"].append({"x": x, "y": y, "label": agent_type.capitalize(),
+                              "color": colors[agent_type], "band": band, "alpha": 0.2})
+
+    if kind == "reward":
+        spec.update(ylabel="Reward" if env_type == "bandit" else "Reward ($)",
+                    title=f"{ENV_NAMES[env_type]} Environment", title_size=11,
+                    title_weight="bold")
+    elif env_type == "bandit":
+        spec.update(ylabel="Cumulative Reward", title="Cumulative Performance", title_size=10)
+    else:
+        spec.update(ylabel="One-Boxing Rate",
+                    title=f"Policy Convergence ({ENV_NAMES[env_type]})", title_size=10,
+                    ylim=[-0.05, 1.05])
+    return spec
+
+
+def _draw_panel(ax, spec):
+    for line in spec["lines"]:
+        ax.plot(line["x"], line["y"], label=line["label"], color=line["color"], linewidth=2)
+        if line["band"] is not None:
+            ax.fill_between(line["x"], *line["band"], alpha=line["alpha"], color=line["color"])
+
+    ax.set_xlabel(spec["xlabel"], fontsize=9)
+    ax.set_ylabel(spec["ylabel"], fontsize=9)
+    ax.set_title(spec["title"], fontsize=spec["title_size"], fontweight=spec["title_weight"])
+    if spec["ylim"] is not None:
+        ax.set_ylim(spec["ylim"])
     ax.legend(fontsize=8)
     ax.grid(alpha=0.3)
-    
-    # Hide unused subplot
-    axes[2, 3].axis('off')
-    
+
+
+def render_figure(specs, path, dpi=300):
+    """
+    Draw panel specs on a grid (up to 4 columns) and save the figure.
+
+    The format follows the file extension (png, svg, pdf).
+    """
+    ncols = min(len(specs), 4)
+    nrows = -(-len(specs) // ncols)
+    fig, axes = plt.subplots(nrows, ncols, figsize=(5 * ncols, 5 * nrows), squeeze=False)
+    for ax, spec in zip(axes.flat, specs):
+        _draw_panel(ax, spec)
+
+    # Hide unused subplots
+    for ax in axes.flat[len(specs):]:
+        ax.axis('off')
+
     plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+
+def _render_job(args):
+    return render_figure(*args)
+
+
+def _output_paths(save_path, formats):
+    stem, ext = os.path.splitext(save_path)
+    if formats is None:
+        formats = [ext.lstrip(".").lower() or "png"]
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt} (use one of {FORMATS})")
+    return stem, formats
+
+
+def replot(source, save_path="ibrl_comparison.png", panels=None, window=50, formats=None,
+           jobs=1, split=False, colors=None, dpi=300, max_points=4000, cache_dir=None,
+           aggregates=None):
+    """
+    Rebuild the comparison figure from stored results without re-simulation.
+
+    Only the requested panels are computed, smoothed series are cached
+    next to the source, and figures (one per format, or one per panel
+    and format with `split`) can be rendered in parallel processes.
+
+    Args:
+        source: File written by save_results or save_aggregates
+            (None when passing `aggregates`)
+        save_path: Output path; its stem is reused for every format
+        panels: Panel names to draw (None draws all; see PANELS)
+        window: Moving-average window
+        formats: Output formats among "png", "svg", "pdf" (None uses the
+            extension of save_path)
+        jobs: Worker processes for rendering (1 renders in-process)
+        split: Write each panel to its own file ("<stem>_<panel>.<fmt>")
+        colors: Agent color overrides, e.g. {"ib": "purple"}
+        dpi: Resolution of raster output
+        max_points: Points drawn per line (longer series are decimated)
+        cache_dir: Smoothed-series cache directory (default: .ibrl_plot_cache
+            next to the source); False disables caching
+        aggregates: In-memory aggregates instead of a source file
+
+    Returns:
+        List of written paths
+    """
+    panels = list(PANELS if panels is None else panels)
+    for panel in panels:
+        if panel not in PANELS:
+            raise ValueError(f"Unknown panel: {panel} (available: {', '.join(PANELS)})")
+
+    cache = None
+    if source is not None and cache_dir is not False:
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(source)), ".ibrl_plot_cache")
+        cache = SeriesCache(cache_dir, source, window)
+
+    series = compute_series(panels, window, aggregates, source, cache)
+    specs = {panel: panel_spec(panel, series, colors, max_points) for panel in panels}
+
+    stem, formats = _output_paths(save_path, formats)
+    jobs_args = []
+    for fmt in formats:
+        if split:
+            for panel in panels:
+                jobs_args.append(([specs[panel]], f"{stem}_{panel.replace('/', '_')}.{fmt}", dpi))
+        else:
+            jobs_args.append(([specs[panel] for panel in panels], f"{stem}.{fmt}", dpi))
+
+    if jobs > 1 and len(jobs_args) > 1:
+        with ProcessPoolExecutor(min(jobs, len(jobs_args))) as executor:
+            return list(executor.map(_render_job, jobs_args))
+    return [_render_job(args) for args in jobs_args]
+
+
+def plot_comparison(results, save_path="ibrl_comparison.png"):
+    """
+    Plot comparison of all agents across environments.
+
+    Args:
+        results: Results dictionary from compare_all
+        save_path: Path to save figure
+    """
+    replot(None, save_path, aggregates=aggregate_results(results), max_points=None)
     print(f"✓ Plot saved to {save_path}")
-    plt.close()
+
+
+def main(argv=None):
+    """Command-line entry point: python -m ibrl.utils.plotting RESULTS."""
+    parser = argparse.ArgumentParser(
+        prog="python -m ibrl.utils.plotting",
+        description="Re-plot the comparison figure from a stored results or aggregates file.")
+    parser.add_argument("source", help="File written by save_results / save_aggregates")
+    parser.add_argument("-o", "--output", default="ibrl_comparison.png", help="Output path")
+    parser.add_argument("--panels", nargs="+", choices=PANELS, help="Panels to draw")
+    parser.add_argument("--window", type=int, default=50, help="Moving-average window")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, help="Output formats")
+    parser.add_argument("--jobs", type=int, default=1, help="Rendering processes")
+    parser.add_argument("--split", action="store_true", help="One file per panel")
+    parser.add_argument("--color", nargs="+", default=[], metavar="AGENT=COLOR",
+                        help="Agent color overrides")
+    parser.add_argument("--dpi", type=int, default=300, help="Raster resolution")
+    parser.add_argument("--no-cache", action="store_true", help="Do not cache smoothed series")
+    args = parser.parse_args(argv)
+
+    colors = dict(item.split("=", 1) for item in args.color)
+    paths = replot(args.source, args.output, args.panels, args.window, args.formats,
+                   args.jobs, args.split, colors, args.dpi,
+                   cache_dir=False if args.no_cache else None)
+    for path in paths:
+        print(f"✓ Plot saved to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
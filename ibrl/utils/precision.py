@@ -0,0 +1,78 @@
+"""Numeric precision policies for agent state and trajectories.
+
+Two presets are provided:
+
+- "double" (default): float64 state and rewards, int64 actions. Matches
+  the original behaviour bit for bit.
+- "compact": float32 Q-values, Beta parameters, belief arrays, rewards
+  and credal widths; int8 actions. Cuts trajectory memory and
+  pickle/IPC volume by 2x (floats) to 8x (actions).
+
+Snapshots record the preset in their header (ibrl.utils.snapshot), so a
+restored compact agent keeps its float32 state.
+
+Numerical tolerances of the compact policy:
+
+- Rewards are exact for integers up to 2**24 (16,777,216), which covers
+  all Newcomb payoffs; other rewards carry relative error <= 6e-8.
+- Q-values carry relative rounding error ~6e-8 per update; with learning
+  rate alpha the accumulated error stays below ~1e-6 relative. Greedy
+  actions can differ from float64 only when two Q-values are within
+  that tolerance, so classical/Bayesian trajectories may diverge after
+  an exact tie. IB decisions use float64 credal bounds and are unchanged.
+- Beta parameters and credal counts are exact up to 2**24 observations.
+- Credal widths carry relative error <= 6e-8.
+- int8 actions require n_actions <= 127.
+"""
+
+import numpy as np
+
+
+class PrecisionPolicy:
+    """
+    Storage dtypes for agent state and recorded trajectories.
+    """
+
+    def __init__(self, name, float_dtype=np.float64, action_dtype=np.int64):
+        """
+        Args:
+            name: Policy name
+            float_dtype: dtype for Q-values, belief arrays, rewards and widths
+            action_dtype: dtype for recorded actions
+        """
+        self.name = name
+        self.float_dtype = np.dtype(float_dtype)
+        self.action_dtype = np.dtype(action_dtype)
+
+    def floats(self, values):
+        """Convert values to the policy's float dtype."""
+        return np.asarray(values, dtype=self.float_dtype)
+
+    def actions(self, values):
+        """Convert recorded actions to the policy's action dtype."""
+        values = np.asarray(values)
+        if values.size and values.max() > np.iinfo(self.action_dtype).max:
+            raise ValueError(f"Actions do not fit in {self.action_dtype}")
+        return values.astype(self.action_dtype)
+
+
+PRECISIONS = {
+    "double": PrecisionPolicy("double"),
+    "compact": PrecisionPolicy("compact", np.float32, np.int8),
+}
+
+
+def get_precision(precision=None):
+    """
+    Resolve a precision argument to a PrecisionPolicy.
+
+    Args:
+        precision: None (double), a preset name, or a PrecisionPolicy
+    """
+    if precision is None:
+        return PRECISIONS["double"]
+    if isinstance(precision, PrecisionPolicy):
+        return precision
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision}")
+    return PRECISIONS[precision]
@@ -0,0 +1,178 @@
+"""Persist compare_all results and per-cell aggregates as .npz archives (no pickle)."""
+
+import numpy as np
+
+RESULTS_FORMAT = "ibrl-results"
+AGGREGATES_FORMAT = "ibrl-aggregates"
+FORMAT_VERSION = 1
+
+TRAJECTORIES = ("rewards", "credal_widths", "actions")
+
+
+def _stack(trajectories):
+    """Stack per-trial arrays, NaN-padding ragged trials; returns (matrix, lengths or None)."""
+    lengths = np.array([len(t) for t in trajectories], dtype=np.int64)
+    if len(set(lengths.tolist())) <= 1:
+        return np.array(trajectories), None
+    dtype = np.result_type(np.float32, *[np.asarray(t).dtype for t in trajectories])
+    matrix = np.full((len(trajectories), lengths.max()), np.nan, dtype=dtype)
+    for row, trajectory in zip(matrix, trajectories):
+        row[:len(trajectory)] = trajectory
+    return matrix, lengths
+
+
+def save_results(results, path):
+    """
+    Write compare_all results to an .npz archive.
+
+    Each (env, agent) cell is stored as one (trials, episodes) array per
+    trajectory under "env/agent/metric", so a reader can load single
+    cells without touching the rest of the file.
+
+    Args:
+        results: compare_all results ({env: {agent: [trial dicts]}})
+        path: Output path (".npz" is appended by numpy if missing)
+    """
+    arrays = {"format": np.array(RESULTS_FORMAT), "version": np.array(FORMAT_VERSION)}
+    for env_type, cells in results.items():
+        for agent_type, cell in cells.items():
+            prefix = f"{env_type}/{agent_type}"
+            for metric in TRAJECTORIES:
+                if not cell or cell[0][metric] is None:
+                    continue
+                matrix, lengths = _stack([trial[metric] for trial in cell])
+                arrays[f"{prefix}/{metric}"] = matrix
+                if lengths is not None:
+                    arrays[f"{prefix}/{metric}/lengths"] = lengths
+            arrays[f"{prefix}/stop_episode"] = np.array(
+                [-1 if trial["stop_episode"] is None else trial["stop_episode"] for trial in cell],
+                dtype=np.int64)
+    np.savez(path, **arrays)
+
+
+def _check_format(archive, expected):
+    kind = str(archive["format"]) if "format" in archive.files else None
+    if kind not in expected:
+        raise ValueError(f"Not an IBRL results or aggregates file (format {kind!r})")
+    if int(archive["version"]) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported results file version: {int(archive['version'])}")
+    return kind
+
+
+def _cells(archive):
+    """(env, agent) pairs in file order."""
+    cells = []
+    for key in archive.files:
+        parts = key.split("/")
+        if len(parts) >= 3 and (parts[0], parts[1]) not in cells:
+            cells.append((parts[0], parts[1]))
+    return cells
+
+
+def load_results(path):
+    """
+    Read results written by save_results.
+
+    Returns:
+        compare_all results ({env: {agent: [trial dicts]}})
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        _check_format(archive, (RESULTS_FORMAT,))
+        results = {}
+        for env_type, agent_type in _cells(archive):
+            prefix = f"{env_type}/{agent_type}"
+            stops = archive[f"{prefix}/stop_episode"]
+            trials = [{"stop_episode": None if s < 0 else int(s)} for s in stops]
+            for metric in TRAJECTORIES:
+                key = f"{prefix}/{metric}"
+                if key not in archive.files:
+                    for trial in trials:
+                        trial[metric] = None
+                    continue
+                matrix = archive[key]
+                lengths = archive[f"{key}/lengths"] if f"{key}/lengths" in archive.files else None
+                for i, trial in enumerate(trials):
+                    trial[metric] = matrix[i] if lengths is None else matrix[i, :lengths[i]]
+            results.setdefault(env_type, {})[agent_type] = trials
+    return results
+
+
+def _mean_std(matrix):
+    if np.issubdtype(matrix.dtype, np.floating) and np.isnan(matrix).any():
+        return np.nanmean(matrix, axis=0), np.nanstd(matrix, axis=0)
+    return np.mean(matrix, axis=0), np.std(matrix, axis=0)
+
+
+def _cell_aggregates(rewards, actions, widths):
+    """Aggregates of one cell from (trials, episodes) matrices (None if absent)."""
+    reward_mean, reward_std = _mean_std(rewards)
+    aggregates = {"n_trials": np.array(len(rewards)),
+                  "reward_mean": reward_mean, "reward_std": reward_std}
+    if actions is not None:
+        aggregates["action_mean"] = _mean_std(actions.astype(float))[0]
+    if widths is not None and widths.size:
+        aggregates["width_mean"], aggregates["width_std"] = _mean_std(widths)
+    return aggregates
+
+
+def aggregate_results(results):
+    """
+    Reduce results to the per-episode statistics the comparison plot uses.
+
+    Returns:
+        {env: {agent: {"n_trials", "reward_mean", "reward_std",
+        "action_mean" (if actions), "width_mean"/"width_std" (if widths)}}}
+    """
+    aggregates = {}
+    for env_type, cells in results.items():
+        for agent_type, cell in cells.items():
+            stacked = {}
+            for metric in TRAJECTORIES:
+                if cell and cell[0][metric] is not None:
+                    stacked[metric] = _stack([trial[metric] for trial in cell])[0]
+            aggregates.setdefault(env_type, {})[agent_type] = _cell_aggregates(
+                stacked["rewards"], stacked.get("actions"), stacked.get("credal_widths"))
+    return aggregates
+
+
+def save_aggregates(aggregates, path):
+    """Write aggregate_results output to an .npz archive."""
+    arrays = {"format": np.array(AGGREGATES_FORMAT), "version": np.array(FORMAT_VERSION)}
+    for env_type, cells in aggregates.items():
+        for agent_type, stats in cells.items():
+            for name, values in stats.items():
+                arrays[f"{env_type}/{agent_type}/{name}"] = values
+    np.savez(path, **arrays)
+
+
+def load_aggregates(path, cells=None):
+    """
+    Read aggregates from an aggregates file or compute them from a results file.
+
+    Only the requested cells are read; archive members are loaded lazily,
+    so plotting a few panels does not load every trajectory.
+
+    Args:
+        path: File written by save_aggregates or save_results
+        cells: Optional iterable of (env, agent) pairs to load (None loads all)
+
+    Returns:
+        Aggregates in the aggregate_results layout
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        kind = _check_format(archive, (RESULTS_FORMAT, AGGREGATES_FORMAT))
+        wanted = _cells(archive) if cells is None else [c for c in _cells(archive) if c in cells]
+        aggregates = {}
+        for env_type, agent_type in wanted:
+            prefix = f"{env_type}/{agent_type}"
+            if kind == AGGREGATES_FORMAT:
+                stats = {key[len(prefix) + 1:]: archive[key] for key in archive.files
+                         if key.startswith(prefix + "/")}
+            else:
+                def matrix(metric):
+                    key = f"{prefix}/{metric}"
+                    return archive[key] if key in archive.files else None
+                stats = _cell_aggregates(matrix("rewards"), matrix("actions"),
+                                         matrix("credal_widths"))
+            aggregates.setdefault(env_type, {})[agent_type] = stats
+    return aggregates
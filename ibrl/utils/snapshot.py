@@ -0,0 +1,384 @@
+"""Compact binary snapshots for agents, beliefs and agent pools."""
+
+import io
+import struct
+
+import numpy as np
+from ibrl.utils.precision import get_precision
+
+MAGIC = b"IBRL"
+SNAPSHOT_VERSION = 2
+
+# Snapshot kind codes (stable across versions)
+KIND_CREDAL_INTERVAL = 1
+KIND_CREDAL_RECTANGLE = 2
+KIND_WASSERSTEIN_BALL = 3
+KIND_WINDOWED_INTERVAL = 4
+KIND_DISCOUNTED_INTERVAL = 5
+KIND_INFRADISTRIBUTION = 6
+KIND_CLASSICAL_Q = 16
+KIND_BAYESIAN_Q = 17
+KIND_IB_Q = 18
+
+# Storage precision codes (version 2 headers; version 1 snapshots are double)
+PRECISION_CODES = ("double", "compact")
+
+_HEADER = struct.Struct("<4sBBB")
+_HEADER_V1 = struct.Struct("<4sBB")
+_RNG = struct.Struct("<16s16sII")
+_MASK64 = (1 << 64) - 1
+
+
+def _precision_code(dtype):
+    if dtype is None:
+        return 0
+    for code, name in enumerate(PRECISION_CODES):
+        if get_precision(name).float_dtype == np.dtype(dtype):
+            return code
+    raise ValueError(f"No snapshot precision stores {np.dtype(dtype)} state")
+
+
+def pack_header(kind, dtype=None):
+    """
+    Return the magic/version/kind/precision header for a snapshot.
+
+    Args:
+        kind: Snapshot kind code
+        dtype: Float dtype of the object's state (None for float64), stored
+            as the matching precision preset
+    """
+    return _HEADER.pack(MAGIC, SNAPSHOT_VERSION, kind, _precision_code(dtype))
+
+
+def _read_header(data):
+    if len(data) < _HEADER_V1.size:
+        raise ValueError("Snapshot too short")
+    magic, version, kind = _HEADER_V1.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not an IBRL snapshot")
+    if version == 1:
+        return kind, 0, _HEADER_V1.size
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    if len(data) < _HEADER.size:
+        raise ValueError("Snapshot too short")
+    code = _HEADER.unpack_from(data, 0)[3]
+    if code >= len(PRECISION_CODES):
+        raise ValueError(f"Unknown snapshot precision code: {code}")
+    return kind, code, _HEADER.size
+
+
+def unpack_header(data, kind=None):
+    """
+    Validate a snapshot header.
+
+    Args:
+        data: Snapshot bytes
+        kind: Expected kind code (None accepts any)
+
+    Returns:
+        (kind, offset): Kind code and offset of the payload
+    """
+    found, _, offset = _read_header(data)
+    if kind is not None and found != kind:
+        raise ValueError(f"Snapshot kind {found} does not match expected kind {kind}")
+    return found, offset
+
+
+def unpack_precision(data):
+    """Precision preset name stored in a snapshot header ("double" for version 1)."""
+    return PRECISION_CODES[_read_header(data)[1]]
+
+
+def pack_rng(rng):
+    """Pack the state of a PCG64 numpy Generator into 40 bytes."""
+    state = rng.bit_generator.state
+    if state["bit_generator"] != "PCG64":
+        raise ValueError(f"Unsupported bit generator: {state['bit_generator']}")
+    return _RNG.pack(
+        state["state"]["state"].to_bytes(16, "little"),
+        state["state"]["inc"].to_bytes(16, "little"),
+        state["has_uint32"],
+        state["uinteger"],
+    )
+
+
+def unpack_rng(data, offset):
+    """
+    Rebuild a numpy Generator from packed PCG64 state.
+
+    Returns:
+        (rng, offset): Generator and offset after the RNG block
+    """
+    state, inc, has_uint32, uinteger = _RNG.unpack_from(data, offset)
+    rng = np.random.default_rng()
+    rng.bit_generator.state = {
+        "bit_generator": "PCG64",
+        "state": {
+            "state": int.from_bytes(state, "little"),
+            "inc": int.from_bytes(inc, "little"),
+        },
+        "has_uint32": has_uint32,
+        "uinteger": uinteger,
+    }
+    return rng, offset + _RNG.size
+
+
+# Array dtype codes, kept in the top byte of the length prefix. Code 0
+# is float64, so arrays from snapshots that predate the codes still read
+ARRAY_DTYPES = ("<f8", "<f4", "<i8")
+_LENGTH_BITS = 56
+
+
+def _array_code(dtype):
+    if dtype == np.float32:
+        return 1
+    if dtype.kind in "iu":
+        return 2
+    return 0
+
+
+def pack_array(values):
+    """Pack a 1D array in its native dtype (float64, float32 or int64) with a length prefix."""
+    values = np.asarray(values)
+    code = _array_code(values.dtype)
+    values = np.ascontiguousarray(values, dtype=ARRAY_DTYPES[code])
+    return struct.pack("<Q", (code << _LENGTH_BITS) | len(values)) + values.tobytes()
+
+
+def unpack_array(data, offset):
+    """
+    Unpack a length-prefixed array written by pack_array.
+
+    Returns:
+        (array, offset): Array copy (native byte order) and offset after it
+    """
+    (prefix,) = struct.unpack_from("<Q", data, offset)
+    offset += 8
+    code, n = prefix >> _LENGTH_BITS, prefix & ((1 << _LENGTH_BITS) - 1)
+    if code >= len(ARRAY_DTYPES):
+        raise ValueError(f"Unknown snapshot array dtype code: {code}")
+    dtype = np.dtype(ARRAY_DTYPES[code])
+    values = np.frombuffer(data, dtype=dtype, count=n, offset=offset)
+    return values.astype(dtype.newbyteorder("=")), offset + dtype.itemsize * n
+
+
+def pack_blob(blob):
+    """Pack nested snapshot bytes with a length prefix."""
+    return struct.pack("<Q", len(blob)) + blob
+
+
+def unpack_blob(data, offset):
+    """Unpack nested snapshot bytes; returns (blob, offset)."""
+    (n,) = struct.unpack_from("<Q", data, offset)
+    offset += 8
+    return bytes(data[offset:offset + n]), offset + n
+
+
+def _snapshot_classes():
+    from ibrl.agents import ClassicalQAgent, BayesianQAgent, IBQAgent
+    from ibrl.belief import (
+        CredalInterval,
+        CredalRectangle,
+        WassersteinBall,
+        SlidingWindowInterval,
+        DiscountedInterval,
+        Infradistribution,
+    )
+
+    return {
+        KIND_CREDAL_INTERVAL: CredalInterval,
+        KIND_CREDAL_RECTANGLE: CredalRectangle,
+        KIND_WASSERSTEIN_BALL: WassersteinBall,
+        KIND_WINDOWED_INTERVAL: SlidingWindowInterval,
+        KIND_DISCOUNTED_INTERVAL: DiscountedInterval,
+        KIND_INFRADISTRIBUTION: Infradistribution,
+        KIND_CLASSICAL_Q: ClassicalQAgent,
+        KIND_BAYESIAN_Q: BayesianQAgent,
+        KIND_IB_Q: IBQAgent,
+    }
+
+
+def from_bytes(data):
+    """Restore any agent or belief from its snapshot, dispatching on the header kind."""
+    kind, _ = unpack_header(data)
+    classes = _snapshot_classes()
+    if kind not in classes:
+        raise ValueError(f"Unknown snapshot kind: {kind}")
+    return classes[kind].from_bytes(data)
+
+
+# ---------------------------------------------------------------------------
+# Agent pools
+# ---------------------------------------------------------------------------
+
+def _rng_row(rng):
+    state = rng.bit_generator.state
+    if state["bit_generator"] != "PCG64":
+        raise ValueError(f"Unsupported bit generator: {state['bit_generator']}")
+    s, inc = state["state"]["state"], state["state"]["inc"]
+    return [s >> 64, s & _MASK64, inc >> 64, inc & _MASK64,
+            state["has_uint32"], state["uinteger"]]
+
+
+def _rng_from_row(row):
+    row = [int(v) for v in row]
+    rng = np.random.default_rng()
+    rng.bit_generator.state = {
+        "bit_generator": "PCG64",
+        "state": {"state": (row[0] << 64) | row[1], "inc": (row[2] << 64) | row[3]},
+        "has_uint32": row[4],
+        "uinteger": row[5],
+    }
+    return rng
+
+
+def pool_to_arrays(agents):
+    """
+    Stack the state of a homogeneous agent pool into arrays.
+
+    All agents must share a class and n_actions. IB agents must hold
+    CredalInterval beliefs.
+
+    Args:
+        agents: List of ClassicalQAgent, BayesianQAgent or IBQAgent
+
+    Returns:
+        Dict of numpy arrays, one row per agent
+    """
+    from ibrl.agents import ClassicalQAgent, BayesianQAgent, IBQAgent
+    from ibrl.agents.bayesian_q import THOMPSON_MODES
+    from ibrl.belief import CredalInterval, BOUND_FAMILIES
+    from ibrl.belief.credal_interval import RECOVERY_POLICIES
+
+    if not agents:
+        raise ValueError("Cannot snapshot an empty pool")
+    cls = type(agents[0])
+    if any(type(a) is not cls for a in agents):
+        raise ValueError("Agent pool must be homogeneous")
+    if any(a.n_actions != agents[0].n_actions for a in agents):
+        raise ValueError("Agent pool must share n_actions")
+    if any(a.dtype != agents[0].dtype for a in agents):
+        raise ValueError("Agent pool must share a precision")
+
+    kinds = {ClassicalQAgent: KIND_CLASSICAL_Q, BayesianQAgent: KIND_BAYESIAN_Q,
+             IBQAgent: KIND_IB_Q}
+    if cls not in kinds:
+        raise ValueError(f"Unsupported agent class: {cls.__name__}")
+
+    arrays = {
+        "header": np.frombuffer(pack_header(kinds[cls], agents[0].dtype), dtype=np.uint8).copy(),
+        "q": np.stack([a.q for a in agents]).astype(float),
+        "alpha": np.array([a.alpha for a in agents], dtype=float),
+        "gamma": np.array([a.gamma for a in agents], dtype=float),
+        "rng": np.array([_rng_row(a.rng) for a in agents], dtype=np.uint64),
+    }
+
+    if cls is ClassicalQAgent:
+        arrays["epsilon"] = np.array([a.epsilon for a in agents], dtype=float)
+        arrays["indexed"] = np.array([a.indexed for a in agents], dtype=bool)
+    elif cls is BayesianQAgent:
+        arrays["alpha_params"] = np.stack([a.alpha_params for a in agents]).astype(float)
+        arrays["beta_params"] = np.stack([a.beta_params for a in agents]).astype(float)
+        arrays["indexed"] = np.array([a.indexed for a in agents], dtype=bool)
+        arrays["thompson"] = np.array([THOMPSON_MODES.index(a.thompson) for a in agents],
+                                      dtype=np.uint8)
+        arrays["refresh"] = np.array([a.refresh for a in agents], dtype=np.int64)
+        # Cached lazy samples; NaN rows for agents without a cache
+        if any(a._samples is not None for a in agents):
+            arrays["samples"] = np.stack([
+                np.full(a.n_actions, np.nan) if a._samples is None else a._samples
+                for a in agents
+            ])
+    else:
+        if any(type(a.credal) is not CredalInterval for a in agents):
+            raise ValueError("Pool snapshots support IB agents with CredalInterval beliefs")
+        arrays["million"] = np.array([a.million for a in agents], dtype=float)
+        arrays["small"] = np.array([a.small for a in agents], dtype=float)
+        arrays["credal_bounds"] = np.array(
+            [[a.credal.initial_lower, a.credal.initial_upper, a.credal.lower,
+              a.credal.upper, a.credal.delta] for a in agents], dtype=float)
+        arrays["credal_counts"] = np.array(
+            [[a.credal.successes, a.credal.trials] for a in agents], dtype=np.int64)
+        arrays["credal_bound"] = np.array(
+            [BOUND_FAMILIES.index(a.credal.bound) for a in agents], dtype=np.uint8)
+        arrays["credal_recovery"] = np.array(
+            [RECOVERY_POLICIES.index(a.credal.recovery) for a in agents], dtype=np.uint8)
+        arrays["credal_misspecified"] = np.array(
+            [a.credal.misspecified for a in agents], dtype=bool)
+        arrays["credal_misspecified_steps"] = np.array(
+            [a.credal.misspecified_steps for a in agents], dtype=np.int64)
+
+    return arrays
+
+
+def pool_from_arrays(arrays):
+    """Rebuild a list of agents from pool_to_arrays output."""
+    from ibrl.agents import ClassicalQAgent, BayesianQAgent, IBQAgent
+    from ibrl.agents.bayesian_q import THOMPSON_MODES
+    from ibrl.belief import CredalInterval, BOUND_FAMILIES
+    from ibrl.belief.credal_interval import RECOVERY_POLICIES
+
+    header = np.asarray(arrays["header"], dtype=np.uint8).tobytes()
+    kind, _ = unpack_header(header)
+    precision = unpack_precision(header)
+    n_agents, n_actions = arrays["q"].shape
+    agents = []
+
+    for i in range(n_agents):
+        alpha, gamma = float(arrays["alpha"][i]), float(arrays["gamma"][i])
+        if kind == KIND_CLASSICAL_Q:
+            agent = ClassicalQAgent(n_actions, alpha=alpha, gamma=gamma,
+                                    epsilon=float(arrays["epsilon"][i]), precision=precision)
+        elif kind == KIND_BAYESIAN_Q:
+            agent = BayesianQAgent(n_actions, alpha=alpha, gamma=gamma, precision=precision)
+            agent.alpha_params = np.array(arrays["alpha_params"][i], dtype=agent.dtype)
+            agent.beta_params = np.array(arrays["beta_params"][i], dtype=agent.dtype)
+            if "thompson" in arrays:
+                agent.thompson = THOMPSON_MODES[int(arrays["thompson"][i])]
+                agent.refresh = int(arrays["refresh"][i])
+            if "samples" in arrays and not np.isnan(arrays["samples"][i]).any():
+                agent.restore_samples(arrays["samples"][i])
+        elif kind == KIND_IB_Q:
+            init_lower, init_upper, lower, upper, delta = arrays["credal_bounds"][i]
+            bound = "hoeffding"
+            if "credal_bound" in arrays:
+                bound = BOUND_FAMILIES[int(arrays["credal_bound"][i])]
+            recovery = None
+            if "credal_recovery" in arrays:
+                recovery = RECOVERY_POLICIES[int(arrays["credal_recovery"][i])]
+            credal = CredalInterval(lower=float(init_lower), upper=float(init_upper),
+                                    delta=float(delta), bound=bound, recovery=recovery)
+            credal.lower, credal.upper = float(lower), float(upper)
+            credal.successes, credal.trials = (int(c) for c in arrays["credal_counts"][i])
+            # Pools written before misspecification detection have no detector state
+            if "credal_misspecified" in arrays:
+                credal.misspecified = bool(arrays["credal_misspecified"][i])
+                credal.misspecified_steps = int(arrays["credal_misspecified_steps"][i])
+            agent = IBQAgent(credal, n_actions=n_actions, alpha=alpha, gamma=gamma,
+                             million=float(arrays["million"][i]),
+                             small=float(arrays["small"][i]), precision=precision)
+        else:
+            raise ValueError(f"Unsupported pool kind: {kind}")
+
+        agent.q = np.array(arrays["q"][i], dtype=agent.dtype)
+        # Pools written before the argmax index existed keep the default
+        if "indexed" in arrays:
+            agent.indexed = bool(arrays["indexed"][i])
+        agent.rng = _rng_from_row(arrays["rng"][i])
+        agents.append(agent)
+
+    return agents
+
+
+def pool_to_bytes(agents):
+    """Serialize an agent pool as an uncompressed .npz archive (no pickle)."""
+    buffer = io.BytesIO()
+    np.savez(buffer, **pool_to_arrays(agents))
+    return buffer.getvalue()
+
+
+def pool_from_bytes(data):
+    """Restore an agent pool written by pool_to_bytes."""
+    with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+        return pool_from_arrays({key: archive[key] for key in archive.files})
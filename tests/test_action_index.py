@@ -0,0 +1,58 @@
+"""Tests for the incremental argmax index and large-action agents."""
+
+import numpy as np
+from ibrl.agents import ClassicalQAgent, BayesianQAgent
+from ibrl.agents.action_index import ArgmaxIndex
+from ibrl.envs import BanditEnv
+
+
+def test_index_tracks_argmax():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 5, 37).astype(float)
+    index = ArgmaxIndex(values)
+    
+    for _ in range(200):
+        i = rng.integers(len(values))
+        values[i] = rng.integers(0, 5)
+        index.update(i)
+        # Ties resolve to the lowest index, like np.argmax
+        assert index.argmax() == np.argmax(values)
+        
+        batch = rng.integers(0, len(values), size=5)
+        values[batch] = rng.integers(0, 5, size=5)
+        index.update_many(batch)
+        assert index.argmax() == np.argmax(values)
+
+
+def test_indexed_agent_matches_plain_agent():
+    probs = np.linspace(0.1, 0.9, 50)
+    runs = []
+    for indexed in [False, True]:
+        env = BanditEnv(probs, np.ones(50), seed=0)
+        agent = ClassicalQAgent(50, seed=0, indexed=indexed)
+        actions = []
+        for _ in range(300):
+            action = agent.select_action(0)
+            _, reward, _, _ = env.step(action)
+            agent.update(0, action, reward, done=False)
+            actions.append(action)
+        runs.append((actions, agent.q.copy()))
+    
+    assert runs[0][0] == runs[1][0]
+    assert np.array_equal(runs[0][1], runs[1][1])
+
+
+def test_lazy_thompson_finds_best_arm():
+    probs = np.full(400, 0.2)
+    probs[17] = 0.9
+    env = BanditEnv(probs, np.ones(400), seed=1)
+    agent = BayesianQAgent(400, seed=1, thompson="lazy")
+    
+    actions = []
+    for _ in range(3000):
+        action = agent.select_action(0)
+        _, reward, _, _ = env.step(action)
+        agent.update(0, action, reward)
+        actions.append(action)
+    
+    assert np.mean(np.array(actions[-500:]) == 17) > 0.5
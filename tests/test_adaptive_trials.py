@@ -0,0 +1,42 @@
+"""Tests for adaptive trial allocation."""
+
+import numpy as np
+from ibrl.experiments import AdaptiveTrialAllocator, cell_statistics
+
+
+def _trial(reward, action):
+    return {"rewards": np.full(100, reward), "actions": np.full(100, action)}
+
+
+def test_cell_statistics_zero_variance():
+    cell = [_trial(1_000_000.0, 0) for _ in range(3)]
+    summary = cell_statistics(cell)
+    
+    assert summary["n_trials"] == 3
+    assert summary["reward_mean"] == 1_000_000.0
+    assert summary["reward_halfwidth"] == 0.0
+    assert summary["rate_mean"] == 1.0
+
+
+def test_allocator_targets_wide_cells():
+    rng = np.random.default_rng(0)
+    results = {
+        "newcomb": {
+            # Deterministic cell: already resolved
+            "ib": [_trial(1_000_000.0, 0) for _ in range(3)],
+            # Noisy cell: needs more trials
+            "bayesian": [_trial(r, a) for r, a in zip(rng.uniform(0, 1e6, 3), [0, 1, 1])],
+        }
+    }
+    allocator = AdaptiveTrialAllocator(round_size=4, max_trials=5)
+    allocation = allocator.next_round(results)
+    
+    assert ("newcomb", "ib") not in allocation
+    assert allocation[("newcomb", "bayesian")] == 2
+
+
+def test_allocator_respects_time_budget():
+    results = {"newcomb": {"bayesian": [_trial(0.0, 0), _trial(1.0, 1)]}}
+    allocator = AdaptiveTrialAllocator(time_budget=0.0)
+    
+    assert allocator.next_round(results) == {}
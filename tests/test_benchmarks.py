@@ -0,0 +1,34 @@
+"""Tests for the benchmark comparison logic."""
+
+from benchmarks.harness import compare, measure, rate_result, duration_result
+
+
+def _result(value, runs, higher_is_better=True, work=1):
+    return {"value": value, "min_s": min(runs), "max_s": max(runs), "work": work,
+            "unit": "x", "higher_is_better": higher_is_better}
+
+
+def test_measure_reports_work():
+    timing = measure(lambda: 10, repeat=3, warmup=0)
+    assert timing["work"] == 10 and len(timing["runs"]) == 3
+    assert rate_result(timing, "ops/s")["higher_is_better"]
+    assert not duration_result(timing)["higher_is_better"]
+
+
+def test_compare_flags_only_separated_regressions():
+    baseline = {"results": {
+        "fast": _result(1.0, [1.0, 1.1], higher_is_better=False),
+        "noisy": _result(1.0, [0.8, 1.5], higher_is_better=False),
+        "rate": _result(100.0, [1.0, 1.05]),
+        "gone": _result(1.0, [1.0]),
+    }}
+    current = {"results": {
+        "fast": _result(1.5, [1.4, 1.6], higher_is_better=False),
+        "noisy": _result(1.3, [1.2, 1.4], higher_is_better=False),
+        "rate": _result(150.0, [0.6, 0.7]),
+        "added": _result(1.0, [1.0]),
+    }}
+    status = {row[0]: row[5] for row in compare(baseline, current, threshold=0.1)}
+    
+    assert status == {"fast": "REGRESSION", "noisy": "noise", "rate": "improved",
+                      "added": "new", "gone": "missing"}
@@ -0,0 +1,62 @@
+"""Tests for block-sampled and drifting bandit environments."""
+
+import numpy as np
+from ibrl.envs import (
+    DriftSchedule,
+    BernoulliBanditEnv,
+    GaussianBanditEnv,
+    CategoricalBanditEnv,
+)
+
+
+def test_step_batch_matches_sequential_steps():
+    schedule = DriftSchedule.random_changes(50, horizon=300, n_changes=3, seed=0)
+    actions = np.random.default_rng(1).integers(0, 50, 500)
+    
+    env = BernoulliBanditEnv(schedule, seed=2, block_size=64)
+    sequential = [env.step(a)[1] for a in actions]
+    
+    env = BernoulliBanditEnv(schedule, seed=2, block_size=64)
+    batched = np.concatenate([env.step_batch(actions[:123]), env.step_batch(actions[123:])])
+    
+    assert np.array_equal(sequential, batched)
+
+
+def test_piecewise_schedule_switches_best_arm():
+    schedule = DriftSchedule.piecewise([[0.9, 0.1], [0.1, 0.9]], change_points=[1000])
+    env = BernoulliBanditEnv(schedule, seed=0)
+    
+    first = env.step_batch(np.zeros(1000, dtype=int))
+    assert env.best_action() == 1
+    second = env.step_batch(np.zeros(1000, dtype=int))
+    
+    assert 0.85 < first.mean() < 0.95
+    assert 0.05 < second.mean() < 0.15
+
+
+def test_linear_drift_interpolates():
+    schedule = DriftSchedule([0, 100], [[0.0, 1.0], [1.0, 0.0]], interpolation="linear")
+    assert np.allclose(schedule.at(50), [0.5, 0.5])
+    assert np.allclose(schedule.at(500), [1.0, 0.0])
+    assert np.isclose(schedule.value(0, 25), 0.25)
+    assert np.allclose(schedule.lookup(np.array([0, 1]), np.array([25, 75])), [0.25, 0.25])
+
+
+def test_gaussian_and_categorical_rewards():
+    env = GaussianBanditEnv([0.0, 2.0], sigma=0.5, seed=0)
+    rewards = env.step_batch(np.ones(5000, dtype=int))
+    assert abs(rewards.mean() - 2.0) < 0.05
+    assert abs(rewards.std() - 0.5) < 0.05
+    
+    env = CategoricalBanditEnv([[0.2, 0.3, 0.5], [1.0, 0.0, 0.0]], values=[0.0, 1.0, 10.0], seed=0)
+    rewards = env.step_batch(np.zeros(10000, dtype=int))
+    assert abs(np.mean(rewards == 10.0) - 0.5) < 0.02
+    assert np.allclose(env.expected_rewards(), [5.3, 0.0])
+    assert env.step(1)[1] == 0.0
+
+
+def test_large_action_space():
+    env = BernoulliBanditEnv(np.linspace(0, 1, 200_000), seed=0)
+    rewards = env.step_batch(np.full(1000, 199_999))
+    assert rewards.sum() == 1000
+    assert env.best_action() == 199_999
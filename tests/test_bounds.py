@@ -0,0 +1,78 @@
+"""Tests for CredalInterval confidence-bound families."""
+
+import numpy as np
+import pytest
+from ibrl.agents import IBQAgent
+from ibrl.belief import CredalInterval, BoundTable, BOUND_FAMILIES, confidence_bounds
+from ibrl.envs import NewcombEnv
+from ibrl.predictors import LogicalPredictor
+from ibrl.experiments import exact_ib_evaluation
+from ibrl.utils.snapshot import from_bytes
+
+
+@pytest.mark.parametrize("family", BOUND_FAMILIES)
+def test_bounds_cover_true_mean(family):
+    rng = np.random.default_rng(0)
+    theta, n = 0.95, 200
+    successes = rng.binomial(n, theta, size=300)
+    covered = [lo <= theta <= hi for lo, hi in
+               (confidence_bounds(family, int(s), n, 0.05) for s in successes)]
+    
+    # Wilson is approximate, so allow some slack below the nominal 95%
+    assert np.mean(covered) > 0.9
+
+
+@pytest.mark.parametrize("family", ["kl", "clopper_pearson", "bernstein", "wilson"])
+def test_tighter_than_hoeffding_near_edge(family):
+    hoeffding = CredalInterval(lower=0.0, upper=1.0)
+    tighter = CredalInterval(lower=0.0, upper=1.0, bound=family)
+    for i in range(500):
+        hoeffding.update(i % 20 != 0)
+        tighter.update(i % 20 != 0)
+    
+    assert tighter.width() < hoeffding.width()
+    assert tighter.lower <= 0.95 <= tighter.upper
+
+
+def test_table_caches_bounds():
+    table = BoundTable("clopper_pearson", 0.05)
+    first = table.bounds(90, 100)
+    assert len(table) == 1
+    assert table.bounds(90, 100) is first
+    assert first == confidence_bounds("clopper_pearson", 90, 100, 0.05)
+
+
+def test_bound_family_survives_snapshot():
+    credal = CredalInterval(lower=0.5, upper=1.0, bound="kl")
+    for i in range(30):
+        credal.update(i % 4 != 0)
+    
+    restored = from_bytes(credal.to_bytes())
+    assert restored.bound == "kl"
+    assert restored.interval() == credal.interval()
+    
+    credal.update(True)
+    restored.update(True)
+    assert restored.interval() == credal.interval()
+
+
+def test_unknown_family_rejected():
+    with pytest.raises(ValueError):
+        CredalInterval(bound="chebyshev")
+
+
+def test_exact_evaluation_uses_bound_family():
+    agent = IBQAgent(CredalInterval(lower=0.0, upper=1.0, bound="kl"))
+    exact = exact_ib_evaluation(agent, NewcombEnv(LogicalPredictor(theta=0.95)), episodes=80)
+    
+    rng = np.random.default_rng(0)
+    widths = []
+    for _ in range(300):
+        credal = CredalInterval(lower=0.0, upper=1.0, bound="kl")
+        run = []
+        for correct in rng.random(80) < 0.95:
+            credal.update(correct)
+            run.append(credal.width())
+        widths.append(run)
+    
+    assert np.max(np.abs(exact["width_mean"] - np.mean(widths, axis=0))) < 0.01
@@ -0,0 +1,88 @@
+"""Tests for scheduled-accuracy predictors and drifting environments."""
+
+import numpy as np
+import pytest
+from ibrl.agents import IBQAgent
+from ibrl.belief import CredalInterval
+from ibrl.envs import DriftingNewcombEnv, DriftingTwinPDEnv
+from ibrl.experiments import exact_ib_evaluation
+from ibrl.utils import make_noise_tapes
+from ibrl.predictors import (
+    LogicalPredictor,
+    ScheduledPredictor,
+    linear_drift,
+    random_walk_path,
+    regime_switching_path,
+)
+
+
+def test_step_batch_matches_sequential_steps():
+    path = linear_drift(0.95, 0.5, 3000)
+    greedy = np.random.default_rng(0).integers(0, 2, 3000)
+    
+    env = DriftingNewcombEnv(path, seed=1)
+    sequential = [env.step(g, g) for g in greedy]
+    
+    env = DriftingNewcombEnv(path, seed=1)
+    rewards, correct = env.step_batch(greedy[:1000])
+    more_rewards, more_correct = env.step_batch(greedy[1000:])
+    
+    assert np.array_equal([s[1] for s in sequential], np.concatenate([rewards, more_rewards]))
+    assert np.array_equal([s[3]["predictor_correct"] for s in sequential],
+                          np.concatenate([correct, more_correct]))
+
+
+def test_runs_full_crn_tape():
+    for episodes in (1000, 5000):
+        path = np.full(episodes, 0.8, dtype=np.float32)
+        greedy = np.random.default_rng(0).integers(0, 2, episodes)
+
+        # A constant path on a tape replays LogicalPredictor exactly
+        tape = make_noise_tapes(0, episodes)["predictor"]
+        logical = LogicalPredictor(float(path[0]), noise_tape=tape)
+        expected = [logical.predict(g) for g in greedy]
+
+        tape.rewind()
+        predictor = ScheduledPredictor(path, noise_tape=tape)
+        assert [predictor.predict(g) for g in greedy] == expected
+        with pytest.raises(IndexError):
+            predictor.predict(0)
+
+        tape.rewind()
+        env = DriftingNewcombEnv(path, noise_tape=tape)
+        rewards, _ = env.step_batch(greedy)
+        assert len(rewards) == episodes
+
+
+def test_accuracy_follows_path():
+    path = np.concatenate([np.full(20000, 0.9), np.full(20000, 0.3)]).astype(np.float32)
+    env = DriftingTwinPDEnv(path, seed=0)
+    _, correct = env.step_batch(np.zeros(40000, dtype=int))
+    
+    assert abs(correct[:20000].mean() - 0.9) < 0.01
+    assert abs(correct[20000:].mean() - 0.3) < 0.01
+    
+    # Accuracy is held after the path ends
+    assert env.predictor.theta == pytest.approx(0.3)
+
+
+def test_regime_switching_path():
+    transition = [[0.99, 0.01], [0.03, 0.97]]
+    path, regimes = regime_switching_path([0.95, 0.6], transition, 200_000, seed=0)
+    
+    assert path.dtype == np.float32 and regimes.dtype == np.uint8
+    assert np.array_equal(path, np.array([0.95, 0.6], dtype=np.float32)[regimes])
+    # Stationary distribution is (0.75, 0.25)
+    assert abs(np.mean(regimes == 0) - 0.75) < 0.05
+
+
+def test_random_walk_stays_in_bounds():
+    path = random_walk_path(0.9, 100_000, scale=0.01, low=0.5, high=1.0, seed=0)
+    assert path[0] == pytest.approx(0.9)
+    assert path.min() >= 0.5 and path.max() <= 1.0
+
+
+def test_exact_evaluation_rejects_scheduled_predictor():
+    agent = IBQAgent(CredalInterval())
+    with pytest.raises(ValueError):
+        exact_ib_evaluation(agent, DriftingNewcombEnv(linear_drift(0.9, 0.7, 10)), 10)
@@ -0,0 +1,42 @@
+"""Tests for convergence-based early stopping."""
+
+import numpy as np
+from ibrl.experiments import EarlyStopping, run_newcomb_experiment
+
+
+def test_early_stopping_ib_newcomb():
+    stopper = EarlyStopping(patience=100, width_threshold=0.1, window=100,
+                            reward_tol=0.5, extrapolate=False)
+    rewards, agent, credal_widths, actions = run_newcomb_experiment(
+        "ib", episodes=5000, theta=0.95, seed=0, early_stopping=stopper
+    )
+    
+    # IB agent settles long before 5000 episodes
+    assert stopper.stop_episode is not None
+    assert len(rewards) == stopper.stop_episode + 1 < 5000
+    assert credal_widths[-1] <= 0.1
+
+
+def test_early_stopping_extrapolates_tail():
+    stopper = EarlyStopping(patience=50, width_threshold=0.1, window=50,
+                            reward_tol=0.5, extrapolate=True)
+    rewards, agent, credal_widths, actions = run_newcomb_experiment(
+        "ib", episodes=3000, theta=0.95, seed=0, early_stopping=stopper
+    )
+    
+    assert len(rewards) == len(credal_widths) == len(actions) == 3000
+    n = stopper.stop_episode + 1
+    # Extrapolated widths keep shrinking; tail action is the settled policy
+    assert credal_widths[-1] < credal_widths[n - 1]
+    assert np.all(actions[n:] == 0)
+
+
+def test_early_stopping_requires_stable_policy():
+    stopper = EarlyStopping(patience=10, width_threshold=None, window=5,
+                            reward_tol=None)
+    
+    for ep in range(50):
+        # Greedy action alternates, so the policy never stabilizes
+        assert not stopper.step(ep, ep % 2, 1.0)
+    
+    assert stopper.stop_episode is None
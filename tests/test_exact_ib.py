@@ -0,0 +1,54 @@
+"""Tests for exact belief-state evaluation of IB agents."""
+
+import numpy as np
+import pytest
+from ibrl.agents import IBQAgent
+from ibrl.belief import CredalInterval
+from ibrl.envs import NewcombEnv, TwinPDEnv
+from ibrl.predictors import LogicalPredictor
+from ibrl.experiments import exact_ib_evaluation, run_newcomb_experiment
+
+
+def test_exact_matches_deterministic_trial():
+    # With a perfect predictor the trajectory is deterministic
+    agent = IBQAgent(CredalInterval(lower=0.8, upper=0.99, delta=0.05))
+    env = NewcombEnv(LogicalPredictor(theta=1.0))
+    exact = exact_ib_evaluation(agent, env, episodes=200)
+    
+    rewards, _, widths, actions = run_newcomb_experiment("ib", episodes=200, theta=1.0)
+    
+    assert np.allclose(exact["reward_mean"], rewards)
+    assert np.allclose(exact["width_mean"], widths)
+    assert np.allclose(exact["one_box_rate"], 1 - actions)
+    assert np.allclose(exact["reward_var"], 0.0)
+
+
+def test_exact_matches_monte_carlo():
+    agent = IBQAgent(CredalInterval(lower=0.8, upper=0.99, delta=0.05))
+    env = NewcombEnv(LogicalPredictor(theta=0.95))
+    exact = exact_ib_evaluation(agent, env, episodes=150)
+    
+    widths = [run_newcomb_experiment("ib", episodes=150, seed=s)[2] for s in range(100)]
+    
+    assert np.allclose(exact["reward_mean"], 950_000)
+    assert np.max(np.abs(exact["width_mean"] - np.mean(widths, axis=0))) < 0.005
+
+
+def test_exact_twin_pd_cooperates():
+    agent = IBQAgent(CredalInterval(lower=0.8, upper=0.99), million=5, small=2)
+    env = TwinPDEnv(LogicalPredictor(theta=0.95))
+    exact = exact_ib_evaluation(agent, env, episodes=100)
+    
+    # IB agent cooperates: expected payoff 0.95 * 3 + 0.05 * 0
+    assert np.allclose(exact["reward_mean"][:10], 2.85)
+    assert exact["one_box_rate"][0] == 1.0
+    # Agent state is left untouched
+    assert agent.credal.trials == 0
+
+
+def test_exact_rejects_recovery_policies():
+    env = NewcombEnv(LogicalPredictor(theta=0.6))
+    for recovery in ("widen", "reset", "empirical"):
+        agent = IBQAgent(CredalInterval(recovery=recovery))
+        with pytest.raises(ValueError, match="recovery"):
+            exact_ib_evaluation(agent, env, episodes=300)
@@ -0,0 +1,55 @@
+"""Tests for the executor backends."""
+
+import numpy as np
+import pytest
+from ibrl.experiments import make_executor, choose_backend
+from ibrl.experiments.compare_all import run_single_trial
+
+TASKS = [
+    ("twin_pd", "ib", 0, 150, {"precision": "compact"}),
+    ("bandit", "bayesian", 1, 150, {"precision": "compact"}),
+    ("newcomb", "classical", 2, 150, {"precision": "compact"}),
+]
+
+
+def _square(x):
+    return x * x
+
+
+@pytest.mark.parametrize("backend, start_method", [
+    ("serial", None), ("batch", None), ("thread", None),
+    ("process", "fork"), ("process", "spawn"),
+])
+def test_backends_match_serial_results(backend, start_method):
+    expected = [run_single_trial(task) for task in TASKS]
+    with make_executor(backend, max_workers=2, start_method=start_method) as executor:
+        outputs = executor.run_trials(TASKS, 150, precision="compact")
+        assert executor.map(_square, [1, 2, 3]) == [1, 4, 9]
+    
+    for want, got in zip(expected, outputs):
+        for a, b in zip(want[:3], got[:3]):
+            if a is None:
+                assert b is None
+            else:
+                assert np.array_equal(a, b) and a.dtype == b.dtype
+        assert want[3] == got[3]
+
+
+def test_auto_mode_choice():
+    assert choose_backend(n_tasks=60, episodes=100) == "batch"
+    assert choose_backend(n_tasks=60, episodes=10_000, max_workers=1) == "batch"
+    assert choose_backend(n_tasks=60, episodes=10_000, max_workers=4) == "process"
+    assert make_executor("auto", n_tasks=3, episodes=10).name == "batch"
+    # Default compare_all batch (10 trials x 15 cells x 1000 episodes)
+    assert choose_backend(n_tasks=150, episodes=1000, max_workers=2) == "process"
+    assert choose_backend(n_tasks=150, episodes=1000, max_workers=8) == "process"
+    assert choose_backend(n_tasks=15, episodes=300, max_workers=8) == "batch"
+
+
+def test_invalid_backend_arguments():
+    with pytest.raises(ValueError):
+        make_executor("gpu")
+    with pytest.raises(ValueError):
+        make_executor("auto")
+    with pytest.raises(ValueError):
+        make_executor("process", start_method="teleport")
@@ -0,0 +1,143 @@
+"""Tests for the infradistribution belief."""
+
+import numpy as np
+from ibrl.belief import Infradistribution, minimal_points
+from ibrl.utils import snapshot
+
+
+def test_update_matches_manual_rule():
+    kernels = np.array([[0.3, 0.7], [0.6, 0.4]])
+    belief = Infradistribution(kernels, off_event=0.5)
+    belief.update(1)
+
+    # Children (λ·p(o), b + g·λ·(1 - p(o))), then E[0] -> 0, E[1] -> 1
+    scales = kernels[:, 1]
+    offsets = 0.5 * (1 - kernels[:, 1])
+    e0 = offsets.min()
+    e1 = (scales + offsets).min()
+    assert np.allclose(belief.scales, scales / (e1 - e0))
+    assert np.allclose(belief.offsets, (offsets - e0) / (e1 - e0))
+    assert np.isclose(belief.worst_case_expectation([0.0, 0.0]), 0.0)
+    assert np.isclose(np.min(belief.totals), 1.0)
+
+    values = np.array([0.2, 1.0])
+    expected = np.min(belief.offsets + belief.scales * (kernels @ values))
+    assert np.isclose(belief.worst_case_expectation(values), expected)
+
+
+def test_minimal_points_preserve_expectations():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n = rng.integers(1, 40)
+        scales, offsets = rng.random(n), rng.random(n)
+        keep = minimal_points(scales, offsets)
+        v = np.linspace(0, 1, 101)
+        full = (offsets[:, None] + scales[:, None] * v).min(axis=0)
+        pruned = (offsets[keep, None] + scales[keep, None] * v).min(axis=0)
+        assert np.allclose(full, pruned)
+        assert len(keep) <= n
+
+
+def test_prune_preserves_worst_case():
+    rng = np.random.default_rng(1)
+    belief = Infradistribution(rng.dirichlet(np.ones(3), 4))
+    belief.states = rng.integers(-1, 4, 50)
+    belief.scales = 1 + rng.random(50)
+    belief.totals = belief.scales + rng.random(50)
+    functions = rng.random((100, 3))
+    before = [belief.worst_case_expectation(f) for f in functions]
+
+    assert belief.prune() > 0
+    after = [belief.worst_case_expectation(f) for f in functions]
+    assert np.allclose(before, after)
+
+
+class _Unpruned(Infradistribution):
+    """Reference that keeps every point (only overflowed ones are dropped)."""
+
+    def prune(self):
+        finite = np.isfinite(self.scales) & np.isfinite(self.totals)
+        self.states, self.scales, self.totals = (
+            self.states[finite], self.scales[finite], self.totals[finite])
+        return 0
+
+
+def test_pruning_matches_unpruned_updates():
+    kernels = [[0.639, 0.505, 0.016], [0.966, 0.013, 0.527],
+               [0.432, 0.262, 0.890], [0.343, 0.565, 0.131]]
+    cases = [(kernels, {"knightian": True, "off_event": 0.0312}, 1, 9)]
+    rng = np.random.default_rng(5)
+    for _ in range(10):
+        cases.append((rng.dirichlet(np.ones(3), 4),
+                      {"knightian": True, "off_event": 0.5 * rng.random()}, rng, 8))
+        cases.append((rng.dirichlet(np.ones(3), 6),
+                      {"offsets": 0.3 * rng.random(6), "off_event": 0.5 * rng.random()},
+                      rng, 60))
+
+    functions = rng.random((100, 3))
+    for kernels, kwargs, seed, steps in cases:
+        pruned, full = Infradistribution(kernels, **kwargs), _Unpruned(kernels, **kwargs)
+        outcomes = np.random.default_rng(seed).integers(3, size=steps)
+        for outcome in outcomes:
+            pruned.update(outcome)
+            full.update(outcome)
+        assert pruned.misspecified_steps == full.misspecified_steps
+        for f in functions:
+            assert np.isclose(pruned.worst_case_expectation(f),
+                              full.worst_case_expectation(f), rtol=0, atol=1e-12)
+
+
+def test_knightian_point_count_stays_bounded():
+    rng = np.random.default_rng(2)
+    belief = Infradistribution.bernoulli(np.linspace(0.5, 0.95, 10), knightian=True,
+                                         off_event=0.5)
+    sizes = []
+    for _ in range(100):
+        belief.update(rng.random() < 0.8)
+        sizes.append(belief.n_points)
+
+    # Each Knightian point branches into 10 children per update
+    assert max(sizes) <= 10
+    assert belief.pruned > 0
+
+
+def test_likelihood_concentrates_fixed_hypotheses():
+    rng = np.random.default_rng(3)
+    belief = Infradistribution.bernoulli(np.linspace(0.1, 0.9, 9))
+    assert np.isclose(belief.width(), 0.8)
+
+    for _ in range(3000):
+        belief.update(rng.random() < 0.8)
+
+    # g = 1: the maximum-likelihood hypothesis sets the worst case
+    lower, upper = belief.interval()
+    assert np.allclose(lower, [0.2, 0.8]) and np.allclose(upper, [0.2, 0.8])
+
+
+def test_zero_probability_outcome_flags_misspecification():
+    belief = Infradistribution([[1.0, 0.0], [0.9, 0.1]])
+    belief.update(1)
+    assert not belief.misspecified
+
+    belief = Infradistribution([[1.0, 0.0]])
+    belief.update(1)
+    assert belief.misspecified
+    assert belief.misspecified_steps == 1
+    assert np.allclose(belief.scales, [1.0])
+
+
+def test_snapshot_round_trip():
+    rng = np.random.default_rng(4)
+    belief = Infradistribution.bernoulli([0.3, 0.6, 0.9], knightian=True, off_event=0.0)
+    for _ in range(20):
+        belief.update(rng.random() < 0.5)
+
+    restored = snapshot.from_bytes(belief.to_bytes())
+    assert isinstance(restored, Infradistribution)
+    assert np.array_equal(restored.states, belief.states)
+    assert np.array_equal(restored.scales, belief.scales)
+    assert restored.trials == belief.trials
+    assert restored.worst_case_expectation([0.0, 1.0]) == belief.worst_case_expectation([0.0, 1.0])
+
+    restored.reset()
+    assert restored.n_points == 1
@@ -0,0 +1,64 @@
+"""Tests for generated matrix games and the batched population runner."""
+
+import numpy as np
+from ibrl.envs import generate_games
+from ibrl.experiments import run_population
+
+
+def test_generator_is_seeded_and_well_formed():
+    games = generate_games(300, n_actions=4, seed=7)
+    again = generate_games(300, n_actions=4, seed=7)
+    assert np.array_equal(games.payoffs, again.payoffs)
+    assert np.array_equal(games.errors, again.errors)
+
+    assert games.payoffs.shape == (300, 4, 4)
+    assert games.payoffs.min() >= 0 and games.payoffs.max() <= 1
+    assert np.allclose(games.errors.sum(axis=2), 1)
+    assert np.all(np.diagonal(games.errors, axis1=1, axis2=2) == 0)
+    assert np.all((games.theta_lower <= games.theta) & (games.theta <= games.theta_upper))
+    assert set(np.unique(games.kinds)) == {0, 1, 2}
+
+
+def test_ib_optimal_action_matches_grid_search():
+    games = generate_games(200, n_actions=3, seed=1)
+    grid = np.linspace(0, 1, 101)
+    thetas = games.theta_lower[:, None] + grid * (games.theta_upper - games.theta_lower)[:, None]
+    hit, miss = games.outcome_values()
+    values = thetas[:, :, None] * hit[:, None, :] + (1 - thetas[:, :, None]) * miss[:, None, :]
+    worst = values.min(axis=1)
+
+    assert np.allclose(worst.max(axis=1), games.ib_value)
+    assert np.allclose(worst[np.arange(200), games.ib_action], games.ib_value)
+
+
+def test_newcomb_games_punish_the_dominant_action():
+    games = generate_games(100, n_actions=3, kinds=("newcomb",), seed=2)
+    # The action that is best against every fixed prediction...
+    dominant = np.argmax(games.payoffs[:, :, 0], axis=1)
+    assert np.all(np.argmax(games.payoffs, axis=1) == dominant[:, None])
+    # ...is not the IB-optimal one when the predictor is accurate
+    accurate = games.theta_lower > 0.8
+    assert np.any(games.ib_action[accurate] != dominant[accurate])
+
+
+def test_population_runner():
+    games = generate_games(200, n_actions=3, seed=3)
+    population = [
+        {"type": "classical", "epsilon": 0.1},
+        {"type": "classical", "epsilon": 0.3, "name": "explorer"},
+        {"type": "bayesian"},
+        {"type": "ib", "delta": 0.05},
+    ]
+    results = run_population(games, population, episodes=300, seed=0)
+
+    assert results["names"][1] == "explorer"
+    assert results["mean_reward"].shape == (4, 200)
+    assert results["reward_curve"].shape == (4, 300)
+    assert np.all(results["mean_reward"] <= 1)
+
+    # The IB agent knows the game structure and converges on the optimum
+    assert results["regret"][3].mean() < results["regret"][:3].mean(axis=1).min()
+    assert results["ib_agreement"][3] > 0.8
+
+    repeat = run_population(games, population, episodes=300, seed=0)
+    assert np.array_equal(results["mean_reward"], repeat["mean_reward"])
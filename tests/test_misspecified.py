@@ -1,7 +1,11 @@
 """Tests for misspecified environments."""
 
+import numpy as np
+import pytest
+from ibrl.belief import CredalInterval, SlidingWindowInterval
 from ibrl.envs import MisspecifiedNewcombEnv, AdversarialNewcombEnv
 from ibrl.predictors import LogicalPredictor
+from ibrl.utils.snapshot import from_bytes
 
 
 def test_misspecified_newcomb():
@@ -26,3 +30,46 @@ def test_adversarial_newcomb():
     
     assert info["adversarial"] is True
     assert info["predictor_correct"] is False
+
+
+def _observe(credal, theta=0.6, n=500, seed=0):
+    for success in np.random.default_rng(seed).random(n) < theta:
+        credal.update(success)
+    return credal
+
+
+def test_detector_flags_empty_interval():
+    credal = _observe(CredalInterval(lower=0.8, upper=0.99))
+    
+    # Without recovery the interval is empty and every such step is counted
+    assert credal.misspecified
+    assert credal.lower > credal.upper
+    assert 0 < credal.misspecified_steps < 500
+    
+    healthy = _observe(CredalInterval(lower=0.8, upper=0.99), theta=0.9)
+    assert not healthy.misspecified
+    assert healthy.misspecified_steps == 0
+
+
+@pytest.mark.parametrize("recovery", ["widen", "reset", "empirical"])
+def test_recovery_keeps_interval_non_empty(recovery):
+    credal = CredalInterval(lower=0.8, upper=0.99, recovery=recovery)
+    widths = []
+    for success in np.random.default_rng(0).random(500) < 0.6:
+        credal.update(success)
+        widths.append(credal.width())
+    
+    assert min(widths) >= 0
+    assert credal.misspecified_steps > 0
+    if recovery in ("widen", "empirical"):
+        assert credal.lower <= 0.6 <= credal.upper
+
+
+def test_detector_on_windowed_interval_and_snapshot():
+    credal = _observe(SlidingWindowInterval(window=100, lower=0.8, upper=0.99,
+                                            recovery="empirical"))
+    assert credal.misspecified_steps > 0
+    
+    restored = from_bytes(credal.to_bytes())
+    assert restored.recovery == "empirical"
+    assert restored.misspecified_steps == credal.misspecified_steps
@@ -0,0 +1,85 @@
+"""Tests for common-random-numbers noise tapes."""
+
+import numpy as np
+import pytest
+from scipy import stats
+from ibrl.envs import BanditEnv
+from ibrl.predictors import LogicalPredictor
+from ibrl.utils import (
+    NoiseTape,
+    make_noise_tapes,
+    sample_uniforms,
+    effective_variance_reduction,
+)
+
+
+def test_noise_tape_replays_draws():
+    tape = NoiseTape.generate(10, seed=0)
+    first = [tape.random() for _ in range(10)]
+    
+    with pytest.raises(IndexError):
+        tape.random()
+    
+    tape.rewind()
+    assert [tape.random() for _ in range(10)] == first
+
+
+def test_shared_tapes_give_identical_noise():
+    tapes_a = make_noise_tapes(seed=3, episodes=200)
+    tapes_b = make_noise_tapes(seed=3, episodes=200)
+    
+    # Different predictor seeds, same tape: identical predictions
+    pred_a = LogicalPredictor(theta=0.7, seed=1, noise_tape=tapes_a["predictor"])
+    pred_b = LogicalPredictor(theta=0.7, seed=2, noise_tape=tapes_b["predictor"])
+    assert [pred_a.predict(0) for _ in range(200)] == [pred_b.predict(0) for _ in range(200)]
+    
+    # Predictor and environment tapes are independent streams
+    assert not np.allclose(tapes_a["predictor"].uniforms, tapes_a["env"].uniforms)
+
+
+def test_bandit_uses_noise_tape():
+    tape = NoiseTape(np.array([0.1, 0.9]))
+    env = BanditEnv(probs=(0.5, 0.5), noise_tape=tape)
+    
+    assert env.step(0)[1] == 1.0
+    assert env.step(0)[1] == 0.0
+
+
+def test_sampling_designs():
+    rng = np.random.default_rng(0)
+    
+    anti = sample_uniforms(100, 2, "antithetic", rng)
+    assert np.allclose(anti[:, 0] + anti[:, 1], 1.0)
+    
+    # Every episode covers each stratum exactly once
+    design = sample_uniforms(100, 5, "lhs", rng)
+    assert np.all(np.sort(np.floor(design * 5), axis=1) == np.arange(5))
+
+    with pytest.raises(ValueError):
+        sample_uniforms(100, 5, "stratified", rng)
+
+
+def test_tapes_are_marginally_uniform():
+    # Each trial's tape must be a plain Uniform(0, 1) stream over episodes
+    for method, group_size in (("iid", 2), ("antithetic", 2), ("lhs", 5)):
+        for trial in range(group_size):
+            for tape in make_noise_tapes(trial, 4000, method, group_size).values():
+                assert stats.kstest(tape.uniforms, "uniform").pvalue > 1e-4
+
+
+def test_lhs_tapes_reduce_variance():
+    # Mean of a Bernoulli(0.7) tape per trial, in Latin hypercube groups
+    # of 5 (expected reduction 0.21 / 0.05 = 4.2)
+    values = [
+        np.mean(make_noise_tapes(t, 200, "lhs", 5)["env"].uniforms < 0.7)
+        for t in range(100)
+    ]
+    assert effective_variance_reduction(values, 5) > 2
+
+
+def test_antithetic_rejects_other_group_sizes():
+    from ibrl.experiments.compare_all import compare_all
+
+    with pytest.raises(ValueError, match="pairs"):
+        compare_all(n_trials=2, episodes=10, parallel=False, save_path=None,
+                    sampling="antithetic", sampling_group_size=4)
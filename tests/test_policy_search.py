@@ -0,0 +1,64 @@
+"""Tests for branch-and-bound policy search."""
+
+import numpy as np
+from ibrl.agents import IBQAgent, PolicyProblem, branch_and_bound, enumerate_policies
+from ibrl.belief import CredalInterval
+
+
+def test_branch_and_bound_matches_enumeration():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        n_hypotheses, n, n_actions = rng.integers(1, 4), rng.integers(1, 7), rng.integers(2, 4)
+        unary = rng.normal(size=(n_hypotheses, n, n_actions))
+        mask = rng.random((1, n, 1, n, 1)) < 0.3
+        pairwise = rng.normal(size=(n_hypotheses, n, n_actions, n, n_actions)) * mask
+        problem = PolicyProblem(unary, pairwise)
+
+        worst = problem.worst_case_values(enumerate_policies(n, n_actions))
+        result = branch_and_bound(problem, batch_size=int(rng.integers(1, 32)))
+        assert np.isclose(result["value"], worst.max())
+        assert np.isclose(problem.worst_case_values(result["policy"][None])[0], result["value"])
+
+
+def test_values_match_definition():
+    rng = np.random.default_rng(1)
+    unary = rng.normal(size=(2, 3, 2))
+    pairwise = rng.normal(size=(2, 3, 2, 3, 2))
+    problem = PolicyProblem(unary, pairwise)
+    policy = np.array([1, 0, 1])
+
+    expected = unary[:, [0, 1, 2], policy].sum(axis=1)
+    for o in range(3):
+        for o2 in range(3):
+            if o != o2:
+                expected += pairwise[:, o, policy[o], o2, policy[o2]]
+    assert np.allclose(problem.values(policy[None])[0], expected)
+
+
+def test_transparent_newcomb_policy():
+    # Accurate predictor: one-box on a full box, two-box on an empty one
+    result = branch_and_bound(PolicyProblem.transparent_newcomb([0.9, 0.99]))
+    assert list(result["policy"]) == [1, 0]
+    assert np.isclose(result["value"], 0.9 * 1_000_000 + 0.1 * 1_000)
+
+    result = branch_and_bound(PolicyProblem.transparent_newcomb([0.4, 0.5]))
+    assert list(result["policy"]) == [1, 1]
+
+
+def test_joint_worst_case_over_many_observations():
+    rng = np.random.default_rng(2)
+    games = [PolicyProblem.transparent_newcomb(rng.uniform(0.3, 0.99, 2)) for _ in range(20)]
+    problem = PolicyProblem.combine(games)
+    result = branch_and_bound(problem)
+
+    assert problem.n_observations == 40
+    assert result["expanded"] < 2 ** 20
+    # No single flip of the returned policy improves the worst case
+    flips = np.tile(result["policy"], (40, 1))
+    flips[np.arange(40), np.arange(40)] ^= 1
+    assert problem.worst_case_values(flips).max() <= result["value"] + 1e-6
+
+
+def test_ib_agent_greedy_policy():
+    agent = IBQAgent(CredalInterval(lower=0.9, upper=0.99))
+    assert list(agent.greedy_policy()) == [1, 0]
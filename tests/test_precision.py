@@ -0,0 +1,63 @@
+"""Tests for compact precision policies."""
+
+import numpy as np
+import pytest
+from ibrl.belief import CredalRectangle
+from ibrl.experiments import run_newcomb_experiment
+from ibrl.utils import get_precision, snapshot
+
+
+def test_compact_trajectories_match_double():
+    for agent_type in ["classical", "bayesian", "ib"]:
+        r64, a64, w64, act64 = run_newcomb_experiment(agent_type, episodes=500, seed=3)
+        r32, a32, w32, act32 = run_newcomb_experiment(
+            agent_type, episodes=500, seed=3, precision="compact"
+        )
+        
+        assert r32.dtype == np.float32 and act32.dtype == np.int8
+        assert a32.q.dtype == np.float32
+        # Newcomb payoffs are exact in float32
+        assert np.array_equal(r32, r64)
+        assert np.array_equal(act32, act64)
+        assert np.allclose(a32.q, a64.q, rtol=1e-6)
+        assert np.allclose(w32, w64, rtol=1e-6)
+
+
+def test_unknown_precision_rejected():
+    assert get_precision(None) is get_precision("double")
+    with pytest.raises(ValueError):
+        get_precision("half")
+
+
+def test_rectangle_keeps_dtype():
+    credal = CredalRectangle([0.5, 0.5], [1.0, 1.0], precision="compact")
+    for _ in range(10):
+        credal.update([True, False])
+    
+    lower, upper = credal.interval()
+    assert lower.dtype == upper.dtype == credal.successes.dtype == np.float32
+
+
+def test_compact_snapshot_roundtrip_keeps_precision():
+    for agent_type in ["classical", "bayesian", "ib"]:
+        _, agent, _, _ = run_newcomb_experiment(agent_type, episodes=200, seed=5,
+                                                precision="compact")
+        restored = snapshot.from_bytes(agent.to_bytes())
+
+        assert snapshot.unpack_precision(agent.to_bytes()) == "compact"
+        assert restored.dtype == restored.q.dtype == np.float32
+        assert np.array_equal(restored.q, agent.q)
+        # Continued training follows the same float32 numerics
+        for _ in range(50):
+            for a in (agent, restored):
+                action = a.select_action(0)
+                if agent_type == "ib":
+                    a.update(0, action, 1000.0, True)
+                else:
+                    a.update(0, action, 1000.0)
+        assert np.array_equal(restored.q, agent.q)
+
+    rect = CredalRectangle([0.5, 0.5], [1.0, 1.0], precision="compact")
+    rect.update([True, False])
+    restored = snapshot.from_bytes(rect.to_bytes())
+    assert restored.lower.dtype == restored.successes.dtype == np.float32
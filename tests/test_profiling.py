@@ -0,0 +1,43 @@
+"""Tests for per-phase profiling of the episode loop."""
+
+import json
+import numpy as np
+from ibrl.experiments import PhaseProfiler, profile_trial, run_newcomb_experiment
+
+
+def test_profiler_does_not_change_results():
+    plain = run_newcomb_experiment("ib", episodes=300, seed=1)
+    profiler = PhaseProfiler(sample_every=3)
+    profiled = run_newcomb_experiment("ib", episodes=300, seed=1, profiler=profiler)
+    
+    assert np.array_equal(plain[0], profiled[0])
+    assert np.array_equal(plain[2], profiled[2])
+    assert np.array_equal(plain[3], profiled[3])
+    
+    summary = profiler.summary()
+    assert summary["episodes"] == 300
+    assert summary["sampled_episodes"] == 100
+    for phase in ("greedy_action", "select_action", "env_step", "update", "credal_width"):
+        assert summary["phases"][phase]["count"] == 100
+    
+    nested = summary["phases"]["predictor_predict"]
+    assert nested["parent"] == "env_step"
+    assert nested["total_ns"] <= summary["phases"]["env_step"]["total_ns"]
+
+
+def test_predictor_is_restored_after_run():
+    profiler = PhaseProfiler()
+    rewards, agent, _, _ = run_newcomb_experiment("classical", episodes=50, profiler=profiler)
+    assert "predictor_predict" in profiler.summary()["phases"]
+    assert "credal_width" not in profiler.summary()["phases"]
+
+
+def test_profile_trial_report(tmp_path):
+    path = tmp_path / "profile.json"
+    report = profile_trial("twin_pd", "ib", episodes=200, cprofile=True, trace_memory=True,
+                           top=5, path=path)
+    
+    assert report["episodes"] == 200
+    assert len(report["cprofile"]) == 5
+    assert report["tracemalloc"]["peak_bytes"] > 0
+    assert json.loads(path.read_text())["phases"].keys() == report["phases"].keys()
@@ -0,0 +1,95 @@
+"""Tests for stored results and re-plotting without re-simulation."""
+
+import numpy as np
+import pytest
+from ibrl.utils import (
+    save_results,
+    load_results,
+    aggregate_results,
+    save_aggregates,
+    load_aggregates,
+    replot,
+)
+import ibrl.utils.plotting as plotting
+
+
+def _results(episodes=120, trials=3):
+    rng = np.random.default_rng(0)
+    results = {}
+    for env_type in ("bandit", "newcomb"):
+        results[env_type] = {}
+        for agent_type in ("classical", "bayesian", "ib"):
+            cell = []
+            for _ in range(trials):
+                widths = rng.random(episodes) if agent_type == "ib" else np.zeros(0)
+                cell.append({
+                    "rewards": rng.random(episodes),
+                    "credal_widths": None if env_type == "bandit" else widths,
+                    "actions": None if env_type == "bandit" else rng.integers(0, 2, episodes),
+                    "stop_episode": None,
+                })
+            results[env_type][agent_type] = cell
+    return results
+
+
+def test_results_round_trip(tmp_path):
+    results = _results()
+    results["newcomb"]["ib"][1]["rewards"] = results["newcomb"]["ib"][1]["rewards"][:80]
+    results["newcomb"]["ib"][1]["stop_episode"] = 79
+    path = tmp_path / "results.npz"
+    save_results(results, path)
+    loaded = load_results(path)
+    
+    for env_type, cells in results.items():
+        for agent_type, cell in cells.items():
+            for original, restored in zip(cell, loaded[env_type][agent_type]):
+                assert original["stop_episode"] == restored["stop_episode"]
+                for metric in ("rewards", "credal_widths", "actions"):
+                    if original[metric] is None:
+                        assert restored[metric] is None
+                    else:
+                        assert np.array_equal(original[metric], restored[metric])
+
+
+def test_aggregates_from_results_file_match_in_memory(tmp_path):
+    results = _results()
+    save_results(results, tmp_path / "results.npz")
+    save_aggregates(aggregate_results(results), tmp_path / "aggregates.npz")
+    
+    from_results = load_aggregates(tmp_path / "results.npz", cells={("newcomb", "ib")})
+    from_file = load_aggregates(tmp_path / "aggregates.npz")
+    assert list(from_results) == ["newcomb"] and list(from_results["newcomb"]) == ["ib"]
+    for name, values in from_results["newcomb"]["ib"].items():
+        assert np.allclose(values, from_file["newcomb"]["ib"][name])
+    assert "action_mean" not in from_file["bandit"]["ib"]
+
+
+def test_replot_formats_panels_and_cache(tmp_path, monkeypatch):
+    source = tmp_path / "results.npz"
+    save_results(_results(), source)
+    panels = ["reward/newcomb", "convergence/bandit", "credal_width"]
+    
+    paths = replot(str(source), str(tmp_path / "fig.png"), panels=panels,
+                   formats=["png", "svg", "pdf"], dpi=40)
+    assert sorted(p.rsplit(".", 1)[1] for p in paths) == ["pdf", "png", "svg"]
+    assert all((tmp_path / p).stat().st_size > 0 for p in paths)
+    
+    # A cosmetic change is served from the series cache: the source is not read
+    def fail(*args, **kwargs):
+        raise AssertionError("source re-read")
+    monkeypatch.setattr(plotting, "load_aggregates", fail)
+    paths = replot(str(source), str(tmp_path / "recolored.png"), panels=panels,
+                   colors={"ib": "purple"}, dpi=40, split=True, jobs=2)
+    assert len(paths) == 3
+    
+    with pytest.raises(ValueError):
+        replot(str(source), str(tmp_path / "fig.gif"), panels=panels)
+    with pytest.raises(ValueError):
+        replot(str(source), str(tmp_path / "fig.png"), panels=["reward/unknown"])
+
+
+def test_moving_average_matches_convolution():
+    values = np.random.default_rng(1).random(500)
+    expected = np.convolve(values, np.ones(50) / 50, mode="valid")
+    assert np.allclose(plotting.moving_average(values, 50), expected)
+    assert len(plotting.moving_average(values[:10], 50)) == 0
@@ -0,0 +1,53 @@
+"""Tests for the shared-memory result transport."""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ibrl.experiments.compare_all import run_single_trial
+from ibrl.experiments.shared_results import SharedResultBlock, run_tasks_shared
+
+
+def _assert_same(expected, actual):
+    for a, b in zip(expected[:3], actual[:3]):
+        if a is None:
+            assert b is None
+        else:
+            assert np.array_equal(a, b)
+            assert a.dtype == b.dtype
+    assert expected[3] == actual[3]
+
+
+def test_shared_transport_matches_direct_results():
+    tasks = [
+        ("bandit", "classical", 0, 120, {}),
+        ("newcomb", "ib", 1, 120, {"precision": "compact"}),
+        ("twin_pd", "bayesian", 2, 120, {}),
+    ]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        shared = run_tasks_shared(executor, tasks[:1] + tasks[2:], 120)
+        compact = run_tasks_shared(executor, tasks[1:2], 120, precision="compact")
+    
+    _assert_same(run_single_trial(tasks[0]), shared[0])
+    _assert_same(run_single_trial(tasks[2]), shared[1])
+    _assert_same(run_single_trial(tasks[1]), compact[0])
+
+
+def test_early_stopped_rows_are_truncated():
+    task = ("newcomb", "classical", 0, 400, {"early_stopping": {"patience": 20, "window": 20,
+                                                        "extrapolate": False}})
+    expected = run_single_trial(task)
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        (actual,) = run_tasks_shared(executor, [task], 400)
+    _assert_same(expected, actual)
+    assert expected[3] is not None
+
+
+def test_block_collect_and_close():
+    block = SharedResultBlock(2, 4, precision="compact")
+    block.arrays["rewards"][1, :3] = [1, 2, 3]
+    outputs = block.collect([(1, (3, -1, 0), None), (0, (0, -1, 0), 2)])
+    block.close()
+    
+    assert outputs[1][0].tolist() == [1, 2, 3]
+    assert outputs[1][0].dtype == np.float32
+    assert outputs[1][1] is None
+    assert outputs[0][3] == 2
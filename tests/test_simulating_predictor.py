@@ -0,0 +1,93 @@
+"""Tests for the simulating predictor."""
+
+from collections import OrderedDict
+
+from ibrl.agents import BayesianQAgent, ClassicalQAgent, IBQAgent
+from ibrl.belief import CredalInterval, CredalRectangle
+from ibrl.envs import NewcombEnv
+from ibrl.experiments.episode_loop import run_episodes
+from ibrl.predictors import LogicalPredictor, SimulatingPredictor, fingerprint
+
+
+def _run(agent, predictor, episodes=300):
+    env = NewcombEnv(predictor, seed=0)
+    trace = []
+    for _ in range(episodes):
+        state = env.reset()
+        action = agent.select_action(state)
+        _, reward, _, info = env.step(action, agent.greedy_action())
+        if isinstance(agent, IBQAgent):
+            agent.update(state, action, reward, info["predictor_correct"])
+        else:
+            agent.update(state, action, reward)
+        trace.append((action, info["predicted_action"], reward))
+    return trace
+
+
+def test_matches_logical_predictor():
+    for make in (lambda: ClassicalQAgent(2, epsilon=0.3, seed=1),
+                 lambda: BayesianQAgent(2, seed=1),
+                 lambda: IBQAgent(CredalInterval(lower=0.6, upper=0.99), seed=1)):
+        logical = _run(make(), LogicalPredictor(0.8, seed=5))
+        agent = make()
+        simulated = _run(agent, SimulatingPredictor(0.8, agent=agent, seed=5))
+        assert simulated == logical
+
+
+def test_cache_hits_when_state_unchanged():
+    agent = ClassicalQAgent(2, seed=0)
+    agent.q[:] = [1.0, 2.0]
+    predictor = SimulatingPredictor(1.0, agent=agent, seed=0)
+
+    assert [predictor.predict() for _ in range(5)] == [1] * 5
+    assert (predictor.misses, predictor.hits) == (1, 4)
+
+    agent.q[0] = 3.0
+    assert predictor.predict() == 0
+    assert predictor.misses == 2
+
+
+def test_simulation_leaves_agent_untouched():
+    agent = BayesianQAgent(2, seed=3)
+    before = agent.rng.bit_generator.state
+    SimulatingPredictor(0.9, agent=agent, seed=0).predict()
+    assert agent.rng.bit_generator.state == before
+
+
+def test_lru_bound_and_fingerprint():
+    agent = IBQAgent(CredalInterval(lower=0.8, upper=0.99))
+    predictor = SimulatingPredictor(1.0, agent=agent, cache_size=2)
+    key = fingerprint(agent)
+    for success in (True, True, False):
+        agent.credal.update(success)
+        predictor.predict()
+    assert len(predictor._cache) == 2
+    assert key not in predictor._cache
+    assert fingerprint(agent) in predictor._cache
+
+    # Array-valued intervals are keyed on their raw bytes
+    rectangle = IBQAgent(CredalRectangle([0.5, 0.6], [1.0, 0.9]))
+    before = fingerprint(rectangle)
+    assert hash(before) == hash(fingerprint(rectangle))
+    rectangle.credal.lower = rectangle.credal.lower + 0.1
+    assert fingerprint(rectangle) != before
+
+
+def test_hit_rate_in_episode_loop():
+    for agent_type, make in (("classical", lambda s: ClassicalQAgent(2, seed=s)),
+                             ("bayesian", lambda s: BayesianQAgent(2, seed=s))):
+        agent = make(0)
+        predictor = SimulatingPredictor(0.9, agent=agent, seed=0)
+        run_episodes(NewcombEnv(predictor, seed=0), agent, agent_type, 2000)
+        assert predictor.hits / (predictor.hits + predictor.misses) > 0.95
+
+    # IB count states recur across trials sharing one cache
+    cache = OrderedDict()
+    hits = misses = 0
+    for trial in range(10):
+        agent = IBQAgent(CredalInterval(), seed=trial)
+        predictor = SimulatingPredictor(0.9, agent=agent, seed=trial, cache=cache,
+                                        cache_size=100_000)
+        run_episodes(NewcombEnv(predictor, seed=trial), agent, "ib", 500)
+        hits, misses = hits + predictor.hits, misses + predictor.misses
+    assert hits / (hits + misses) > 0.2
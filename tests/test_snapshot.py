@@ -0,0 +1,140 @@
+"""Tests for binary agent and belief snapshots."""
+
+import numpy as np
+import pytest
+from ibrl.agents import ClassicalQAgent, BayesianQAgent, IBQAgent
+from ibrl.belief import CredalInterval, CredalRectangle, WassersteinBall
+from ibrl.experiments import run_newcomb_experiment
+from ibrl.utils import snapshot, pool_to_bytes, pool_from_bytes
+
+
+def test_agent_roundtrip_preserves_state_and_rng():
+    for agent_type in ["classical", "bayesian", "ib"]:
+        _, agent, _, _ = run_newcomb_experiment(agent_type, episodes=100, seed=1)
+        restored = type(agent).from_bytes(agent.to_bytes())
+        
+        assert np.array_equal(restored.q, agent.q)
+        assert restored.greedy_action() == agent.greedy_action()
+        # RNG continues the same stream
+        assert [restored.select_action(0) for _ in range(20)] == \
+               [agent.select_action(0) for _ in range(20)]
+    
+    assert restored.credal.interval() == agent.credal.interval()
+    assert restored.credal.trials == agent.credal.trials == 100
+
+
+def test_belief_roundtrip():
+    rect = CredalRectangle([0.5, 0.6], [1.0, 0.9])
+    rect.update([True, False])
+    ball = WassersteinBall([0.5, 0.5], radius=0.2)
+    ball.update(1)
+    
+    rect2 = snapshot.from_bytes(rect.to_bytes())
+    ball2 = snapshot.from_bytes(ball.to_bytes())
+    
+    assert np.allclose(rect2.interval(), rect.interval())
+    assert np.array_equal(rect2.successes, rect.successes)
+    assert np.array_equal(ball2.center, ball.center)
+    assert ball2.radius == ball.radius and ball2.trials == 1
+
+
+def test_snapshot_rejects_wrong_kind_and_version():
+    data = CredalInterval().to_bytes()
+    
+    with pytest.raises(ValueError):
+        IBQAgent.from_bytes(data)
+    
+    bad_version = data[:4] + bytes([99]) + data[5:]
+    with pytest.raises(ValueError):
+        CredalInterval.from_bytes(bad_version)
+
+
+def test_pool_roundtrip():
+    pool = [BayesianQAgent(n_actions=3, seed=s) for s in range(5)]
+    for agent in pool:
+        agent.update(0, agent.select_action(0), 1.0)
+    
+    restored = pool_from_bytes(pool_to_bytes(pool))
+    
+    for a, b in zip(pool, restored):
+        assert np.array_equal(a.alpha_params, b.alpha_params)
+        assert a.rng.random() == b.rng.random()
+    
+    with pytest.raises(ValueError):
+        pool_to_bytes([ClassicalQAgent(2), BayesianQAgent(2)])
+
+
+def test_version_1_snapshots_still_load():
+    credal = CredalInterval(lower=0.6)
+    credal.update(True)
+    data = credal.to_bytes()
+    # Version 1 headers have no precision byte
+    old = data[:4] + bytes([1]) + data[5:6] + data[7:]
+
+    restored = CredalInterval.from_bytes(old)
+    assert restored.interval() == credal.interval()
+    assert snapshot.unpack_precision(old) == "double"
+
+
+def test_sampling_settings_roundtrip():
+    def trained():
+        agent = BayesianQAgent(n_actions=50, seed=4, indexed=True, thompson="lazy", refresh=3)
+        for _ in range(30):
+            action = agent.select_action(0)
+            agent.update(0, action, float(action % 3 == 0))
+        return agent
+
+    for restore in (lambda a: BayesianQAgent.from_bytes(a.to_bytes()),
+                    lambda a: pool_from_bytes(pool_to_bytes([a]))[0]):
+        agent = trained()
+        restored = restore(agent)
+        assert (restored.thompson, restored.refresh, restored.indexed) == ("lazy", 3, True)
+        actions = []
+        for a in (agent, restored):
+            run = []
+            for _ in range(30):
+                action = a.select_action(0)
+                a.update(0, action, float(action % 3 == 0))
+                run.append(action)
+            actions.append(run)
+        assert actions[0] == actions[1]
+
+    classical = ClassicalQAgent(n_actions=4, indexed=True)
+    assert ClassicalQAgent.from_bytes(classical.to_bytes()).indexed
+    assert pool_from_bytes(pool_to_bytes([classical]))[0].indexed
+
+
+def test_arrays_keep_native_dtype():
+    double = BayesianQAgent(n_actions=100)
+    compact = BayesianQAgent(n_actions=100, precision="compact")
+    compact.q[:] = np.linspace(0, 1, 100, dtype=np.float32)
+    # Three float arrays dominate the snapshot: float32 halves them
+    assert len(compact.to_bytes()) < len(double.to_bytes()) - 3 * 100 * 4 + 16
+
+    restored = BayesianQAgent.from_bytes(compact.to_bytes())
+    assert restored.q.dtype == np.float32 and np.array_equal(restored.q, compact.q)
+
+    for values in (np.arange(5), np.ones(3, dtype=np.float32), np.zeros(0)):
+        unpacked, offset = snapshot.unpack_array(snapshot.pack_array(values), 0)
+        assert np.array_equal(unpacked, values) and offset == 8 + values.size * unpacked.itemsize
+    # Arrays written before dtype codes carry a plain length prefix (float64)
+    legacy = np.uint64(2).tobytes() + np.array([0.5, 2.0]).tobytes()
+    assert np.array_equal(snapshot.unpack_array(legacy, 0)[0], [0.5, 2.0])
+
+
+def test_pool_keeps_credal_recovery_state():
+    pool = [IBQAgent(CredalInterval(lower=0.8, upper=0.99, recovery=recovery), seed=s)
+            for s, recovery in enumerate([None, "widen", "reset", "empirical"])]
+    for agent in pool:
+        # A 30% predictor lies outside the prior: the interval empties
+        for success in np.random.default_rng(0).random(200) < 0.3:
+            agent.update(0, agent.select_action(0), 0.0, bool(success))
+
+    restored = pool_from_bytes(pool_to_bytes(pool))
+    for a, b in zip(pool, restored):
+        assert b.credal.recovery == a.credal.recovery
+        assert b.credal.misspecified == a.credal.misspecified
+        assert b.credal.misspecified_steps == a.credal.misspecified_steps > 0
+        a.credal.update(False)
+        b.credal.update(False)
+        assert b.credal.interval() == a.credal.interval()
@@ -0,0 +1,83 @@
+"""Tests for bootstrap intervals, permutation tests and effect sizes."""
+
+import time
+import numpy as np
+from scipy import stats
+from ibrl.experiments import (
+    bootstrap_ci,
+    paired_permutation_test,
+    effect_sizes,
+    summarize_results,
+)
+from ibrl.experiments.statistics import bootstrap_means, format_summary
+
+
+def test_bootstrap_ci_matches_scipy():
+    values = np.random.default_rng(0).exponential(2.0, 200)
+    mean, low, high = bootstrap_ci(values, n_resamples=20000, seed=1)
+    reference = stats.bootstrap((values,), np.mean, n_resamples=20000, method="BCa",
+                                random_state=1).confidence_interval
+    
+    assert mean == values.mean()
+    assert abs(low - reference.low) < 0.03 and abs(high - reference.high) < 0.03
+    
+    _, p_low, p_high = bootstrap_ci(values, method="percentile", seed=1)
+    assert p_low < mean < p_high
+    assert bootstrap_ci(np.full(5, 3.0)) == (3.0, 3.0, 3.0)
+
+
+def test_bootstrap_is_vectorized_and_fast():
+    values = np.random.default_rng(1).normal(size=5000)
+    start = time.perf_counter()
+    means = bootstrap_means(values, n_resamples=10000, seed=0)
+    assert time.perf_counter() - start < 2.0
+    assert means.shape == (10000,)
+    assert abs(means.std() - values.std() / np.sqrt(5000)) < 0.002
+
+
+def test_exact_permutation_p_value():
+    rng = np.random.default_rng(2)
+    a, b = rng.normal(size=10), rng.normal(0.5, 1.0, size=10)
+    for alternative in ("two-sided", "less", "greater"):
+        diff, p = paired_permutation_test(a, b, alternative=alternative)
+        reference = stats.permutation_test(
+            (a, b), lambda x, y: np.mean(x - y), permutation_type="samples",
+            alternative=alternative
+        ).pvalue
+        assert np.isclose(diff, np.mean(a - b))
+        assert np.isclose(p, reference)
+
+
+def test_random_permutation_detects_shift():
+    rng = np.random.default_rng(3)
+    a = rng.normal(size=400)
+    _, p_shift = paired_permutation_test(a + 0.3, a + rng.normal(0, 0.5, 400), seed=0)
+    _, p_null = paired_permutation_test(a, a + rng.normal(0, 0.5, 400), seed=0)
+    assert p_shift < 0.001
+    assert p_null > 0.01
+
+
+def test_effect_sizes():
+    a = np.array([3.0, 4.0, 5.0, 6.0])
+    b = np.array([1.0, 2.0, 3.0, 4.0])
+    sizes = effect_sizes(a, b)
+    assert sizes["cliffs_delta"] == (13 - 1) / 16
+    assert np.isnan(sizes["cohens_dz"])  # constant paired difference
+    assert sizes["hedges_g"] > 1
+
+
+def test_summarize_results_covers_all_cells():
+    rng = np.random.default_rng(4)
+    results = {"newcomb": {
+        agent: [{"rewards": rng.normal(mu, 1, 150), "actions": np.zeros(150, dtype=int)}
+                for _ in range(6)]
+        for agent, mu in (("classical", 0.0), ("ib", 2.0))
+    }}
+    summary = summarize_results(results, n_resamples=2000)
+    cells, pairs = summary["newcomb"]["cells"], summary["newcomb"]["pairs"]
+    
+    assert cells["ib"]["ci"][0] < cells["ib"]["mean"] < cells["ib"]["ci"][1]
+    assert cells["classical"]["one_box_rate"] == 1.0
+    assert pairs[("classical", "ib")]["difference"] < 0
+    assert pairs[("classical", "ib")]["p_value"] == 2 / 64
+    assert len(format_summary(summary)) == 4
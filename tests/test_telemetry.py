@@ -0,0 +1,57 @@
+"""Tests for live throughput telemetry."""
+
+import io
+import json
+import numpy as np
+from ibrl.experiments import compare_all, run_newcomb_experiment
+from ibrl.experiments.telemetry import (
+    TelemetryBoard, TelemetryMonitor, TelemetryProbe, EPISODES, TOTAL, STATE, DONE, UPDATED,
+)
+
+
+def test_probe_publishes_progress_without_changing_results():
+    board = TelemetryBoard(1)
+    try:
+        probe = TelemetryProbe.attach(board.spec(), 0, total=250, interval=100)
+        plain = run_newcomb_experiment("ib", episodes=250, seed=3)
+        tracked = run_newcomb_experiment("ib", episodes=250, seed=3, telemetry=probe)
+        probe.finish()
+        
+        assert np.array_equal(plain[0], tracked[0])
+        row = board.read()[0]
+        assert row[EPISODES] == 250 and row[TOTAL] == 250 and row[STATE] == DONE
+    finally:
+        board.close()
+
+
+def test_monitor_alerts_on_stalled_task_and_throughput():
+    stream = io.StringIO()
+    monitor = TelemetryMonitor(interval=60, stream=stream, window=1, min_rate=1e12,
+                               stall_seconds=1.0)
+    tasks = [("newcomb", "ib", 7, 100, {})]
+    with monitor.batch(tasks) as tagged:
+        spec, slot, _ = tagged[0][4]["telemetry"]
+        probe = TelemetryProbe.attach(spec, slot, total=100)
+        probe.publish(10)
+        probe.row[UPDATED] -= 5.0
+        monitor.sample()
+        first = monitor.sample()
+        assert first["tasks"]["running"] == 1
+        assert first["eta_s"] is None or first["eta_s"] >= 0
+        # Alerts are reported once, when they become active
+        assert monitor.sample()["alerts"] == []
+    
+    assert any("newcomb/ib trial 7" in alert for alert in monitor.alerts)
+    assert any("throughput" in alert for alert in monitor.alerts)
+    assert "ALERT" in stream.getvalue()
+
+
+def test_compare_all_writes_time_series(tmp_path, capsys):
+    log_path = tmp_path / "telemetry.jsonl"
+    compare_all(n_trials=1, episodes=300, parallel=False, save_path=None,
+                telemetry={"interval": 0.05, "log_path": str(log_path), "stream": None,
+                           "publish_every": 100})
+    
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert records[-1]["episodes"] == 15 * 300
+    assert records[-1]["tasks"] == {"pending": 0, "running": 0, "done": 15}
@@ -0,0 +1,63 @@
+"""Tests for the round-robin Twin PD tournament."""
+
+import numpy as np
+from ibrl.agents import ClassicalQAgent
+from ibrl.experiments import Tournament
+
+
+def test_round_matches_payoff_table():
+    tournament = Tournament([{"type": "classical", "epsilon": 0.5}] * 5, seed=0)
+    rewards = tournament.play_round()
+
+    assert np.all(np.diagonal(rewards) == 0)
+    assert np.array_equal(tournament.scores, rewards)
+    assert np.array_equal(tournament.games, 1 - np.eye(5, dtype=int))
+    # Every off-diagonal payoff is an entry of the PD matrix for that pairing
+    assert set(np.unique(rewards[~np.eye(5, dtype=bool)])) <= {0.0, 1.0, 3.0, 5.0}
+
+
+def test_q_updates_match_sequential_agent():
+    population = [{"type": "classical", "epsilon": 0.3, "alpha": 0.2}] * 4
+    tournament = Tournament(population, seed=1)
+    tournament.q[:] = [[0.5, 1.0], [2.0, 0.0], [0.0, 0.0], [1.0, 1.5]]
+    before = tournament.q.copy()
+
+    # Replay the round's experiences through a scalar agent, opponent by opponent
+    rng_state = tournament.rng.bit_generator.state
+    rewards = tournament.play_round()
+    tournament.rng.bit_generator.state = rng_state
+    greedy = np.argmax(before, axis=1)
+    actions = np.broadcast_to(greedy[:, None], (4, 4)).copy()
+    explore = tournament.rng.random((4, 4)) < 0.3
+    actions[explore] = tournament.rng.integers(0, 2, np.count_nonzero(explore))
+
+    for i in range(4):
+        agent = ClassicalQAgent(2, alpha=0.2)
+        agent.q = before[i].copy()
+        for j in range(4):
+            if j != i:
+                agent.update(0, actions[i, j], rewards[i, j])
+        assert np.allclose(agent.q, tournament.q[i])
+
+
+def test_ib_population_cooperates():
+    tournament = Tournament([{"type": "ib", "lower": 0.8, "upper": 0.99}] * 6, seed=2)
+    history = tournament.run(50)
+
+    assert np.allclose(history, 3.0)
+    assert tournament.standings()[0][2] == 1.0
+    assert np.all(tournament.lower >= 0.8)
+
+
+def test_mixed_population_scores():
+    population = ([{"type": "classical"}] * 4 + [{"type": "bayesian"}] * 3
+                  + [{"type": "ib", "lower": lower} for lower in (0.5, 0.8, 0.9)])
+    tournament = Tournament(population, seed=3)
+    history = tournament.run(100)
+
+    assert history.shape == (100, 10)
+    assert tournament.games.sum() == 100 * 10 * 9
+    assert np.allclose(tournament.mean_scores(), history.mean(axis=0))
+    standings = tournament.standings()
+    assert len(standings) == 10
+    assert all(a[1] >= b[1] for a, b in zip(standings, standings[1:]))
@@ -0,0 +1,74 @@
+"""Tests for sliding-window and discounted credal intervals."""
+
+import numpy as np
+import pytest
+from ibrl.agents import IBQAgent
+from ibrl.belief import CredalInterval, SlidingWindowInterval, DiscountedInterval
+from ibrl.utils.snapshot import from_bytes
+
+
+def _drifting_outcomes(n=4000, seed=0):
+    # Predictor accuracy drops from 0.95 to 0.6 halfway through
+    rng = np.random.default_rng(seed)
+    theta = np.where(np.arange(n) < n // 2, 0.95, 0.6)
+    return rng.random(n) < theta
+
+
+def test_window_counts_match_recent_outcomes():
+    credal = SlidingWindowInterval(window=37, lower=0.0, upper=1.0)
+    outcomes = _drifting_outcomes(500)
+    for i, success in enumerate(outcomes):
+        credal.update(success)
+        recent = outcomes[max(0, i + 1 - 37):i + 1]
+        assert credal.trials == len(recent)
+        assert credal.successes == recent.sum()
+
+
+def test_window_width_does_not_collapse():
+    credal = SlidingWindowInterval(window=100, lower=0.0, upper=1.0)
+    for _ in range(5000):
+        credal.update(True)
+    
+    epsilon = np.sqrt(np.log(2 / 0.05) / (2 * 100))
+    assert np.isclose(credal.width(), epsilon)
+
+
+@pytest.mark.parametrize("credal", [
+    SlidingWindowInterval(window=300, lower=0.0, upper=1.0),
+    DiscountedInterval(gamma=0.995, lower=0.0, upper=1.0),
+    SlidingWindowInterval(window=300, lower=0.0, upper=1.0, bound="kl"),
+    DiscountedInterval(gamma=0.995, lower=0.0, upper=1.0, bound="wilson"),
+])
+def test_tracks_drifting_accuracy(credal):
+    static = CredalInterval(lower=0.0, upper=1.0)
+    for success in _drifting_outcomes():
+        credal.update(success)
+        static.update(success)
+    
+    assert credal.lower <= 0.6 <= credal.upper
+    assert not static.lower <= 0.6 <= static.upper
+
+
+def test_discounted_effective_trials():
+    credal = DiscountedInterval(gamma=0.9, lower=0.0, upper=1.0)
+    for _ in range(1000):
+        credal.update(True)
+    assert np.isclose(credal.effective_trials(), 1.9 / 0.1)
+
+
+def test_windowed_agent_snapshot_round_trip():
+    agent = IBQAgent(SlidingWindowInterval(window=50, lower=0.0, upper=1.0), seed=0)
+    for success in _drifting_outcomes(120):
+        agent.update(0, 0, 1_000_000, predictor_correct=success)
+    
+    restored = from_bytes(agent.to_bytes())
+    assert isinstance(restored.credal, SlidingWindowInterval)
+    for success in _drifting_outcomes(80, seed=1):
+        agent.update(0, 0, 1_000_000, predictor_correct=success)
+        restored.update(0, 0, 1_000_000, predictor_correct=success)
+        assert restored.credal.interval() == agent.credal.interval()
+    
+    discounted = DiscountedInterval(gamma=0.97, lower=0.0, upper=1.0)
+    for success in _drifting_outcomes(60):
+        discounted.update(success)
+    assert from_bytes(discounted.to_bytes()).interval() == discounted.interval()